@@ -5,6 +5,7 @@ const bodyParser = require('body-parser');
 const path = require('path');
 const fs = require('fs');
 const { spawn } = require('child_process');
+const readline = require('readline');
 const wikiService = require('./src/services/wikiService');
 const chatService = require('./src/services/chatService');
 const textGenService = require('./src/services/textGenService');
@@ -151,52 +152,108 @@ app.post('/wiki/define', async (req, res) => {
   }
 });
 
-// Update chat endpoint to use Python chat model
-app.post('/chat', async (req, res) => {
-  const message = req.body.message;
-  console.log('Received message:', message);
+// Long-lived Python chat worker (chat_model.py --serve) answering JSON-lines requests
+let chatWorker = null;
+let nextRequestId = 1;
+const pendingRequests = new Map();
+// A request the worker has not answered by then is failed, so a hung worker cannot hold it forever
+const WORKER_TIMEOUT_MS = Number(process.env.WORKER_TIMEOUT_MS) || 60000;
+
+function failPendingRequests(message) {
+  for (const pending of pendingRequests.values()) {
+    clearTimeout(pending.timer);
+    pending.reject(new Error(message));
+  }
+  pendingRequests.clear();
+}
 
-  try {
-    // Use the Python executable from the virtual environment
-    const pythonProcess = spawn(
-      pythonExecutable,
-      [path.join(__dirname, 'src', 'chat_model.py'), message],
-      {
-        env: {
-          ...process.env,
-          PYTHONIOENCODING: 'utf-8',
-          PYTHONUTF8: '1',
-        },
-      }
-    );
+function getChatWorker() {
+  if (chatWorker) {
+    return chatWorker;
+  }
 
-    let result = '';
-    let errorOutput = '';
+  chatWorker = spawn(
+    pythonExecutable,
+    [path.join(__dirname, 'src', 'chat_model.py'), '--serve'],
+    {
+      env: {
+        ...process.env,
+        PYTHONIOENCODING: 'utf-8',
+        PYTHONUTF8: '1',
+      },
+    }
+  );
 
-    pythonProcess.stdout.on('data', (data) => {
-      const output = data.toString();
-      result += output;
-      console.log('Python output:', output);
-    });
+  const lines = readline.createInterface({ input: chatWorker.stdout });
+  lines.on('line', (line) => {
+    let reply;
+    try {
+      reply = JSON.parse(line);
+    } catch (e) {
+      console.error('Invalid worker reply:', line);
+      return;
+    }
+    const pending = pendingRequests.get(reply.id);
+    if (!pending) {
+      return;
+    }
+    pendingRequests.delete(reply.id);
+    clearTimeout(pending.timer);
+    if (reply.error) {
+      pending.reject(new Error(reply.error));
+    } else {
+      pending.resolve('result' in reply ? reply.result : reply.response);
+    }
+  });
 
-    pythonProcess.stderr.on('data', (data) => {
-      const error = data.toString();
-      errorOutput += error;
-      console.error('Python error:', error);
-    });
+  chatWorker.stderr.on('data', (data) => {
+    console.error('Python error:', data.toString());
+  });
 
-    await new Promise((resolve, reject) => {
-      pythonProcess.on('close', (code) => {
-        console.log('Python process exited with code:', code);
-        if (code !== 0) {
-          reject(new Error(`Python process failed: ${errorOutput}`));
-        } else {
-          resolve();
-        }
-      });
-    });
+  chatWorker.on('error', (error) => {
+    // Failing to start (e.g. no Python executable) must not take the server down
+    console.error('Python worker failed:', error);
+    chatWorker = null;
+    failPendingRequests('Python worker failed to start');
+  });
+
+  chatWorker.stdin.on('error', (error) => {
+    console.error('Could not write to the Python worker:', error);
+  });
 
-    const cleanResponse = result.trim();
+  chatWorker.on('close', (code) => {
+    console.log('Python worker exited with code:', code);
+    chatWorker = null;
+    failPendingRequests('Python worker exited');
+  });
+
+  return chatWorker;
+}
+
+function askChatWorker(message) {
+  return askWorker({ message });
+}
+
+function askWorker(request) {
+  return new Promise((resolve, reject) => {
+    const id = nextRequestId++;
+    const timer = setTimeout(() => {
+      pendingRequests.delete(id);
+      reject(new Error(`Python worker did not answer within ${WORKER_TIMEOUT_MS} ms`));
+    }, WORKER_TIMEOUT_MS);
+    pendingRequests.set(id, { resolve, reject, timer });
+    getChatWorker().stdin.write(JSON.stringify({ id, ...request }) + '\n');
+  });
+}
+
+// Update chat endpoint to use Python chat model
+app.post('/chat', async (req, res) => {
+  const message = req.body.message;
+  console.log('Received message:', message);
+
+  try {
+    const response = await askChatWorker(message);
+    const cleanResponse = response.trim();
     console.log('Sending response:', cleanResponse);
     res.send(cleanResponse);
   } catch (error) {
@@ -323,6 +380,39 @@ app.post('/feedback', async (req, res) => {
     }
   });
 
+  // Mean, median, percentiles and the rest of an uploaded CSV or text file of numbers.
+  // The worker reads the saved file through a memory map, so large files stay on disk,
+  // but the upload still fills that disk; a bigger file is refused with a 413
+  const STATISTICS_UPLOAD_BYTES = Number(process.env.STATISTICS_UPLOAD_BYTES) || 512 * 1024 * 1024;
+  const statisticsUpload = multer({ dest: 'uploads/', limits: { fileSize: STATISTICS_UPLOAD_BYTES } }).single('file');
+
+  app.post('/statistics', (req, res, next) => {
+    statisticsUpload(req, res, (error) => {
+      if (error && error.code === 'LIMIT_FILE_SIZE') {
+        return res.status(413).send(`File is larger than ${STATISTICS_UPLOAD_BYTES} bytes`);
+      }
+      next(error);
+    });
+  }, async (req, res) => {
+    if (!req.file) {
+      return res.status(400).send('No file uploaded');
+    }
+
+    try {
+      const result = await askWorker({
+        method: 'statistics',
+        path: path.resolve(req.file.path),
+        measures: req.body.measures || '',
+      });
+      res.status(result.error ? 422 : 200).json(result);
+    } catch (error) {
+      console.error('Statistics error:', error);
+      res.status(500).send('Error reading the uploaded file');
+    } finally {
+      fs.unlink(req.file.path, () => {});
+    }
+  });
+
   // Start server
   app.listen(port, () => {
     console.log(`Server running at http://localhost:${port}`);
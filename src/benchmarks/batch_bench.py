@@ -0,0 +1,67 @@
+import os
+import re
+import sys
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import load_corpus, time_call, quiet_stdout, emit
+
+def distinct_items(items, copies):
+    """`copies` variants of every item with its numbers shifted, so no two are the same problem"""
+    variants = (re.sub(r'\d+', lambda m: str(int(m.group()) + k), item) for k in range(copies) for item in items)
+    return list(dict.fromkeys(variants))
+
+def compare(chatbot, problems, chat):
+    """Per-item cost of single calls against one batch; each side is timed warm, best of two"""
+    math_model = chatbot.math_model
+    single_solve = time_call(lambda: [math_model.solve(p) for p in problems], 2)
+    batch_solve = time_call(lambda: list(math_model.solve_many(problems)), 2)
+    single_chat = time_call(lambda: [chatbot.get_response(m) for m in chat], 2)
+    batch_chat = time_call(lambda: list(chatbot.get_responses(chat)), 2)
+
+    def per_item(seconds, items):
+        return round(seconds / len(items) * 1e6, 2)
+
+    return {
+        "items": {"solve": len(problems), "chat": len(chat)},
+        "per_item_us": {
+            "solve": per_item(single_solve, problems),
+            "solve_many": per_item(batch_solve, problems),
+            "get_response": per_item(single_chat, chat),
+            "get_responses": per_item(batch_chat, chat),
+        },
+        "speedup": {
+            "solve_many": round(single_solve / batch_solve, 1),
+            "get_responses": round(single_chat / batch_chat, 1),
+        },
+    }
+
+def run(copies, repeat):
+    # The persistent store would answer repeated problems from disk and leave files in data/
+    os.environ['MATH_RESULT_STORE'] = ''
+    from src.chat_model import ChatBot
+
+    problems, messages = load_corpus()
+    chatbot = ChatBot()
+    # Warm the lazy imports and the TF-IDF index so only steady-state cost is measured
+    list(chatbot.get_responses((problems + messages)[:50]))
+
+    return {
+        # What batching itself buys: every item is a different problem
+        "distinct": compare(chatbot, distinct_items(problems, copies), distinct_items(problems + messages, copies)),
+        # The corpus repeated, where batch_scope answers repeats from the results of the same batch
+        "duplicates": compare(chatbot, problems * repeat, (problems + messages) * repeat),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare single-call and batch solving")
+    parser.add_argument('--copies', type=int, default=10,
+                        help="Variants of each corpus item, with shifted numbers, in the distinct batch")
+    parser.add_argument('--repeat', type=int, default=10,
+                        help="How many times the training corpus is repeated in the duplicate batch")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.copies, options.repeat), stdout)
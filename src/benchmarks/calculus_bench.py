@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import quiet_stdout, emit
+
+# Textbook requests, each with spellings students type for it
+TEXTBOOK = [
+    ["derivative of x^3 + 2x", "d/dx 2x + x^3", "differentiate x**3 + 2*x"],
+    ["derivative of x*sin(x)", "d/dx sin(x)*x"],
+    ["derivative of e^(2x)", "d/dx exp(2x)"],
+    ["second derivative of x^4 - 3x^2", "second derivative of -3x^2 + x^4"],
+    ["integral of x^2 dx from 0 to 1", "integrate x**2 from 0 to 1"],
+    ["integral of sin(x) from 0 to pi", "integrate sin x from 0 to pi"],
+    ["integrate 1/x", "integral of 1/x dx"],
+    ["integral of x*e^x dx", "integrate e^x*x dx"],
+    ["limit of sin(x)/x as x approaches 0", "lim x->0 sin(x)/x"],
+    ["limit as x approaches infinity of (2x^2 + 1)/(x^2 - 3)", "lim x->infinity (1 + 2x^2)/(x^2 - 3)"],
+]
+
+def generate_traffic(count, seed=0):
+    """Requests with a long-tailed popularity over TEXTBOOK, each in one of its spellings"""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(TEXTBOOK) + 1)]
+    return [rng.choice(spellings) for spellings in rng.choices(TEXTBOOK, weights, k=count)]
+
+def _replay(model, traffic):
+    from src.chat_model import CALCULUS_CACHE
+
+    CALCULUS_CACHE.clear()
+    CALCULUS_CACHE.hits = CALCULUS_CACHE.misses = 0
+    start = time.perf_counter()
+    answers = [model.solve(problem).get("answer") for problem in traffic]
+    return answers, time.perf_counter() - start, CALCULUS_CACHE.stats()
+
+def run(count):
+    from src.chat_model import SimpleMathModel, CALCULUS_CACHE
+
+    model = SimpleMathModel()
+    traffic = generate_traffic(count)
+    # Warm sympy outside the timed replays
+    model.solve(TEXTBOOK[0][0])
+
+    answers, seconds, stats = _replay(model, traffic)
+    # Without memoization every request pays for sympy
+    uncached = [spellings[0] for spellings in TEXTBOOK]
+    start = time.perf_counter()
+    for problem in uncached:
+        CALCULUS_CACHE.clear()
+        model.solve(problem)
+    per_miss = (time.perf_counter() - start) / len(uncached)
+
+    return {
+        "requests": len(traffic),
+        "distinct_spellings": len(set(traffic)),
+        "hit_rate": stats["hit_rate"],
+        "replay_seconds": round(seconds, 3),
+        "replay_seconds_without_memo_estimate": round(per_miss * len(traffic), 3),
+        "per_request_ms": {"sympy": round(per_miss * 1e3, 2), "memoized": round(seconds / len(traffic) * 1e3, 3)},
+        "errors": sum(answer is None for answer in answers),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay of textbook calculus traffic with results memoized per canonical request")
+    parser.add_argument('--count', type=int, default=500, help="Requests in the replay")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.count), stdout)
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, quiet_stdout, emit
+
+# Problems that reach the result store: the linear and polynomial engines answer the rest
+BASE_PROBLEMS = [
+    "sqrt(x) + 4 = 7",
+    "x/(x + 1) = 2",
+    "2*sin(x) = 1",
+    "0.5*x + 1.25 = 3",
+    "x*y = 6, x + y = 5",
+    "3/x + 1 = 4",
+    "sqrt(2*x + 1) = 3",
+    "exp(x) = 5",
+    "x + 1/x = 2",
+    "2*x + pi = 7",
+    "ln(x) = 2",
+    "x*(x + 1) = 6*y, y = 1",
+    "1.5*x - 2 = 0.5*x",
+    "4*cos(x) = 2",
+    "x*y = 12, x - y = 1",
+    "2/(x - 1) = 3/x",
+]
+
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
+
+def _show(tree, rng):
+    """Text of an expression tree with commutative operands and constants randomly respelled"""
+    kind = tree[0]
+    if kind == 'num':
+        value = tree[1]
+        if not isinstance(value, int):
+            return format(float(value), 'g')
+        if value > 1 and rng.random() < 0.3:
+            # Split the constant for the canonicalizer to fold again
+            part = rng.randint(1, value - 1)
+            return f"({part} + {value - part})"
+        return str(value)
+    if kind in ('var', 'const'):
+        return tree[1]
+    if kind == 'neg':
+        return f"-({_show(tree[1], rng)})"
+    if kind == 'call':
+        return f"{tree[1]}({_show(tree[2], rng)})"
+
+    op, left, right = tree
+    if op in '+*' and rng.random() < 0.5:
+        left, right = right, left
+    texts = []
+    for side, child in (('left', left), ('right', right)):
+        text = _show(child, rng)
+        inner = _PRECEDENCE.get(child[0])
+        if inner is not None and (inner < _PRECEDENCE[op] or (side == 'right' and inner == _PRECEDENCE[op] and op in '-/^')
+                                  or (op == '^' and inner == _PRECEDENCE[op])):
+            text = f"({text})"
+        texts.append(text)
+    spacing = ' ' if rng.random() < 0.5 else ''
+    return f"{texts[0]}{spacing}{'**' if op == '^' else op}{spacing}{texts[1]}"
+
+def respell(problem, rng):
+    """An equivalent spelling: sides swapped, operands commuted, constants split, equations reordered"""
+    from src.solvers.expression import compile_expression
+
+    equations = []
+    for equation in problem.split(','):
+        sides = [_show(compile_expression(side), rng) for side in equation.split('=')]
+        if rng.random() < 0.5:
+            sides.reverse()
+        equations.append(' = '.join(sides))
+    rng.shuffle(equations)
+    return ', '.join(equations)
+
+def generate_traffic(count, seed=0):
+    """Requests over BASE_PROBLEMS with a long-tailed popularity, each one freshly respelled"""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(BASE_PROBLEMS) + 1)]
+    return [respell(problem, rng) for problem in rng.choices(BASE_PROBLEMS, weights, k=count)]
+
+def _replay(model, traffic, key):
+    from src.chat_model import PARSE_CACHE, SOLVER_VERSION
+    from src.utils.result_store import ResultStore
+
+    PARSE_CACHE.clear()
+    with tempfile.TemporaryDirectory() as directory:
+        model.result_store = ResultStore(os.path.join(directory, 'replay.sqlite3'), SOLVER_VERSION)
+        model.problem_hash = key
+        start = time.perf_counter()
+        answers = [model.solve(problem).get("answer") for problem in traffic]
+        seconds = time.perf_counter() - start
+        stats = model.result_store.stats()
+        model.result_store.close()
+    del model.problem_hash
+    return answers, seconds, stats
+
+def run(count, repeat):
+    from src.chat_model import SimpleMathModel
+    from src.solvers.canonical import canonical_form
+    from src.utils.result_store import problem_key
+
+    model = SimpleMathModel()
+    traffic = [model._normalize_expression(problem) for problem in generate_traffic(count)]
+
+    def spelling_key(problem):
+        # The key before canonicalization: whitespace-insensitive text of each equation
+        return problem_key('\n'.join(model._compact(eq) for eq in model._split_equations(problem)))
+
+    # Warm sympy outside the timed replays
+    model.result_store = None
+    model.solve(BASE_PROBLEMS[0])
+
+    spelling_answers, spelling_seconds, spelling_stats = _replay(model, traffic, spelling_key)
+    canonical_answers, canonical_seconds, canonical_stats = _replay(model, traffic, model.problem_hash)
+    canonical_seconds_per = time_call(lambda: [canonical_form(problem) for problem in traffic], repeat) / len(traffic)
+
+    return {
+        "requests": len(traffic),
+        "distinct_spellings": len(set(traffic)),
+        "distinct_problems": len({canonical_form(problem) for problem in traffic}),
+        "hit_rate": {"spelling_key": spelling_stats["hit_rate"], "canonical_key": canonical_stats["hit_rate"]},
+        "replay_seconds": {"spelling_key": round(spelling_seconds, 3), "canonical_key": round(canonical_seconds, 3)},
+        "per_request_us": {
+            "canonical_form": round(canonical_seconds_per * 1e6, 2),
+            "solve_on_miss": round(spelling_seconds / max(1, spelling_stats["misses"]) * 1e6, 2),
+        },
+        "answer_mismatches": sum(a != b for a, b in zip(spelling_answers, canonical_answers)),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Result-store hit rate when replayed traffic is keyed by canonical form")
+    parser.add_argument('--count', type=int, default=400, help="Requests in the replay")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of the canonicalizer timing; the best one counts")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.count, options.repeat), stdout)
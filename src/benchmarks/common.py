@@ -0,0 +1,33 @@
+import json
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+TRAINING_DATA = os.path.join(project_root, 'data', 'training_data.json')
+
+def load_corpus():
+    """Return (math problems, chat messages) drawn from training_data.json"""
+    with open(TRAINING_DATA, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    problems = [item['input'] for item in data.get('math_problems', [])]
+    messages = [variation for conv in data.get('conversations', []) for variation in conv.get('variations', [])]
+    return problems, messages
+
+def time_call(func, repeat=1):
+    """Best wall-clock time in seconds of `repeat` calls to func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def quiet_stdout():
+    """Send stray prints from the models to stderr so stdout stays pure JSON"""
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    return real_stdout
+
+def emit(results, stream):
+    stream.write(json.dumps(results, indent=2) + '\n')
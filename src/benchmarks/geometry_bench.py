@@ -0,0 +1,54 @@
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, quiet_stdout, emit
+
+REQUESTS = [
+    "area of a circle with radius 3",
+    "circumference of a circle with a diameter of 10 cm",
+    "perimeter of a rectangle with length 4 and width 6",
+    "area of a triangle with sides 3, 4 and 5",
+    "hypotenuse of a right triangle with legs 3 and 4",
+    "volume of a cylinder with radius 2 cm and height 5 cm",
+    "surface area of a cone with radius 3 and height 4",
+    "volume of a sphere with a radius of 1.5 m",
+]
+
+def sympy_answer(geometry, request):
+    """The same formula through sympy, as a request would be evaluated without the compiled table"""
+    import sympy
+
+    formula = geometry.solve(request)["formula"]
+    expression = sympy.sympify(formula.replace('^', '**'), locals={'pi': sympy.pi})
+    return expression.subs({sympy.Symbol(name): value for name, value in request["values"].items()}).evalf()
+
+def run(repeat):
+    from src.chat_model import SimpleMathModel, GEOMETRY_NOTES_PATH
+    from src.solvers.geometry import load_geometry
+
+    model = SimpleMathModel()
+    geometry = model.geometry
+    requests = [geometry.parse(text) for text in REQUESTS]
+    sympy_answer(geometry, requests[0])
+    count = len(REQUESTS)
+    return {
+        "answers": {text: model.solve(text)["answer"] for text in REQUESTS},
+        "load_ms": round(time_call(lambda: load_geometry(GEOMETRY_NOTES_PATH), repeat) * 1e3, 3),
+        "per_request_us": {
+            "parse_and_evaluate": round(time_call(lambda: [geometry.solve(geometry.parse(t)) for t in REQUESTS], repeat) / count * 1e6, 1),
+            "full_solve": round(time_call(lambda: [model.solve(t) for t in REQUESTS], repeat) / count * 1e6, 1),
+            "sympy_formula": round(time_call(lambda: [sympy_answer(geometry, r) for r in requests], repeat) / count * 1e6, 1),
+        },
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geometry requests through the compiled formula table against sympy evaluation")
+    parser.add_argument('--repeat', type=int, default=20, help="Runs of each approach; the best one counts")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.repeat), stdout)
@@ -0,0 +1,95 @@
+import os
+import sys
+import random
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, quiet_stdout, emit
+
+def _term(rng):
+    a = rng.choice([n for n in range(-12, 13) if n])
+    return a, f"{a}x" if rng.random() < 0.5 else f"{a}(x + {rng.randint(1, 9)})"
+
+def generate(count, seed=0):
+    """Distinct linear equations in x, so no cache can answer them"""
+    rng = random.Random(seed)
+    equations = set()
+    while len(equations) < count:
+        a, term = _term(rng)
+        b = rng.randint(-9, 9)
+        # Equal coefficients leave no x to solve for
+        if a != b:
+            equation = f"{term} + {rng.randint(-50, 50)} = {b}x - {rng.randint(0, 50)}"
+            equations.add(equation.replace('+ -', '- '))
+    return sorted(equations)
+
+def generate_system(unknowns, seed=0):
+    """Dense system with small integer coefficients and a unique integer solution"""
+    rng = random.Random(seed)
+    names = [f"v{i:02d}" for i in range(unknowns)]
+    solution = {name: rng.randint(-9, 9) for name in names}
+    equations = []
+    for _ in range(unknowns):
+        coefficients = {name: rng.randint(-9, 9) for name in names}
+        total = sum(c * solution[name] for name, c in coefficients.items())
+        left = " + ".join(f"{c}{name}" for name, c in coefficients.items()).replace('+ -', '- ')
+        equations.append(f"{left} = {total}")
+    return equations
+
+def run_systems(sizes, repeat):
+    """Per-equation time of SimpleMathModel.solve_system_of_equations on systems of the given sizes"""
+    from src.chat_model import SimpleMathModel
+
+    model = SimpleMathModel()
+    model.result_store = None
+    results = {}
+    for unknowns in sizes:
+        equations = generate_system(unknowns, seed=unknowns)
+        model.solve_system_of_equations(equations)
+        seconds = time_call(lambda: model.solve_system_of_equations(equations), repeat)
+        results[str(unknowns)] = round(seconds / unknowns * 1e6, 2)
+    return results
+
+def run(count, repeat):
+    from src.chat_model import SimpleMathModel
+    from src.solvers.expression import compile_expression
+
+    model = SimpleMathModel()
+    model.result_store = None
+    equations = [model._normalize_expression(eq) for eq in generate(count)]
+    # Import sympy and warm its caches outside the timed region
+    model._solve_normalized("3x + 1 = 7", None)
+
+    def solve_linear():
+        # Start every run with a cold expression cache, as distinct traffic would
+        compile_expression.cache_clear()
+        return [model._solve_linear(eq) for eq in equations]
+
+    sympy_results = []
+    # One cold pass: repeating it would be answered by the parse cache
+    symbolic = time_call(lambda: sympy_results.extend(model._solve_normalized(eq, None) for eq in equations))
+    fast = time_call(solve_linear, repeat)
+    fast_results = solve_linear()
+    mismatches = [eq for eq, a, b in zip(equations, fast_results, sympy_results) if a != b]
+
+    return {
+        "equations": len(equations),
+        "per_equation_us": {
+            "linear_fast_path": round(fast / len(equations) * 1e6, 2),
+            "sympy_solve": round(symbolic / len(equations) * 1e6, 2),
+        },
+        "speedup": round(symbolic / fast, 1),
+        "mismatches": mismatches[:10],
+        "system_per_equation_us": run_systems((2, 12, 24, 48), repeat),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Linear fast path against the sympy solve it replaces")
+    parser.add_argument('--count', type=int, default=300, help="Number of distinct equations")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of the fast path; the best one counts")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.count, options.repeat), stdout)
@@ -0,0 +1,60 @@
+import os
+import sys
+import random
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, emit
+from src.solvers.matrix import (parse_matrix, exact_rows, float_array, determinant, solve_matrix,
+                                float_determinant)
+
+def matrix_text(size, seed=0):
+    """A size×size matrix of small integers in [[...], [...]] notation"""
+    rng = random.Random(seed)
+    return str([[rng.randint(-9, 9) for _ in range(size)] for _ in range(size)])
+
+def _lapack(sizes, repeat):
+    results = {}
+    for size in sizes:
+        text = matrix_text(size)
+        timings = {"parse": time_call(lambda: float_array(parse_matrix(text)), repeat)}
+        for operation in ("determinant", "inverse", "rank"):
+            request = {"operation": operation, "matrices": [text]}
+            timings[operation] = time_call(lambda: solve_matrix(request), repeat)
+        request = {"operation": "product", "matrices": [text, matrix_text(size, seed=1)]}
+        timings["product"] = time_call(lambda: solve_matrix(request), repeat)
+        results[f"{size}x{size}"] = {name: round(seconds * 1e3, 3) for name, seconds in timings.items()}
+    return results
+
+def _exact(sizes, repeat):
+    import sympy
+
+    results = {}
+    for size in sizes:
+        rows = parse_matrix(matrix_text(size))
+        fractions = exact_rows(rows)
+        array = float_array(rows)
+        sympy_matrix = sympy.Matrix(fractions)
+        results[f"{size}x{size}"] = {
+            "bareiss_exact": round(time_call(lambda: determinant(fractions, []), repeat) * 1e3, 3),
+            "lapack_float": round(time_call(lambda: float_determinant(array, []), repeat) * 1e3, 3),
+            "sympy_det": round(time_call(lambda: sympy_matrix.det(), repeat) * 1e3, 3),
+        }
+    return results
+
+def run(sizes, exact_sizes, repeat):
+    return {
+        "lapack_end_to_end_ms": _lapack(sizes, repeat),
+        "determinant_ms": _exact(exact_sizes, repeat),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Matrix requests through LAPACK up to the size cap, and exact Bareiss against float and sympy determinants")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100, 200, 500], help="Sizes for the LAPACK path")
+    parser.add_argument('--exact-sizes', type=int, nargs='+', default=[4, 8, 16], help="Sizes for the exact comparison")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of each operation; the best one counts")
+    options = parser.parse_args()
+    emit(run(options.sizes, options.exact_sizes, options.repeat), sys.stdout)
@@ -0,0 +1,114 @@
+import os
+import re
+import sys
+import random
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, emit
+from src.utils.normalizer import (MATH_SYMBOLS, EQUATION_CLEANUP, SPECIAL_CHARACTERS, normalize_symbols,
+                                  clean_equation, normalize_characters, normalize_equation)
+
+# The per-variant implementations the normalizer replaced, kept to check output and timing against
+
+def legacy_normalize_expression(expression):
+    symbol_map = {variant: standard for standard, variants in MATH_SYMBOLS.items() for variant in variants}
+    normalized = ''
+    i = 0
+    while i < len(expression):
+        found = False
+        for variant, standard in symbol_map.items():
+            if expression[i:].startswith(variant):
+                normalized += standard
+                i += len(variant)
+                found = True
+                break
+        if not found:
+            normalized += expression[i]
+            i += 1
+    return normalized
+
+def legacy_clean_equation(eq):
+    cleaned = eq.strip()
+    cleaned = re.sub(r'[""''‛]', '', cleaned)
+    cleaned = re.sub(r'[×⋅∗⨯]', '*', cleaned)
+    cleaned = re.sub(r'[÷∕⁄]', '/', cleaned)
+    cleaned = re.sub(r'[−–—]', '-', cleaned)
+    cleaned = re.sub(r'[=＝≡≈≋]', '=', cleaned)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    return cleaned
+
+def legacy_normalize_characters(text):
+    for special, standard in SPECIAL_CHARACTERS.items():
+        text = text.replace(special, standard)
+    return text
+
+def _alphabet():
+    special = {v for variants in MATH_SYMBOLS.values() for v in variants} | set(EQUATION_CLEANUP) | set(SPECIAL_CHARACTERS)
+    return sorted(special) + list("abcnxyz0123456789 ()+-*/^='.\t\n") + ['‘', '’', '“', '”', 'é', '√', '∫', '\xa0', '\x1c', '\u2028', '\u3000']
+
+def pasted_text(size, seed=0):
+    """Text of about `size` characters mixing ASCII math with the unicode variants people paste"""
+    rng = random.Random(seed)
+    alphabet = _alphabet()
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+# Lines as they come out of a copied worksheet: mostly ASCII with typeset operators
+WORKSHEET = [
+    "1. Solve 3𝑥 + 2 = 11 and check your answer.",
+    "2. Find y when 4×y − 7 = 9.",
+    "3. Simplify (x² + 2x) ÷ x for x ≠ 0.",
+    "4. If 2⋅z – 5 ≡ 13, what is “z”?",
+    "5. Evaluate 7 − 3 × 2 ⁄ 6 + ‐1.",
+]
+
+def worksheet_text(size):
+    """Worksheet lines repeated to about `size` characters"""
+    text = "\n".join(WORKSHEET) + "\n"
+    return (text * (size // len(text) + 1))[:size]
+
+def check(samples, seed=1):
+    """Number of random inputs on which any new function differs from the one it replaced"""
+    rng = random.Random(seed)
+    alphabet = _alphabet()
+    pairs = [
+        (legacy_normalize_expression, normalize_symbols),
+        (legacy_clean_equation, clean_equation),
+        (legacy_normalize_characters, normalize_characters),
+        (lambda t: legacy_normalize_characters(legacy_clean_equation(t)), normalize_equation),
+    ]
+    mismatches = 0
+    for _ in range(samples):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        mismatches += sum(old(text) != new(text) for old, new in pairs)
+    return mismatches
+
+def _compare(text, repeat):
+    legacy_symbols = time_call(lambda: legacy_normalize_expression(text))
+    symbols = time_call(lambda: normalize_symbols(text), repeat)
+    legacy_equation = time_call(lambda: legacy_normalize_characters(legacy_clean_equation(text)), repeat)
+    equation = time_call(lambda: normalize_equation(text), repeat)
+    return {
+        "symbols_ms": {"legacy": round(legacy_symbols * 1e3, 3), "single_pass": round(symbols * 1e3, 3)},
+        "symbols_speedup": round(legacy_symbols / symbols, 1),
+        "equation_ms": {"legacy": round(legacy_equation * 1e3, 3), "single_pass": round(equation * 1e3, 3)},
+        "equation_speedup": round(legacy_equation / equation, 1),
+    }
+
+def run(sizes, repeat, samples):
+    results = {"mismatches": check(samples), "worksheet": {}, "dense_unicode": {}}
+    for size in sizes:
+        results["worksheet"][f"{size}_chars"] = _compare(worksheet_text(size), repeat)
+        results["dense_unicode"][f"{size}_chars"] = _compare(pasted_text(size), repeat)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-pass normalization against the per-variant loops on long pasted inputs")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 30000], help="Input lengths in characters")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of each fast path; the best one counts")
+    parser.add_argument('--samples', type=int, default=5000, help="Random inputs compared for identical output")
+    options = parser.parse_args()
+    emit(run(options.sizes, options.repeat, options.samples), sys.stdout)
@@ -0,0 +1,70 @@
+import os
+import sys
+import random
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, quiet_stdout, emit
+
+def generate(count, degree, seed=0):
+    """Distinct polynomial equations in x with small integer coefficients"""
+    rng = random.Random(seed)
+    equations = set()
+    while len(equations) < count:
+        coefficients = [rng.choice([n for n in range(-9, 10) if n])] + [rng.randint(-9, 9) for _ in range(degree)]
+        terms = [f"{c}*x**{degree - i}" for i, c in enumerate(coefficients[:-1])] + [str(coefficients[-1])]
+        equations.add(" + ".join(terms).replace('+ -', '- ') + " = 0")
+    return sorted(equations)
+
+def run(count, repeat):
+    import numpy
+    from src.chat_model import SimpleMathModel
+    from src.solvers.polynomial import polynomial_equation, reduce_polynomial, companion_roots
+
+    model = SimpleMathModel()
+    model.result_store = None
+    quadratics = generate(count, 2)
+    # Warm sympy outside the timed region
+    model._solve_normalized("x**2 - 1 = 0", None)
+
+    sympy_seconds = time_call(lambda: [model._solve_normalized(eq, None) for eq in quadratics])
+    closed_seconds = time_call(lambda: [model._solve_polynomial(eq) for eq in quadratics], repeat)
+
+    higher = generate(count, 5, seed=1)
+    polynomials = [reduce_polynomial(polynomial_equation(*eq.split('='))[1])[0] for eq in higher]
+    single_roots = time_call(lambda: [numpy.roots([float(c) for c in p]) for p in polynomials], repeat)
+    stacked_roots = time_call(lambda: companion_roots(polynomials), repeat)
+    single_solve = time_call(lambda: [model.solve(eq) for eq in higher], repeat)
+    batch_solve = time_call(lambda: list(model.solve_many(higher)), repeat)
+
+    def per_item(seconds, items):
+        return round(seconds / len(items) * 1e6, 2)
+
+    return {
+        "quadratics": {
+            "count": len(quadratics),
+            "per_equation_us": {"closed_form": per_item(closed_seconds, quadratics),
+                                "sympy_solve": per_item(sympy_seconds, quadratics)},
+            "speedup": round(sympy_seconds / closed_seconds, 1),
+        },
+        "degree_5": {
+            "count": len(higher),
+            "per_polynomial_us": {
+                "numpy_roots": per_item(single_roots, polynomials),
+                "stacked_companion": per_item(stacked_roots, polynomials),
+                "solve": per_item(single_solve, higher),
+                "solve_many": per_item(batch_solve, higher),
+            },
+        },
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polynomial engine against sympy, and batched against per-call roots")
+    parser.add_argument('--count', type=int, default=300, help="Equations per group")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of each fast path; the best one counts")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.count, options.repeat), stdout)
@@ -0,0 +1,55 @@
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, quiet_stdout, emit
+
+# Arithmetic the tiers answer differently: small and big rationals, small and big irrationals
+WORKLOADS = {
+    "rational": "1/3 + 2/7 * 5/11 - 0.125",
+    "big_rational": "2^4000 / 3^1000 + 1/7",
+    "big_integer": "3^4000 - 2^6000",
+    "irrational": "sqrt(2) + pi * sin(1) / ln(10)",
+    "big_irrational": "2^9000 * sqrt(3)",
+}
+
+def _answer(model, problem, precision):
+    result = model._solve_normalized(problem, model.solve_deadline, precision)
+    return result.get("answer", result.get("error"))
+
+def run(tiers, calls, repeat):
+    from src.chat_model import SimpleMathModel
+    from src.solvers.expression import compile_expression
+    from src.solvers.precision import FLOAT, parse_precision
+
+    model = SimpleMathModel()
+    tiers = [parse_precision(tier) for tier in tiers]
+    results = {}
+    for name, problem in WORKLOADS.items():
+        compile_expression(problem)
+        results[name] = {"problem": problem}
+        for precision in tiers:
+            # Warm the compile cache and mpmath's contexts outside the timing
+            answer = _answer(model, problem, precision)
+            seconds = time_call(lambda: [_answer(model, problem, precision) for _ in range(calls)], repeat)
+            label = FLOAT if precision == FLOAT else f"{precision}_digits"
+            text = str(answer)
+            results[name][label] = {
+                "us_per_call": round(seconds / calls * 1e6, 2),
+                "answer": text if len(text) <= 40 else text[:37] + '...',
+            }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cost of answering arithmetic in each precision tier")
+    parser.add_argument('--tiers', nargs='+', default=['float', '15', '50', '1000'],
+                        help="'float' and/or numbers of digits")
+    parser.add_argument('--calls', type=int, default=200, help="Solves per timing run")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing runs; the best one counts")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.tiers, options.calls, options.repeat), stdout)
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import quiet_stdout, emit
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+# Metrics may grow by this fraction over the baseline before counting as a regression,
+# and must also exceed it by MIN_REGRESSION_MS so timer noise on tiny values is ignored
+DEFAULT_THRESHOLD = 0.5
+MIN_REGRESSION_MS = 5.0
+
+# (module, class) pairs measured one per fresh interpreter
+COMPONENTS = {
+    'SimpleMathModel': ('src.chat_model', 'SimpleMathModel'),
+    'MathTFModel': ('src.models.tf_model', 'MathTFModel'),
+    'SelfLearner': ('src.learning.self_learner', 'SelfLearner'),
+    'WikiHelper': ('src.utils.wiki_helper', 'WikiHelper'),
+    'ChatBot': ('src.chat_model', 'ChatBot'),
+}
+
+COMPONENT_PROBE = """
+import importlib, json, sys, time
+sys.argv = ['bench']
+start = time.perf_counter()
+module = importlib.import_module(%(module)r)
+imported = time.perf_counter()
+getattr(module, %(cls)r)()
+built = time.perf_counter()
+sys.__stdout__.write(json.dumps({'import_ms': (imported - start) * 1e3, 'init_ms': (built - imported) * 1e3}) + '\\n')
+"""
+
+LATENCY_PROBE = """
+import json, sys, time
+sys.argv = ['bench']
+from src.benchmarks.common import load_corpus
+from src.chat_model import ChatBot
+problems, messages = load_corpus()
+chatbot = ChatBot()
+timings = {}
+for name, corpus in (('math_problems', problems), ('conversations', messages)):
+    samples = []
+    for message in corpus:
+        start = time.perf_counter()
+        chatbot.get_response(message)
+        samples.append((time.perf_counter() - start) * 1e3)
+    timings[name] = samples
+sys.__stdout__.write(json.dumps(timings) + '\\n')
+"""
+
+def _probe(code):
+    """Run probe code in a fresh interpreter and return the JSON it prints last.
+
+    Each run gets an empty result store of its own, so stored answers from earlier runs never
+    stand in for solving.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, MATH_RESULT_STORE=os.path.join(directory, 'results.sqlite3'))
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=project_root, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def measure_components(runs):
+    """Median import and init time of each component, each in a fresh interpreter"""
+    results = {}
+    for name, (module, cls) in COMPONENTS.items():
+        samples = [_probe(COMPONENT_PROBE % {'module': module, 'cls': cls}) for _ in range(runs)]
+        results[name] = {
+            'import_ms': round(statistics.median(s['import_ms'] for s in samples), 2),
+            'init_ms': round(statistics.median(s['init_ms'] for s in samples), 2),
+        }
+    return results
+
+def measure_latency(runs):
+    """End-to-end get_response latency over the training corpus, cold first call included"""
+    runs_data = [_probe(LATENCY_PROBE) for _ in range(runs)]
+    results = {}
+    for name in runs_data[0]:
+        firsts = [run[name][0] for run in runs_data]
+        warm = [sample for run in runs_data for sample in run[name][1:]]
+        results[name] = {
+            'first_ms': round(statistics.median(firsts), 2),
+            'p50_ms': round(_percentile(warm, 0.5), 3),
+            'p95_ms': round(_percentile(warm, 0.95), 3),
+        }
+    return results
+
+def _flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def find_regressions(results, baselines, threshold):
+    """Metrics that grew past the baseline by more than the allowed margin"""
+    regressions = []
+    current = _flatten(results)
+    for metric, baseline in _flatten(baselines).items():
+        value = current.get(metric)
+        if value is None:
+            continue
+        if value > baseline * (1 + threshold) and value - baseline > MIN_REGRESSION_MS:
+            regressions.append({'metric': metric, 'baseline': baseline, 'value': value})
+    return regressions
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Startup and per-component initialization benchmarks")
+    parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed growth over baseline before failing (0.5 = +50%%)")
+    parser.add_argument('--update-baselines', action='store_true',
+                        help="Store this run as the new baselines")
+    options = parser.parse_args(args)
+
+    stdout = quiet_stdout()
+    results = {
+        'components': measure_components(options.runs),
+        'latency': measure_latency(options.runs),
+    }
+
+    if options.update_baselines:
+        with open(BASELINES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        regressions = []
+    elif os.path.exists(BASELINES_FILE):
+        with open(BASELINES_FILE, 'r', encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), options.threshold)
+    else:
+        regressions = []
+
+    emit({'results': results, 'threshold': options.threshold, 'regressions': regressions}, stdout)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import os
+import sys
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, emit
+from src.solvers.statistics import stream_file, describe
+
+MEASURES = [('mean', False), ('std', True), ('median', False), ('percentile', 90.0)]
+
+def write_values(path, count, seed=0):
+    """A CSV of `count` measurements, ten to a line, as an export would hold them"""
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        for start in range(0, count, 10):
+            f.write(','.join(f"{rng.gauss(50, 12):.4f}" for _ in range(min(10, count - start))) + '\n')
+
+def list_describe(path):
+    """Values as a list of Python floats and the statistics module, as the data would be read without the engine"""
+    with open(path) as f:
+        values = [float(value) for value in f.read().replace(',', ' ').split()]
+    return (statistics.fmean(values), statistics.stdev(values), statistics.median(values),
+            statistics.quantiles(values, n=10, method='inclusive')[-1])
+
+def engine_describe(path):
+    return describe(stream_file(path), MEASURES)
+
+def moments_describe(path):
+    # Mean and standard deviation only: no value is kept
+    return describe(stream_file(path, keep=False), MEASURES[:2])
+
+def _peak_mb(func, *args):
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(peak / 2 ** 20, 1)
+
+def run(count, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'values.csv')
+        write_values(path, count)
+        expected = list_describe(path)
+        _, _, found = describe(stream_file(path), MEASURES)
+        return {
+            "values": count,
+            "file_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+            "seconds": {
+                "list_and_statistics_module": round(time_call(lambda: list_describe(path), repeat), 3),
+                "streaming_engine": round(time_call(lambda: engine_describe(path), repeat), 3),
+                "streaming_moments_only": round(time_call(lambda: moments_describe(path), repeat), 3),
+            },
+            "peak_python_mb": {
+                "list_and_statistics_module": _peak_mb(list_describe, path),
+                "streaming_engine": _peak_mb(engine_describe, path),
+                "streaming_moments_only": _peak_mb(moments_describe, path),
+            },
+            "max_relative_difference": max(abs(a - b) / abs(a) for a, b in zip(expected, found.values())),
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming statistics over a CSV file against a Python list and the statistics module")
+    parser.add_argument('--count', type=int, default=2000000, help="Values in the generated file")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of each approach; the best one counts")
+    options = parser.parse_args()
+    emit(run(options.count, options.repeat), sys.stdout)
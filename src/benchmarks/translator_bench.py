@@ -0,0 +1,86 @@
+import os
+import re
+import sys
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, emit
+from src.utils.word_translator import translate_words
+
+# The chain of replacements the alternate solver and extract_math_problem ran, in their order
+LEGACY_TRANSLATIONS = {
+    'plus': '+',
+    'minus': '-',
+    'times': '*',
+    'multiplied by': '*',
+    'divide': '/',
+    'divided by': '/',
+    'over': '/',
+    'to the power of': '^',
+}
+LEGACY_FILLER = ['solve', 'calculate', 'what is', 'evaluate', 'compute']
+
+def legacy_translate(text):
+    for word, symbol in LEGACY_TRANSLATIONS.items():
+        text = text.replace(word, symbol)
+    for word in LEGACY_FILLER:
+        text = text.replace(word, '')
+    return text
+
+def _per_phrase_patterns():
+    # What the chain needs to respect word boundaries and longest matches: one regex pass per phrase
+    phrases = sorted((p for p, (kind, _) in translate_words.phrases.items() if kind in ('replace', 'relation')),
+                     key=len, reverse=True)
+    return [(re.compile(rf"\b{re.escape(p)}\b"), translate_words.phrases[p][1]) for p in phrases]
+
+def per_phrase_translate(text, patterns):
+    for pattern, symbol in patterns:
+        text = pattern.sub(symbol, text)
+    return text
+
+# Sentences of a long word problem, as students paste them
+WORD_PROBLEM = [
+    "What is the sum of 12 and 7 divided by 3?",
+    "Then 5 multiplied by 4 to the power of 2 is compared with the product of 6 and 8.",
+    "Sometimes the overall cost is 40 minus 15 over 5, plus the difference between 9 and 4.",
+    "Calculate x squared minus 3 times x, and check whether it is greater than or equal to 10.",
+    "A rectangle's area equals its length times its width; solve for the width when the area is 24.",
+]
+
+def word_problem(size):
+    """Word-problem sentences repeated to about `size` characters"""
+    text = " ".join(WORD_PROBLEM) + " "
+    return (text * (size // len(text) + 1))[:size]
+
+def run(sizes, repeat):
+    examples = ["8 divided by 2", "what is 6 times 7", "the sum of 2 and 3", "sometimes over"]
+    results = {
+        "examples": {text: {"legacy": legacy_translate(text), "single_pass": translate_words(text)} for text in examples},
+    }
+    patterns = _per_phrase_patterns()
+    for size in sizes:
+        text = word_problem(size).lower()
+        legacy = time_call(lambda: legacy_translate(text), repeat)
+        per_phrase = time_call(lambda: per_phrase_translate(text, patterns), repeat)
+        single = time_call(lambda: translate_words(text), repeat)
+        results[f"{size}_chars"] = {
+            "ms": {
+                "legacy_replace_chain": round(legacy * 1e3, 3),
+                "per_phrase_regex": round(per_phrase * 1e3, 3),
+                "single_pass": round(single * 1e3, 3),
+            },
+            "speedup_over_per_phrase_regex": round(per_phrase / single, 1),
+        }
+    short = "sqrt(2*x + 1) = 3"
+    results["symbolic_input_us"] = round(time_call(lambda: [translate_words(short) for _ in range(1000)], repeat) * 1e3, 3)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-pass word translation against per-phrase replacement on long word problems")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="Input lengths in characters")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of each translator; the best one counts")
+    options = parser.parse_args()
+    emit(run(options.sizes, options.repeat), sys.stdout)
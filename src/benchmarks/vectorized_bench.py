@@ -0,0 +1,42 @@
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.benchmarks.common import time_call, quiet_stdout, emit
+
+EXPRESSIONS = ["x^2 - 3x", "x^3 - 3x + sin(x)", "sqrt(abs(x)) / (x^2 + 1)"]
+
+def run(points, repeat):
+    import numpy
+    from src.chat_model import SimpleMathModel
+    from src.solvers.expression import compile_expression, evaluate
+
+    model = SimpleMathModel()
+    values = numpy.linspace(-10, 10, points)
+    # The per-point baseline is too slow for millions of points, so it runs on a sample
+    sample = values[:: max(1, points // 10000)].tolist()
+
+    results = {}
+    for expression in EXPRESSIONS:
+        model.evaluate_over(expression, 'x', values[:2])
+        tree = compile_expression(expression)
+        vectorized = time_call(lambda: model.evaluate_over(expression, 'x', values), repeat)
+        per_point = time_call(lambda: [evaluate(tree, {'x': v}) for v in sample])
+        results[expression] = {
+            "vectorized_ns_per_point": round(vectorized / points * 1e9, 2),
+            "per_point_ns": round(per_point / len(sample) * 1e9, 2),
+            "speedup": round((per_point / len(sample)) / (vectorized / points), 1),
+        }
+    return {"points": points, "expressions": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="evaluate_over against evaluating one point at a time")
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3, help="Vectorized runs; the best one counts")
+    options = parser.parse_args()
+    stdout = quiet_stdout()
+    emit(run(options.points, options.repeat), stdout)
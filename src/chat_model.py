@@ -27,13 +27,28 @@ try:
     from difflib import SequenceMatcher
     from datetime import datetime
     import random
+    import html
     from pathlib import Path
     from fractions import Fraction
-    from sympy.solvers import solve
-    from sympy.parsing.sympy_parser import parse_expr
-    from src.utils.wiki_helper import WikiHelper
-    from src.learning.self_learner import SelfLearner
-    from src.models.tf_model import MathTFModel  # Update this line
+    from contextlib import contextmanager
+    from src.utils.lazy_import import lazy_module, LazyComponent
+    from src.utils.deadline import run_with_deadline, DeadlineExceeded, record_fallback, deadline_stats
+    from src.solvers.expression import (evaluate_expression, compile_expression, free_variables, ExpressionError,
+                                        FUNCTIONS, CONSTANTS)
+    from src.solvers.linear import linear_equation, format_linear, NotLinearError
+    from src.solvers.linear_system import solve_linear_system, UNIQUE, INFINITE
+    from src.solvers.polynomial import (polynomial_equation, solve_polynomial, format_polynomial,
+                                        reduce_polynomial, companion_roots, NotPolynomialError)
+    from src.solvers.vectorized import compile_vectorized
+    from src.solvers.canonical import canonical_form
+    from src.solvers.precision import FLOAT, parse_precision, precise_expression, format_precise
+    from src.solvers.geometry import GeometryError, load_geometry, format_number
+    from src.solvers.matrix import MatrixError, find_matrix, parse_matrix_request, solve_matrix
+    from src.solvers.inequality import (solve_inequality, split_inequality, format_intervals, format_chart,
+                                        NotInequalityError)
+    from src.utils.expr_cache import LRUCache
+    from src.utils.normalizer import (clean_equation, normalize_characters,
+                                      normalize_symbols, normalize_equation)
 except ImportError as e:
     sys.stderr.write(json.dumps({
         "error": f"Import error: {str(e)}",
@@ -41,54 +56,58 @@ except ImportError as e:
         "confidence": 0
     }) + '\n')
     sys.exit(1)
-    
-MATH_SYMBOLS = {
-    'x': ['x', '𝑥', '𝓍', '𝔵', 'χ'],
-    'y': ['y', '𝑦', '𝓎', '𝔶', 'γ'],
-    'z': ['z', '𝑧', '𝓏', '𝔷', 'ζ'],
-    '+': ['+', '＋', '➕', '∑'],
-    '-': ['-', '−', '－', '➖'],
-    '*': ['*', '×', '⋅', '∗', '⨯'],
-    '/': ['/', '÷', '∕', '⁄'],
-    '=': ['=', '＝', '≡', '≈', '≋'],
-    '^': ['^', '⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹']
-}
-
-def clean_equation(eq):
-    """Clean equation string of unwanted characters and normalize format"""
-    # Replace special math characters with standard ones
-    cleaned = eq.strip()
-    cleaned = re.sub(r'[""''‛]', '', cleaned)  # Remove smart quotes
-    cleaned = re.sub(r'[×⋅∗⨯]', '*', cleaned)  # Normalize multiplication
-    cleaned = re.sub(r'[÷∕⁄]', '/', cleaned)   # Normalize division
-    cleaned = re.sub(r'[−–—]', '-', cleaned)   # Normalize minus
-    cleaned = re.sub(r'[=＝≡≈≋]', '=', cleaned) # Normalize equals
-    cleaned = re.sub(r'\s+', ' ', cleaned)     # Normalize spaces
-    return cleaned
-
-def normalize_characters(text):
-    """Normalize special mathematical characters to standard ASCII"""
-    chars = {
-        '−': '-',  # U+2212 minus sign
-        '–': '-',  # en dash
-        '—': '-',  # em dash
-        '⁃': '-',  # hyphen bullet
-        '‐': '-',  # hyphen
-        '⁄': '/',  # fraction slash
-        '∕': '/',  # division slash
-        '÷': '/',  # division sign
-        '×': '*',  # multiplication sign
-        '⋅': '*',  # dot operator
-        '∗': '*',  # asterisk operator
-        '·': '*',  # middle dot
-        '⨯': '*',  # vector multiplication
-        '∙': '*',  # bullet operator
-        '⁺': '+',  # superscript plus
-        '⁻': '-',  # superscript minus
-    }
-    for special, standard in chars.items():
-        text = text.replace(special, standard)
-    return text
+
+# Heavy dependencies are only imported once a request actually needs them
+sympy = lazy_module('sympy')
+sympy_parser = lazy_module('sympy.parsing.sympy_parser')
+numpy = lazy_module('numpy')
+# Engines and helpers a plain arithmetic request may never reach are imported on first use too
+calculus_solver = lazy_module('src.solvers.calculus')
+statistics_solver = lazy_module('src.solvers.statistics')
+result_store = lazy_module('src.utils.result_store')
+word_translator = lazy_module('src.utils.word_translator')
+
+# Seconds a symbolic solve may run before falling back to numeric root finding
+DEFAULT_SOLVE_DEADLINE = float(os.environ.get('MATH_SOLVE_DEADLINE', '5'))
+# 'float' answers arithmetic in machine floats; a number of digits keeps rationals exact and
+# evaluates irrational results to that many digits
+DEFAULT_PRECISION = parse_precision(os.environ.get('MATH_PRECISION', FLOAT))
+
+# Parsed sympy expressions keyed by the normalized equation side they came from
+PARSE_CACHE = LRUCache(int(os.environ.get('MATH_PARSE_CACHE_SIZE', '2048')))
+# Finished derivatives, integrals and limits keyed by the canonical form of the request
+CALCULUS_CACHE = LRUCache(int(os.environ.get('MATH_CALCULUS_CACHE_SIZE', '1024')))
+OPERATOR_SPACING = re.compile(r'\s*([-+*/^=()])\s*')
+
+# Bump whenever solver output changes so results stored by older versions are ignored
+SOLVER_VERSION = 5
+# Symbolic results persist here across restarts; set MATH_RESULT_STORE to '' to disable
+RESULT_STORE_PATH = os.environ.get('MATH_RESULT_STORE', os.path.join(project_root, 'data', 'solve_cache.sqlite3'))
+RESULT_STORE_SIZE = int(os.environ.get('MATH_RESULT_STORE_SIZE', '100000'))
+# Shapes, quantities and formulas the geometry engine compiles at startup
+GEOMETRY_NOTES_PATH = os.path.join(project_root, 'data', 'math_notes', 'geometry.json')
+
+# "evaluate x^2 - 3x for x from -10 to 10", optionally followed by "step 0.5"
+VALUE_TABLE_REQUEST = re.compile(
+    r'(?:evaluate|tabulate|table of)\s+(?P<expression>.+?)\s+for\s+(?P<var>[a-z])\s+'
+    r'from\s+(?P<start>-?\d+(?:\.\d+)?)\s+to\s+(?P<stop>-?\d+(?:\.\d+)?)'
+    r'(?:\s+(?:step|by)\s+(?P<step>\d+(?:\.\d+)?))?',
+    re.IGNORECASE
+)
+MAX_TABLE_ROWS = 201
+
+# Unknowns solved for first when an equation has several variables; the rest go alphabetically
+PREFERRED_UNKNOWNS = ('x', 'y', 'z')
+
+# Any comparison sign makes a problem an inequality
+INEQUALITY_SIGN = re.compile(r'[<>]')
+# A comparison between expressions in a chat message, possibly chained: "2x + 1 > 5", "-1 <= 3 - x < 4"
+INEQUALITY_TEXT = re.compile(r'[\w\s.+\-*/^()]*(?:(?:<=|>=|<|>)[\w\s.+\-*/^()]*){1,2}')
+# Words that may start or end an extracted expression without being part of the sentence
+EXPRESSION_WORDS = set(FUNCTIONS) | set(CONSTANTS)
+
+# Answer prefix of a system sympy failed on
+SYSTEM_FAILURE = "Could not solve system"
 
 class SimpleMathModel:
     def __init__(self):
@@ -101,35 +120,23 @@ class SimpleMathModel:
             '/': lambda x, y: x / y,
             '^': lambda x, y: x ** y
         }
-        from sympy import symbols
-        self.x, self.y, self.z = symbols('x y z')
-        self.symbol_map = self._create_symbol_map()
-
-    def _create_symbol_map(self):
-        """Create a mapping of all possible symbols to their standard form"""
-        mapping = {}
-        for standard, variations in MATH_SYMBOLS.items():
-            for variant in variations:
-                mapping[variant] = standard
-        return mapping
+        # Finished results shared while a batch is running
+        self._batch = None
+        self.solve_deadline = DEFAULT_SOLVE_DEADLINE
+        self.precision = DEFAULT_PRECISION
+        self.result_store = result_store.ResultStore(RESULT_STORE_PATH, SOLVER_VERSION, RESULT_STORE_SIZE) if RESULT_STORE_PATH else None
+        self.geometry = self._load_geometry()
+
+    def _load_geometry(self):
+        try:
+            return load_geometry(GEOMETRY_NOTES_PATH)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading geometry formulas: {e}", file=sys.stderr)
+            return None
 
     def _normalize_expression(self, expression):
-        """Convert all mathematical symbols to their standard form"""
-        normalized = ''
-        i = 0
-        while i < len(expression):
-            found = False
-            # Try to match multi-char symbols first
-            for variant, standard in self.symbol_map.items():
-                if expression[i:].startswith(variant):
-                    normalized += standard
-                    i += len(variant)
-                    found = True
-                    break
-            if not found:
-                normalized += expression[i]
-                i += 1
-        return normalized
+        """Convert all mathematical symbols and operator words to their standard form"""
+        return word_translator.translate_words(normalize_symbols(expression))
 
     def _identify_problem_type(self, problem):
         """Identify the type of math problem"""
@@ -141,42 +148,36 @@ class SimpleMathModel:
         if 'x' in problem or '=' in problem: return "Algebraic"
         return "Unknown"
 
-    def _safe_eval(self, problem):
+    def _safe_eval(self, problem, precision=FLOAT):
         """Safely evaluate math expression without using eval()"""
         # Normalize the expression first
         problem = self._normalize_expression(problem)
-        # Clean and tokenize the expression
-        problem = problem.replace(' ', '')
-        problem = problem.replace('^', '**')
-        
-        # Handle basic arithmetic
-        for op in ['+-', '*/', '**']:
-            tokens = re.split(f'([{op}])', problem)
-            if len(tokens) > 1:
-                tokens = [t for t in tokens if t.strip()]
-                try:
-                    nums = [float(tokens[0])]
-                    for i in range(1, len(tokens), 2):
-                        op = tokens[i]
-                        num = float(tokens[i + 1])
-                        if op == '+': nums.append(num)
-                        elif op == '-': nums.append(-num)
-                        elif op == '*': nums[-1] *= num
-                        elif op == '/': nums[-1] /= num
-                        elif op == '**': nums[-1] **= num
-                    return sum(nums)
-                except (ValueError, IndexError):
-                    raise ValueError("Invalid math expression")
-        
-        # If no operators found, try to parse as a single number
-        try:
-            return float(problem)
-        except ValueError:
-            raise ValueError("Invalid math expression")
+        # Compiled once per distinct string; rationals stay exact (int/Fraction) in every tier
+        if precision == FLOAT:
+            return evaluate_expression(problem)
+        return precise_expression(problem, precision)
 
-    def _format_fraction(self, result):
+    def _format_fraction(self, result, precision=FLOAT):
         """Format result as a fraction if needed"""
-        if isinstance(result, (int, float)):
+        if precision != FLOAT:
+            return format_precise(result, precision)
+        if isinstance(result, int):
+            # Already exact, and a float round trip would only cost time on big values
+            return {"decimal": result}
+        if isinstance(result, Fraction):
+            if result.denominator == 1:
+                return {"decimal": result.numerator}
+            try:
+                decimal = float(result)
+            except OverflowError:
+                # Too big for a float, so shown with a float's 17 significant digits instead
+                return format_precise(result, 17)
+            return {
+                "decimal": decimal,
+                "fraction": f"{result.numerator}/{result.denominator}",
+                "display": f"<sup>{result.numerator}</sup>⁄<sub>{result.denominator}</sub>"
+            }
+        if isinstance(result, float):
             try:
                 fraction = Fraction(str(float(result))).limit_denominator()
                 if fraction.denominator != 1:
@@ -185,30 +186,139 @@ class SimpleMathModel:
                         "fraction": f"{fraction.numerator}/{fraction.denominator}",
                         "display": f"<sup>{fraction.numerator}</sup>⁄<sub>{fraction.denominator}</sub>"
                     }
-            except (ValueError, ZeroDivisionError):
+            except (ValueError, ZeroDivisionError, OverflowError):
                 pass
         return {"decimal": result}
 
-    def solve_system_of_equations(self, equations):
-        """Solve a system of linear equations"""
+    @contextmanager
+    def batch_scope(self):
+        """Share results across the solves inside the block"""
+        outer = self._batch
+        if outer is None:
+            self._batch = {"results": {}, "roots": {}}
         try:
-            from sympy import symbols, solve, simplify
-            from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
-            
-            x, y = symbols('x y')
-            transformations = standard_transformations + (implicit_multiplication_application,)
-            
+            yield
+        finally:
+            if outer is None:
+                self._batch = None
+
+    def _compact(self, text):
+        """Collapse whitespace and drop spaces next to operators, which never change the parse"""
+        return OPERATOR_SPACING.sub(r'\1', ' '.join(text.split()))
+
+    def evaluate_over(self, expression, var, values):
+        """Evaluate expression at every value of var in one vectorized pass (nan where undefined)"""
+        # The compiled form is cached per expression, so repeated tables and plots reuse it
+        return compile_vectorized(self._normalize_expression(expression).strip(), var)(values)
+
+    def _parse(self, text):
+        """Parse one equation side with implicit multiplication ("2x" -> "2*x")"""
+        # "2x + 3" and "2x+3" share an entry
+        text = self._compact(text)
+
+        def parse():
+            transformations = sympy_parser.standard_transformations + (sympy_parser.implicit_multiplication_application,
+                                                                       sympy_parser.convert_xor)
+            return sympy_parser.parse_expr(text, transformations=transformations)
+
+        # sympy expressions are immutable, so every caller can share the parsed tree
+        return PARSE_CACHE.get_or_compute(text, parse)
+
+    def parse_cache_stats(self):
+        """Hit/miss/eviction counters of the shared parsed-expression cache"""
+        return PARSE_CACHE.stats()
+
+    def calculus_cache_stats(self):
+        """Hit/miss/eviction counters of the memoized calculus results"""
+        return CALCULUS_CACHE.stats()
+
+    def result_store_stats(self):
+        """Counters of the persistent result store, or None when it is disabled"""
+        return self.result_store.stats() if self.result_store is not None else None
+
+    def _numeric_roots(self, expressions, variables):
+        """Approximate solutions used when the symbolic solve runs out of time"""
+        if len(expressions) == 1 and len(variables) == 1:
+            expr, var = expressions[0], variables[0]
+            if expr.is_polynomial(var):
+                coeffs = [complex(c) for c in sympy.Poly(expr, var).all_coeffs()]
+                roots = numpy.roots(coeffs)
+                real = sorted(r.real for r in roots if abs(r.imag) < 1e-9)
+                return [{var: value} for value in real] or [{var: value} for value in roots]
+
+        for start in (1.0, 0.5, -1.0, 10.0, -10.0):
+            try:
+                values = sympy.nsolve(expressions, variables, [start] * len(variables))
+            except (ValueError, ZeroDivisionError, TypeError):
+                continue
+            return [dict(zip(variables, values))]
+        raise ValueError("No numeric solution found")
+
+    def _format_numeric(self, solution):
+        def fmt(value):
+            value = complex(value)
+            real = value.real if abs(value.real) >= 1e-12 else 0.0
+            if abs(value.imag) < 1e-12:
+                return f"{real:.10g}"
+            return f"{real:.10g} {'+' if value.imag >= 0 else '-'} {abs(value.imag):.10g}*I"
+        return ", ".join(f"{var} ≈ {fmt(val)}" for var, val in solution.items())
+
+    def _approximate(self, expressions, variables, deadline):
+        """Numeric answer text after the symbolic solve passed its deadline"""
+        record_fallback()
+        solutions = self._numeric_roots(expressions, variables)
+        answer = " or ".join(self._format_numeric(solution) for solution in solutions)
+        return answer, f"Symbolic solve exceeded {deadline}s; used numeric root finding"
+
+    def _linear_system_answer(self, equations):
+        """Answer text for a system of linear equations, or None when sympy is needed"""
+        rows = []
+        for eq in equations:
+            sides = normalize_equation(eq).split('=')
+            if len(sides) != 2:
+                return None
+            try:
+                rows.append(linear_equation(*sides))
+            except (ExpressionError, NotLinearError):
+                return None
+        if not any(coefficients for coefficients, _ in rows):
+            return None
+
+        status, variables, solution = solve_linear_system(rows)
+        if status == UNIQUE:
+            return ", ".join(f"{var} = {solution[var]}" for var in variables)
+        if status == INFINITE:
+            return "Infinitely many solutions: " + ", ".join(
+                f"{var} = {format_linear(terms, constant)}" for var, (terms, constant) in solution.items()
+            )
+        return "No solution"
+
+    def solve_system_of_equations(self, equations, deadline=None):
+        """Solve a system of equations in whatever variables it uses"""
+        answer = self._linear_system_answer(equations)
+        if answer is not None:
+            return answer
+
+        try:
+            from sympy import solve, simplify
+
             system = []
             for eq in equations:
-                eq = normalize_characters(clean_equation(eq))  # Add normalization here
+                eq = normalize_equation(eq)
                 if '=' in eq:
                     left, right = eq.split('=')
                     # Convert to standard form: ax + by + c = 0
-                    expr = parse_expr(left, transformations=transformations) - parse_expr(right, transformations=transformations)
+                    expr = self._parse(left) - self._parse(right)
                     system.append(expr)
+            variables = sorted(set().union(*(expr.free_symbols for expr in system)), key=lambda s: s.name)
             
             # Solve the system
-            solution = solve(system, [x, y])
+            deadline = self.solve_deadline if deadline is None else deadline
+            try:
+                solution = run_with_deadline(solve, (system, variables), deadline)
+            except DeadlineExceeded:
+                answer, _ = self._approximate(system, variables, deadline)
+                return answer
             
             # Clean and format solution
             if isinstance(solution, dict):
@@ -216,62 +326,535 @@ class SimpleMathModel:
             elif isinstance(solution, list):
                 if len(solution) == 0:
                     return "No solution"
-                elif len(solution) == 1:
-                    return f"x = {solution[0][0]}, y = {solution[0][1]}"
-                else:
-                    solutions = []
-                    for sol in solution:
-                        x_val = simplify(sol[0])
-                        y_val = simplify(sol[1])
-                        solutions.append(f"x = {x_val}, y = {y_val}")
-                    return " or ".join(solutions)
+                solutions = []
+                for sol in solution:
+                    solutions.append(", ".join(f"{var} = {simplify(val)}" for var, val in zip(variables, sol)))
+                return " or ".join(solutions)
             
             return str(simplify(solution))
             
         except Exception as e:
-            return f"Could not solve system: {str(e)}"
+            return f"{SYSTEM_FAILURE}: {str(e)}"
+
+    def solve_many(self, problems, deadline=None, precision=None):
+        """Solve problems in order, yielding each result as soon as it is ready"""
+        deadline = self.solve_deadline if deadline is None else deadline
+        precision = self.precision if precision is None else parse_precision(precision)
+        with self.batch_scope():
+            problems = [self._normalize_expression(problem) for problem in problems]
+            self._prepare_polynomial_roots(problems)
+            for problem in problems:
+                yield self._solve_batched(problem, deadline, precision)
 
-    def solve(self, problem):
+    def _prepare_polynomial_roots(self, problems):
+        """Find the numeric roots of every higher-degree polynomial among normalized problems in one stacked solve"""
+        pending = {}
+        for problem in problems:
+            sides = problem.split('=')
+            if len(sides) != 2:
+                continue
+            try:
+                _, coefficients = polynomial_equation(*sides)
+            except (ExpressionError, NotPolynomialError):
+                continue
+            if len(coefficients) > 3:
+                pending[reduce_polynomial(coefficients)[0]] = None
+        roots = self._batch["roots"]
+        polynomials = [p for p in pending if p not in roots]
+        if polynomials:
+            roots.update(zip(polynomials, companion_roots(polynomials)))
+
+    def solve(self, problem, deadline=None, precision=None):
+        """Solve a problem; symbolic work is cut off after `deadline` seconds (default: solve_deadline)
+        and arithmetic is answered at `precision`, 'float' or a number of digits (default: precision)"""
         # Normalize the problem first
         problem = self._normalize_expression(problem)
+        deadline = self.solve_deadline if deadline is None else deadline
+        precision = self.precision if precision is None else parse_precision(precision)
+        return self._solve_batched(problem, deadline, precision)
+
+    def _solve_batched(self, problem, deadline, precision):
+        if self._batch is None:
+            return self._solve_stored(problem, deadline, precision)
+
+        results = self._batch["results"]
+        key = (problem, precision)
+        if key not in results:
+            results[key] = self._solve_stored(problem, deadline, precision)
+        # Callers may edit the steps, so repeats get their own copy
+        result = dict(results[key])
+        if "steps" in result:
+            result["steps"] = list(result["steps"])
+        return result
+
+    def _is_symbolic(self, problem):
+        """Whether solve routes the problem to sympy rather than plain arithmetic"""
+        return ('\n' in problem or ',' in problem or 'x' in problem or '=' in problem
+                or INEQUALITY_SIGN.search(problem) is not None)
+
+    def problem_hash(self, problem):
+        """Stable key shared by every spelling of the same equations ("2x+3=7", "7 = 3 + 2*x")"""
+        canonical = canonical_form(problem)
+        if canonical is None:
+            # Text the expression parser rejects is still keyed by its compacted spelling
+            canonical = '\n'.join(self._compact(eq) for eq in self._split_equations(problem))
+        return result_store.problem_key(canonical)
+
+    def _split_equations(self, problem):
+        return [eq.strip() for eq in problem.replace(',', '\n').split('\n') if eq.strip()]
+
+    def _solve_stored(self, problem, deadline, precision=FLOAT):
+        """Look symbolic problems up in the result store before solving them"""
+        calculus = calculus_solver.parse_calculus(problem)
+        if calculus is not None:
+            return self._solve_calculus(problem, calculus, deadline)
+        matrix = parse_matrix_request(problem)
+        if matrix is not None:
+            return self._solve_matrix(problem, matrix)
+        try:
+            statistics = statistics_solver.parse_statistics(problem)
+        except ValueError as e:
+            return {"error": str(e), "confidence": 0}
+        if statistics is not None:
+            measures = statistics["measures"]
+            return self._statistics_result(
+                problem, statistics_solver.stream_text(statistics["data"], statistics_solver.needs_values(measures)), measures)
+        try:
+            geometry = self.geometry and self.geometry.parse(problem)
+        except GeometryError as e:
+            return {"error": str(e), "confidence": 0}
+        if geometry:
+            return self._solve_geometry(problem, geometry)
+        # Arithmetic and linear equations are cheaper to recompute than to look up
+        if not self._is_symbolic(problem):
+            return self._solve_normalized(problem, deadline, precision)
+        result = self._solve_exact(problem)
+        if result is not None:
+            return result
+        # Stored answers were computed in machine floats, so a precision request is always solved afresh
+        if self.result_store is None or precision != FLOAT:
+            return self._solve_normalized(problem, deadline, precision)
+
+        key = self.problem_hash(problem)
+        stored = self.result_store.get(key)
+        if stored is not None:
+            stored_problem, result = stored
+            if stored_problem != problem and "steps" in result:
+                result["steps"] = self._rebase_steps(result["steps"], stored_problem, problem)
+            return result
+
+        result = self._solve_normalized(problem, deadline, precision)
+        # Approximations depend on the deadline, so only exact answers are kept. Failures are not
+        # either: an equivalent spelling ("x**2" for "x^2") may parse where this one did not
+        failed = "error" in result or str(result.get("answer", "")).startswith(SYSTEM_FAILURE)
+        if not failed and not result.get("approximate"):
+            self.result_store.put(key, problem, result)
+        return result
+
+    def _pick_unknown(self, names):
+        """Variable to solve a single equation for, or None when it has none"""
+        for name in PREFERRED_UNKNOWNS:
+            if name in names:
+                return name
+        return min(names) if names else None
+
+    def _solve_exact(self, problem):
+        """Route a problem by its unknowns to the cheapest exact engine; None when only sympy can solve it"""
+        if INEQUALITY_SIGN.search(problem):
+            return self._solve_inequality(problem)
+        if len(self._split_equations(problem)) > 1:
+            return self._solve_linear(problem)
+        sides = problem.split('=')
+        if len(sides) != 2:
+            return None
+        try:
+            variables = free_variables(compile_expression(sides[0])) | free_variables(compile_expression(sides[1]))
+        except ExpressionError:
+            return None
+        if not variables:
+            return None
+        result = self._solve_linear(problem)
+        # Only a single unknown can be a polynomial's; several go straight to sympy
+        if result is None and len(variables) == 1:
+            result = self._solve_polynomial(problem)
+        return result
+
+    def _cancelled_result(self, problem, rearranged, names, holds):
+        """Result for an equation whose unknowns cancel out, leaving a true or false statement"""
+        unknowns = ", ".join(sorted(names))
+        return {
+            "answer": "Infinitely many solutions" if holds else "No solution",
+            "type": "Algebraic",
+            "confidence": 100,
+            "steps": [
+                f"1. Original equation: {problem}",
+                f"2. Rearranged to: {rearranged} = 0",
+                f"3. {unknowns} cancelled out: " + ("every value is a solution" if holds else "no value is a solution")
+            ]
+        }
+
+    def _solve_inequality(self, problem):
+        """Solve a polynomial inequality by its sign on each interval between critical points; None when sympy is needed"""
+        try:
+            solved = solve_inequality(problem)
+        except (ExpressionError, NotInequalityError, NotPolynomialError):
+            return None
+
+        var = solved["var"]
+        steps = [f"Original inequality: {problem}"]
+        for part in solved["parts"]:
+            coefficients, points = part["coefficients"], part["points"]
+            rearranged = format_polynomial(coefficients, var) if any(coefficients) else "0"
+            steps.append(f"Rearranged to: {rearranged} {part['relation']} 0")
+            if points:
+                steps.append(f"Critical points where {rearranged} = 0: " + ", ".join(f"{var} = {text}" for _, text in points))
+            else:
+                steps.append(f"No real critical points, so {rearranged} keeps one sign")
+            steps.append("Sign on each interval: " + format_chart(points, part["signs"]))
+        if len(solved["parts"]) > 1:
+            steps.append("Kept the values that satisfy both inequalities")
+        answer = self._interval_answer(var, solved["intervals"])
+        steps.append(f"Solution: {answer}")
+
+        approximate = solved["approximate"]
+        return {
+            "answer": answer,
+            "type": "Inequality",
+            **({"approximate": True} if approximate else {}),
+            "confidence": 90 if approximate else 100,
+            "steps": [f"{i}. {step}" for i, step in enumerate(steps, 1)]
+        }
+
+    def _interval_answer(self, var, intervals):
+        return f"{var} ∈ {format_intervals(intervals)}" if intervals else "No solution"
+
+    def _sympy_intervals(self, solution):
+        """Intervals of a sympy set of reals in the inequality engine's form, or None for other sets"""
+        pieces = solution.args if isinstance(solution, sympy.Union) else (solution,)
+        intervals = []
+        for piece in pieces:
+            if piece is sympy.S.EmptySet:
+                continue
+            if piece == sympy.S.Reals:
+                intervals.append((None, False, None, False))
+            elif isinstance(piece, sympy.Interval):
+                low = None if piece.start == -sympy.oo else (float(piece.start), str(piece.start))
+                high = None if piece.end == sympy.oo else (float(piece.end), str(piece.end))
+                intervals.append((low, not piece.left_open, high, not piece.right_open))
+            elif isinstance(piece, sympy.FiniteSet):
+                intervals.extend(((float(p), str(p)), True, (float(p), str(p)), True) for p in piece)
+            else:
+                return None
+        return sorted(intervals, key=lambda piece: float('-inf') if piece[0] is None else piece[0][0])
+
+    def _solve_inequality_symbolic(self, problem, deadline):
+        """Inequalities outside the polynomial engine (rational, radical, trigonometric) through sympy"""
+        relations = {'<': sympy.Lt, '<=': sympy.Le, '>': sympy.Gt, '>=': sympy.Ge}
+        sides, signs = split_inequality(problem)
+        expressions = [self._parse(side) for side in sides]
+        symbols = {symbol.name: symbol for expression in expressions for symbol in expression.free_symbols}
+        unknown = self._pick_unknown(symbols)
+        if unknown is None:
+            return {"error": "No unknown to solve for", "confidence": 0}
+        if len(symbols) > 1:
+            return {"error": "Inequalities in more than one unknown are not supported", "confidence": 0}
+
+        solution = sympy.S.Reals
+        for left, right, sign in zip(expressions, expressions[1:], signs):
+            solved = run_with_deadline(sympy.solveset, (relations[sign](left, right), symbols[unknown], sympy.S.Reals), deadline)
+            solution = sympy.Intersection(solution, solved)
+        intervals = self._sympy_intervals(solution)
+        answer = self._interval_answer(unknown, intervals) if intervals is not None else f"{unknown} ∈ {solution}"
+        return {
+            "answer": answer,
+            "type": "Inequality",
+            "confidence": 100,
+            "steps": [
+                f"1. Original inequality: {problem}",
+                f"2. Solved over the real numbers for {unknown}",
+                f"3. Solution: {answer}"
+            ]
+        }
+
+    def _solve_calculus(self, problem, request, deadline):
+        """Derivatives, integrals and limits through sympy, memoized per canonical request"""
+        key = calculus_solver.calculus_key(request)
+        cached = CALCULUS_CACHE.get(key)
+        if cached is not None:
+            stored_problem, result = cached
+            return dict(result, steps=self._rebase_steps(result["steps"], stored_problem, problem))
+
+        try:
+            expression = self._parse(request["expression"])
+            symbols = {symbol.name: symbol for symbol in expression.free_symbols}
+            name = request["var"] or self._pick_unknown(set(symbols) - {'e'}) or 'x'
+            var = symbols.get(name, sympy.Symbol(name))
+            if name != 'e' and 'e' in symbols:
+                # Textbooks write e^x for exp(x)
+                expression = expression.subs(symbols['e'], sympy.E)
+
+            operation = request["operation"]
+            if operation == "derivative":
+                answer, steps = run_with_deadline(calculus_solver.solve_derivative, (expression, var, request["order"]), deadline)
+            elif operation == "integral":
+                bounds = request["bounds"] and tuple(self._parse(bound) for bound in request["bounds"])
+                answer, steps = run_with_deadline(calculus_solver.solve_integral, (expression, var, bounds), deadline)
+            else:
+                point = self._parse(request["point"])
+                answer, steps = run_with_deadline(calculus_solver.solve_limit, (expression, var, point, request["direction"]), deadline)
+        except DeadlineExceeded:
+            return {"error": f"The {request['operation']} took longer than {deadline:g}s", "confidence": 0}
+        except calculus_solver.CalculusError as e:
+            return {"error": str(e), "confidence": 0}
+        except Exception as e:
+            return {"error": f"Could not read {request['expression']!r}: {e}", "confidence": 0}
+
+        result = {
+            "answer": answer,
+            "type": "Calculus",
+            "confidence": 100,
+            "steps": [f"1. Original problem: {problem}", *[f"{i}. {step}" for i, step in enumerate(steps, 2)]]
+        }
+        CALCULUS_CACHE.put(key, (problem, result))
+        # Callers may edit the steps, so the cached copy keeps its own
+        return dict(result, steps=list(result["steps"]))
+
+    def _solve_matrix(self, problem, request):
+        """Determinant, inverse, rank, product or transpose: exact with row reduction steps for small
+        rational matrices, LAPACK for the rest"""
+        try:
+            answer, steps, matrix = solve_matrix(request)
+        except MatrixError as e:
+            return {"error": str(e), "confidence": 0}
+        # Matrices run to 500×500, which the steps do not repeat
+        if len(problem) > 80:
+            problem = problem[:77] + '...'
+        result = {
+            "answer": answer,
+            "type": "Matrix",
+            "confidence": 100,
+            "steps": [f"1. Original problem: {problem}", *[f"{i}. {step}" for i, step in enumerate(steps, 2)]]
+        }
+        if matrix is not None:
+            result["matrix"] = matrix
+        return result
+
+    def _solve_geometry(self, problem, request):
+        """Areas, perimeters and volumes by direct lookup of the compiled formula"""
+        try:
+            solution = self.geometry.solve(request)
+        except GeometryError as e:
+            return {"error": str(e), "confidence": 0}
+        answer = f"{format_number(solution['value'])} {self.geometry.unit(request)}".strip()
+        formula = f"{request['quantity']} = {solution['formula']}"
+        given = ', '.join(f"{name} = {format_number(value)}" for name, value in solution["values"].items())
+        return {
+            "answer": answer,
+            "type": "Geometry",
+            "confidence": 100,
+            "formula": formula,
+            "steps": [
+                f"1. Original problem: {problem}",
+                f"2. Formula for the {request['quantity']} of a {request['shape']}: {formula}",
+                f"3. Substitute {given}: {solution['substituted']}",
+                f"4. Result: {answer}",
+            ]
+        }
+
+    def describe_file(self, path, measures=None):
+        """Statistics of every number in an uploaded CSV or text file, read through a memory map in
+        bounded chunks; measures as text ("median and 90th percentile", default: a summary)"""
+        try:
+            measures = statistics_solver.parse_measures(measures or '') or [('summary', False)]
+        except ValueError as e:
+            return {"error": str(e), "confidence": 0}
+        try:
+            # Mean and variance alone keep nothing but the running moments
+            stats = statistics_solver.stream_file(path, statistics_solver.needs_values(measures))
+        except OSError as e:
+            return {"error": f"Could not read {os.path.basename(path)}: {e.strerror}", "confidence": 0}
+        return self._statistics_result(os.path.basename(path), stats, measures)
+
+    def _statistics_result(self, problem, stats, measures):
+        try:
+            answer, steps, values = statistics_solver.describe(stats, measures)
+        except ValueError as e:
+            return {"error": str(e), "confidence": 0}
+        # Pasted lists run to thousands of values, which the steps do not repeat
+        if len(problem) > 80:
+            problem = problem[:77] + '...'
+        return {
+            "answer": answer,
+            "type": "Statistics",
+            "confidence": 100,
+            "statistics": values,
+            "steps": [f"1. Original problem: {problem}", *[f"{i}. {step}" for i, step in enumerate(steps, 2)]]
+        }
+
+    def _system_result(self, equations, solution):
+        return {
+            "answer": solution,
+            **({"approximate": True} if "≈" in solution else {}),
+            "type": "System of Equations",
+            "confidence": 100,
+            "steps": [
+                f"1. Original system:",
+                *[f"   {eq}" for eq in equations],
+                "2. Solving simultaneously...",
+                f"3. Solution: {solution}"
+            ]
+        }
+
+    def _solve_linear(self, problem):
+        """Solve linear equations and systems exactly without sympy; None when sympy is needed"""
+        equations = self._split_equations(problem)
+        if len(equations) > 1:
+            answer = self._linear_system_answer(equations)
+            return None if answer is None else self._system_result(equations, answer)
+
+        sides = problem.split('=')
+        if len(sides) != 2:
+            return None
+        try:
+            coefficients, constant = linear_equation(*sides)
+        except (ExpressionError, NotLinearError):
+            return None
+        unknown = self._pick_unknown(coefficients)
+        if unknown is None:
+            names = free_variables(compile_expression(sides[0])) | free_variables(compile_expression(sides[1]))
+            return self._cancelled_result(problem, str(constant), names, constant == 0) if names else None
+
+        # Same answer and steps sympy.solve would give for the chosen unknown
+        coefficient = coefficients[unknown]
+        others = {var: Fraction(-c, coefficient) for var, c in coefficients.items() if var != unknown}
+        solution = format_linear(others, Fraction(-constant, coefficient))
+        return {
+            "answer": f"{unknown} = {solution}",
+            "type": "Algebraic",
+            "confidence": 100,
+            "steps": [
+                f"1. Original equation: {problem}",
+                f"2. Rearranged to: {format_linear(coefficients, constant)} = 0",
+                f"3. Solved for {unknown}: {unknown} = {solution}"
+            ]
+        }
+
+    def _solve_polynomial(self, problem):
+        """Solve a polynomial equation in one variable without sympy; None when sympy is needed"""
+        sides = problem.split('=')
+        if len(sides) != 2 or '\n' in problem or ',' in problem:
+            return None
+        try:
+            var, coefficients = polynomial_equation(*sides)
+        except (ExpressionError, NotPolynomialError):
+            return None
+
+        degree = len(coefficients) - 1
+        roots = None
+        if self._batch is not None and degree > 2:
+            roots = self._batch["roots"].get(reduce_polynomial(coefficients)[0])
+        solution = solve_polynomial(coefficients, roots)
+        answer = " or ".join(f"{var} {relation} {text}" for relation, text in solution["roots"])
+
+        steps = [f"Original equation: {problem}", f"Rearranged to: {format_polynomial(coefficients, var)} = 0"]
+        if degree == 2:
+            a, b, c = coefficients
+            discriminant = solution["discriminant"]
+            if discriminant > 0:
+                nature = "positive, so two real roots"
+            elif discriminant == 0:
+                nature = "zero, so one repeated root"
+            else:
+                nature = "negative, so two complex roots"
+            steps += [
+                f"Coefficients: a = {a}, b = {b}, c = {c}",
+                f"Discriminant: b² - 4ac = {discriminant}, which is {nature}",
+                f"Quadratic formula: {var} = (-b ± sqrt(b² - 4ac)) / (2a)",
+            ]
+        elif degree > 2:
+            steps.append(f"Found the roots of the degree {degree} polynomial numerically (companion matrix eigenvalues)")
+            if solution["rational"]:
+                steps.append("Confirmed exact rational roots: " + ", ".join(str(r) for r in solution["rational"]))
+        steps.append(f"Solved for {var}: {answer}")
+
+        approximate = solution.get("approximate", False)
+        return {
+            "answer": answer,
+            "type": "Algebraic",
+            **({"approximate": True} if approximate else {}),
+            "confidence": 90 if approximate else 100,
+            "steps": [f"{i}. {step}" for i, step in enumerate(steps, 1)]
+        }
+
+    def _rebase_steps(self, steps, stored_problem, problem):
+        """Show the caller's own spelling of the problem in steps stored for an equivalent one"""
+        replacements = {stored_problem: problem}
+        stored_equations = self._split_equations(stored_problem)
+        equations = self._split_equations(problem)
+        if len(stored_equations) == len(equations):
+            for old, new in zip(stored_equations, equations):
+                replacements.setdefault(old, new)
+        rebased = []
+        for step in steps:
+            # Each spelling is replaced once, where the problem is first restated; a later
+            # step such as "Solved for x: x = 2" may repeat the same text as its answer
+            for old in replacements:
+                if old in step:
+                    step = step.replace(old, replacements.pop(old), 1)
+                    break
+            rebased.append(step)
+        return rebased
+
+    def _solve_normalized(self, problem, deadline, precision=FLOAT):
         # Handle system of equations first
         if '\n' in problem or ',' in problem:
-            equations = [eq.strip() for eq in problem.replace(',', '\n').split('\n') if eq.strip()]
+            equations = self._split_equations(problem)
             if len(equations) > 1:
-                solution = self.solve_system_of_equations(equations)
-                return {
-                    "answer": solution,
-                    "type": "System of Equations",
-                    "confidence": 100,
-                    "steps": [
-                        f"1. Original system:",
-                        *[f"   {eq}" for eq in equations],
-                        "2. Solving simultaneously...",
-                        f"3. Solution: {solution}"
-                    ]
-                }
+                return self._system_result(equations, self.solve_system_of_equations(equations, deadline))
 
         try:
+            if INEQUALITY_SIGN.search(problem):
+                return self._solve_inequality_symbolic(problem, deadline)
+
             # Handle algebraic equations first
             if 'x' in problem or '=' in problem:
                 eq_parts = problem.split('=')
                 if len(eq_parts) == 2:
-                    # Import transformations for implicit multiplication
-                    from sympy.parsing.sympy_parser import standard_transformations, implicit_multiplication_application
-                    transformations = standard_transformations + (implicit_multiplication_application,)
-                    # Use transformations to handle cases like "2x" -> "2*x"
-                    lhs = parse_expr(eq_parts[0].strip(), transformations=transformations)
-                    rhs = parse_expr(eq_parts[1].strip(), transformations=transformations)
+                    lhs = self._parse(eq_parts[0].strip())
+                    rhs = self._parse(eq_parts[1].strip())
                     equation = lhs - rhs
-                    solution = solve(equation, 'x')
+                    symbols = {symbol.name: symbol for symbol in equation.free_symbols}
+                    unknown = self._pick_unknown(symbols)
+                    if unknown is None:
+                        names = {symbol.name for symbol in lhs.free_symbols | rhs.free_symbols}
+                        if not names:
+                            return {"error": "No unknown to solve for", "confidence": 0}
+                        return self._cancelled_result(problem, equation, names, equation == 0)
+                    try:
+                        solutions = run_with_deadline(sympy.solve, (equation, symbols[unknown]), deadline)
+                    except DeadlineExceeded:
+                        answer, note = self._approximate([equation], [symbols[unknown]], deadline)
+                        return {
+                            "answer": answer,
+                            "type": "Algebraic",
+                            "approximate": True,
+                            "confidence": 90,
+                            "steps": [
+                                f"1. Original equation: {problem}",
+                                f"2. Rearranged to: {equation} = 0",
+                                f"3. {note}",
+                                f"4. Approximate solution: {answer}"
+                            ]
+                        }
+                    answer = " or ".join(f"{unknown} = {solution}" for solution in solutions) or "No solution"
                     return {
-                        "answer": f"x = {solution[0]}",
+                        "answer": answer,
                         "type": "Algebraic",
                         "confidence": 100,
                         "steps": [
                             f"1. Original equation: {problem}",
                             f"2. Rearranged to: {equation} = 0",
-                            f"3. Solved for x: x = {solution[0]}"
+                            f"3. Solved for {unknown}: {answer}"
                         ]
                     }
 
@@ -279,11 +862,11 @@ class SimpleMathModel:
             clean_problem = problem.strip()
             
             # Calculate using safe evaluation
-            result = self._safe_eval(clean_problem)
+            result = self._safe_eval(clean_problem, precision)
             problem_type = self._identify_problem_type(clean_problem)
             
             # Format the result
-            formatted = self._format_fraction(result)
+            formatted = self._format_fraction(result, precision)
             
             return {
                 "answer": formatted.get("decimal"),
@@ -303,6 +886,11 @@ class SimpleMathModel:
             }
 
 class ChatBot:
+    # Built on first use so requests that never need them skip the imports
+    wiki_helper = LazyComponent('src.utils.wiki_helper', 'WikiHelper')
+    self_learner = LazyComponent('src.learning.self_learner', 'SelfLearner')
+    tf_model = LazyComponent('src.models.tf_model', 'MathTFModel')
+
     def __init__(self):
         self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
         self.data_file = Path(self.data_dir) / 'training_data.json'
@@ -344,11 +932,8 @@ class ChatBot:
             'magic': ['✨', '💫', '🌟']
         }
         self.math_model = SimpleMathModel()
-        self.wiki_helper = WikiHelper()
-        self.self_learner = SelfLearner()
         self.notes_cache = {}
         self.local_notes_dir = os.path.join(self.data_dir, 'math_notes')
-        self.tf_model = MathTFModel()  # Add TF model
 
     def _get_math_notes(self, topic):  # Remove 'async'
         """Fetch relevant math notes for the topic"""
@@ -392,15 +977,17 @@ class ChatBot:
         if notes:
             # Add notes to solution steps
             result = self.math_model.solve(problem)
-            if "steps" in result:
+            # Engines that looked a formula up already show it
+            if "steps" in result and "formula" not in result:
                 result["steps"].insert(1, f"Using {topic} formula: {notes.get('formulas', {}).get(topic, '')}")
                 result["steps"].insert(2, f"Related example: {notes.get('examples', {}).get(topic, '')}")
             return result
         return self.math_model.solve(problem)
 
-    def handle_math(self, message):  # Remove 'async' here
-        math_problem = self.extract_math_problem(message)
-        
+    def handle_math(self, message, math_problem=None):  # Remove 'async' here
+        if math_problem is None:
+            math_problem = self.extract_math_problem(message)
+
         if math_problem:
             try:
                 # Identify topic from problem
@@ -410,16 +997,16 @@ class ChatBot:
                     # Create the math solution HTML first
                     math_solution = f"""
 <div style="background-color: #f5f5f5; border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin: 10px 0;">
-    <div class="math-text" style="font-size: 18px; color: #333;">Problem: {math_problem}</div>
+    <div class="math-text" style="font-size: 18px; color: #333;">Problem: {html.escape(math_problem)}</div>
     <div class="divider" style="margin: 10px 0;"></div>
     <div class="fade-in" style="color: #2196F3; font-size: 20px;">
-        Answer: {result['answer'] if 'answer' in result else result.get('decimal')}
+        Answer: {html.escape(str(result['answer'] if 'answer' in result else result.get('decimal')))}
     </div>
     {f'<div class="fade-in" style="color: #666; margin-top: 5px;">Fraction: {result["fraction"]}</div>' if 'fraction' in result else ''}
     <div class="fade-in" style="margin-top: 10px; color: #666;">
         <div>Steps:</div>
         <ul style="margin: 5px 0; padding-left: 20px;">
-            {''.join(f'<li class="step-item" style="--index: {i+1}">{step}</li>' for i, step in enumerate(result["steps"]))}
+            {''.join(f'<li class="step-item" style="--index: {i+1}">{html.escape(step)}</li>' for i, step in enumerate(result["steps"]))}
         </ul>
     </div>
     <div class="feedback">
@@ -549,6 +1136,41 @@ function handleFeedback(isPositive) {{
     <div class="result">{result}</div>
 </div>"""
 
+    def handle_value_table(self, request):
+        """Table of an expression's values over a range, computed in one vectorized pass"""
+        expression, var = request['expression'], request['var'].lower()
+        start, stop = float(request['start']), float(request['stop'])
+        step = float(request['step'] or 1)
+        if step == 0 or stop < start:
+            return self.add_personality("The range should go from a smaller number to a larger one.", 'help', ['math'])
+        count = int((stop - start) / step + 1e-9) + 1
+        if count > MAX_TABLE_ROWS:
+            return self.add_personality(
+                f"That range has {count} values; I can show up to {MAX_TABLE_ROWS} at a time. Try a bigger step.",
+                'help', ['math']
+            )
+
+        values = start + step * numpy.arange(count)
+        try:
+            results = self.math_model.evaluate_over(expression, var, values)
+        except ExpressionError as e:
+            return self.add_personality(f"Sorry, I couldn't evaluate that: {html.escape(str(e))}", 'error', ['think', 'math'])
+
+        def fmt(value):
+            return f"{value:.10g}" if numpy.isfinite(value) else "undefined"
+
+        rows = ''.join(f'<tr><td>{fmt(v)}</td><td>{fmt(r)}</td></tr>' for v, r in zip(values, results))
+        # The expression is the user's own text; var, start and stop can only be a letter and numbers
+        shown = html.escape(expression)
+        return f"""
+<div style="background-color: #f5f5f5; border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin: 10px 0;">
+    <div class="math-text" style="font-size: 18px; color: #333;">Values of {shown} for {var} from {request['start']} to {request['stop']}</div>
+    <table style="margin-top: 10px; border-collapse: collapse;">
+        <tr><th>{var}</th><th>{shown}</th></tr>
+        {rows}
+    </table>
+</div>"""
+
     def handle_greeting(self, message):
         hour = datetime.now().hour
         if (hour < 12):
@@ -592,14 +1214,31 @@ function handleFeedback(isPositive) {{
         return self.add_personality(base_response, 'think')
 
     def get_response(self, message):
+        # Check if it's a math problem
+        return self._respond(message, self.extract_math_problem(message))
+
+    def get_responses(self, messages):
+        """Answer many messages in order, matching every chat message in one pass"""
+        messages = list(messages)
+        problems = [self.extract_math_problem(message) for message in messages]
+        chat_messages = [message for message, problem in zip(messages, problems) if not problem]
+        chat_responses = iter(self.tf_model.get_responses(chat_messages) if chat_messages else [])
+
+        with self.math_model.batch_scope():
+            for message, problem in zip(messages, problems):
+                yield self._respond(message, problem, None if problem else next(chat_responses))
+
+    def _respond(self, message, math_problem, response=None):
         try:
-            # Check if it's a math problem
-            math_problem = self.extract_math_problem(message)
+            table = VALUE_TABLE_REQUEST.search(message)
+            if table:
+                return self.handle_value_table(table)
             if math_problem:
-                return self.handle_math(message)
-            
+                return self.handle_math(message, math_problem)
+
             # Get conversation response from TF model
-            response = self.tf_model.get_response(message)
+            if response is None:
+                response = self.tf_model.get_response(message)
             prefix = self.tf_model.get_personality(prefix=True)
             suffix = self.tf_model.get_personality(prefix=False)
             return f"{prefix} {response} {suffix}"
@@ -616,12 +1255,15 @@ function handleFeedback(isPositive) {{
 
     def _identify_math_topic(self, problem):
         """Identify the mathematical topic of the problem"""
+        # Checked in order; algebra matches any letter, so it comes last
         topics = {
-            'algebra': r'[a-z]|=',
-            'calculus': r'derivative|integral|lim',
+            'calculus': r'derivative|differentiate|integra(?:l|te)|∫|d/d[a-z]|\blim',
+            'linear_algebra': r'matri(?:x|ces)|determinant|inverse|\brank\b|transpose|\[',
+            # Before trigonometry, which would claim "standard deviation" and "rectangle" for their "tan"
+            'statistics': r'\b(?:mean|average|median|mode|variance|standard deviation|percentile|quartiles)\b',
+            'geometry': r'area|volume|perimeter|circumference|hypotenuse',
             'trigonometry': r'sin|cos|tan',
-            'geometry': r'area|volume|perimeter',
-            'statistics': r'mean|median|mode|variance'
+            'algebra': r'[a-z]|=',
         }
 
         for topic, pattern in topics.items():
@@ -654,11 +1296,47 @@ function handleFeedback(isPositive) {{
             print(f"Error adding personality: {e}", file=sys.stderr)
             return message
 
+    def _extract_inequality(self, text):
+        """The comparison inside a sentence: "is 2x + 1 > 5 true" -> "2x + 1 > 5" """
+        match = INEQUALITY_TEXT.search(text)
+        if not match:
+            return None
+        tokens = match.group().split()
+
+        def is_word(token):
+            return token.isalpha() and len(token) > 1 and token not in EXPRESSION_WORDS
+
+        while tokens and is_word(tokens[0]):
+            tokens.pop(0)
+        while tokens and is_word(tokens[-1]):
+            tokens.pop()
+        inequality = ' '.join(tokens)
+        try:
+            split_inequality(inequality)
+        except NotInequalityError:
+            return None
+        return inequality
+
     def extract_math_problem(self, message):
         """Extract math problem from message"""
         try:
-            # Clean and normalize message
-            clean_msg = message.lower().strip()
+            # Clean and normalize message; operator words become symbols and filler words go
+            clean_msg = word_translator.translate_words(message.lower().strip())
+
+            # Calculus requests keep their wording, which the cleanup below strips
+            calculus = calculus_solver.find_calculus(clean_msg)
+            if calculus:
+                return calculus
+            # Matrix entries are separated by commas, which the system check below splits on
+            matrix = find_matrix(clean_msg)
+            if matrix:
+                return matrix
+            statistics = statistics_solver.find_statistics(clean_msg)
+            if statistics:
+                return statistics
+            geometry = self.math_model.geometry and self.math_model.geometry.find(clean_msg)
+            if geometry:
+                return geometry
             
             # Check for system of equations
             if ('system' in clean_msg or ',' in clean_msg) and '=' in clean_msg:
@@ -672,22 +1350,23 @@ function handleFeedback(isPositive) {{
                 if len(equations) > 1:
                     return '\n'.join(equations)
             
-            # Remove common words
-            words_to_remove = ['solve', 'calculate', 'what is', 'evaluate', 'compute']
-            for word in words_to_remove:
-                clean_msg = clean_msg.replace(word, '')
-            
+            # Inequalities keep their comparison signs, which the cleanup below removes
+            if INEQUALITY_SIGN.search(clean_msg) or '≤' in clean_msg or '≥' in clean_msg:
+                inequality = self._extract_inequality(normalize_symbols(clean_msg))
+                if inequality:
+                    return inequality
+
             # Clean unwanted characters
-            clean_msg = re.sub(r'[^\w\s+\-*/()=.,]', '', clean_msg)
+            clean_msg = re.sub(r'[^\w\s+\-*/^()=.,]', '', clean_msg)
             
             # Try to match algebraic equation
             if 'x' in clean_msg or '=' in clean_msg:
-                match = re.search(r'([0-9x]+\s*[+\-*/]?\s*[0-9x]*\s*=\s*[0-9x]+)', clean_msg)
+                match = re.search(r'([0-9x]+(?:\s*[+\-*/^]\s*[0-9x]+)*\s*=\s*[0-9x]+(?:\s*[+\-*/^]\s*[0-9x]+)*)', clean_msg)
                 if match:
                     return match.group(1).strip()
             
             # Try to match arithmetic expression
-            match = re.search(r'(\d+\s*[+\-*/]\s*\d+)', clean_msg)
+            match = re.search(r'(\d+\s*[+\-*/^]\s*\d+)', clean_msg)
             if match:
                 return match.group(1).strip()
             
@@ -696,11 +1375,131 @@ function handleFeedback(isPositive) {{
             print(f"Error extracting math problem: {e}", file=sys.stderr)
             return None
 
+def handle_request(chatbot, request):
+    """Answer a single worker request and return the reply object"""
+    if not isinstance(request, dict):
+        return {"id": None, "error": "Request must be a JSON object"}
+    request_id = request.get("id")
+    method = request.get("method", "chat")
+
+    if method == "stats":
+        return {"id": request_id, "result": {
+            "solver": deadline_stats(),
+            "parse_cache": chatbot.math_model.parse_cache_stats(),
+            "calculus_cache": chatbot.math_model.calculus_cache_stats(),
+            "result_store": chatbot.math_model.result_store_stats()
+        }}
+    if method == "statistics":
+        if not isinstance(request.get("path"), str):
+            return {"id": request_id, "error": "Request must include a 'path' string"}
+        if not isinstance(request.get("measures", ""), str):
+            return {"id": request_id, "error": "'measures' must be a string"}
+        return {"id": request_id, "result": chatbot.math_model.describe_file(request["path"], request.get("measures"))}
+    if method not in ("chat", "solve"):
+        return {"id": request_id, "error": f"Unknown method: {method}"}
+    if not isinstance(request.get("message"), str):
+        return {"id": request_id, "error": "Request must include a 'message' string"}
+
+    if method == "chat":
+        return {"id": request_id, "response": chatbot.get_response(request["message"])}
+    deadline = request.get("deadline")
+    if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                 or not 0 < deadline < float('inf')):
+        return {"id": request_id, "error": "'deadline' must be a positive number of seconds"}
+    precision = request.get("precision")
+    if precision is not None:
+        try:
+            precision = parse_precision(precision)
+        except ValueError as e:
+            return {"id": request_id, "error": str(e)}
+    return {"id": request_id, "result": chatbot.math_model.solve(request["message"], deadline, precision)}
+
+def serve(chatbot, input_stream, output_stream, lock=None):
+    """Answer newline-delimited JSON requests until the input stream closes"""
+    for line in input_stream:
+        line = line.strip()
+        if not line:
+            continue
+        request = None
+        try:
+            request = json.loads(line)
+            if lock is None:
+                reply = handle_request(chatbot, request)
+            else:
+                with lock:
+                    reply = handle_request(chatbot, request)
+        except json.JSONDecodeError as e:
+            reply = {"id": None, "error": f"Invalid JSON: {str(e)}"}
+        except Exception as e:
+            print(f"Error handling request: {e}", file=sys.stderr)
+            # The id is echoed whenever it is known, so the caller can settle that request
+            reply = {"id": request.get("id") if isinstance(request, dict) else None, "error": str(e)}
+        output_stream.write(json.dumps(reply, ensure_ascii=False) + '\n')
+        output_stream.flush()
+
+def serve_unix_socket(chatbot, socket_path):
+    """Serve the JSON-lines protocol to every client connecting to a Unix socket"""
+    import io
+    import socketserver
+    import threading
+
+    # Connections are handled on separate threads but ChatBot is not thread-safe
+    lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            reader = io.TextIOWrapper(self.rfile, encoding='utf-8')
+            writer = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+            serve(chatbot, reader, writer, lock)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+        print(f"Serving on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+def run_worker(args):
+    """Build ChatBot once and answer requests until stdin closes or the process is stopped"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="chat_model.py --serve")
+    parser.add_argument('--socket', help="Listen on this Unix socket path instead of stdin/stdout")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Fork this many worker processes (default: answer in this process)")
+    parser.add_argument('--max-requests', type=int, default=1000,
+                        help="Recycle a forked worker after this many requests")
+    options = parser.parse_args(args)
+
+    # Replies own stdout; anything the models print goes to stderr instead
+    reply_stream = sys.stdout
+    sys.stdout = sys.stderr
+
+    chatbot = ChatBot()
+    if options.workers > 0:
+        from src.worker_pool import WorkerPool
+        pool = WorkerPool(chatbot, serve, options.workers, options.max_requests)
+        pool.warm_up()
+        pool.run(options.socket)
+    elif options.socket:
+        serve_unix_socket(chatbot, options.socket)
+    else:
+        serve(chatbot, sys.stdin, reply_stream)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("No message provided", file=sys.stderr)
         sys.exit(1)
 
+    if sys.argv[1] == '--serve':
+        try:
+            run_worker(sys.argv[2:])
+            sys.exit(0)
+        except KeyboardInterrupt:
+            sys.exit(0)
+
     try:
         chatbot = ChatBot()
         response = chatbot.get_response(sys.argv[1])
@@ -0,0 +1,306 @@
+import os
+import re
+import sys
+import json
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from http import HTTPStatus
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from src.chat_model import ChatBot
+from src.solvers.precision import parse_precision
+from src.utils.deadline import deadline_stats
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 75
+# Seconds a client may take to send the body once its headers arrived
+BODY_TIMEOUT = 30
+MAX_PIPELINED = 16
+
+# Content-Length is decimal and chunk sizes hexadecimal; signs, spaces and '_' are not allowed
+DECIMAL_SIZE = re.compile(r'[0-9]+')
+HEX_SIZE = re.compile(r'[0-9a-fA-F]+')
+
+# Built once in the parent; forked executor processes inherit it copy-on-write
+chatbot = None
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+def _chat(message):
+    return {"response": chatbot.get_response(message)}
+
+def _solve(problem, deadline=None, precision=None):
+    return chatbot.math_model.solve(problem, deadline, precision)
+
+def _process_image(image_bytes, suffix):
+    from src.screen_capture import process_image, is_math_expression
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(image_bytes)
+        image_path = f.name
+    try:
+        text = process_image(image_path)
+    finally:
+        os.unlink(image_path)
+    if text is None:
+        raise ValueError("Could not read text from image")
+    return {"text": text, "isMath": is_math_expression(text)}
+
+def _size(text, pattern, base, name):
+    """A body or chunk length from its header text; BAD_REQUEST unless it is a plain unsigned number"""
+    if not pattern.fullmatch(text):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid {name}: {text[:32]!r}")
+    return int(text, base)
+
+class MathHTTPServer:
+    """Keep-alive HTTP/1.1 front end that runs solver calls on an executor"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        # Solver counters live where the solving happens, which is only this process in thread mode
+        self.local_stats = isinstance(executor, ThreadPoolExecutor)
+        self.routes = {
+            '/chat': self.handle_chat,
+            '/solve': self.handle_solve,
+            '/process-image': self.handle_process_image,
+            '/health': self.handle_health,
+        }
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def handle_chat(self, method, headers, body):
+        payload = self._json_payload(method, body, 'message')
+        return await self._run(_chat, payload['message'])
+
+    async def handle_solve(self, method, headers, body):
+        payload = self._json_payload(method, body, 'problem')
+        deadline = payload.get('deadline')
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                     or not 0 < deadline < float('inf')):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'deadline' must be a positive number of seconds")
+        precision = payload.get('precision')
+        if precision is not None:
+            try:
+                precision = parse_precision(precision)
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return await self._run(_solve, payload['problem'], deadline, precision)
+
+    async def handle_process_image(self, method, headers, body):
+        if method != 'POST':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        if not body:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "No image uploaded")
+        content_type = headers.get('content-type', '')
+        suffix = '.' + content_type.split('/')[-1].split(';')[0] if content_type.startswith('image/') else ''
+        try:
+            return await self._run(_process_image, body, suffix)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+
+    async def handle_health(self, method, headers, body):
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        if not self.local_stats:
+            # Each executor process keeps its own counters, and this process solves nothing
+            return {"status": "ok", "stats": "not collected: solving runs in worker processes"}
+        return {
+            "status": "ok",
+            "solver": deadline_stats(),
+            "parse_cache": chatbot.math_model.parse_cache_stats(),
+            "calculus_cache": chatbot.math_model.calculus_cache_stats(),
+            "result_store": chatbot.math_model.result_store_stats(),
+        }
+
+    def _json_payload(self, method, body, field):
+        if method != 'POST':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        try:
+            payload = json.loads(body or b'{}')
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {str(e)}")
+        if not isinstance(payload, dict) or not isinstance(payload.get(field), str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Body must be a JSON object with a '{field}' string")
+        return payload
+
+    async def _read_request(self, reader):
+        """Read one request; returns None when the client closed the connection"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        try:
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            method, target, version = request_line.split(' ')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            body = await asyncio.wait_for(self._read_body(reader, headers), BODY_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPError(HTTPStatus.REQUEST_TIMEOUT, f"Body not received within {BODY_TIMEOUT}s")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+        except ValueError:
+            # readline() past the stream limit: a chunk size line no client would send
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed chunked body")
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.1':
+            keep_alive = connection != 'close'
+        else:
+            keep_alive = connection == 'keep-alive'
+        return method, target.split('?')[0], headers, body, keep_alive
+
+    async def _read_body(self, reader, headers):
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            return await self._read_chunked(reader)
+        length = _size(headers.get('content-length') or '0', DECIMAL_SIZE, 10, "Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        return await reader.readexactly(length) if length else b''
+
+    async def _read_chunked(self, reader):
+        body = bytearray()
+        while True:
+            line = (await reader.readline()).split(b';')[0].strip().decode('latin-1')
+            size = _size(line or '0', HEX_SIZE, 16, "chunk size")
+            if size == 0:
+                # Skip trailers up to the blank line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return bytes(body)
+            # Checked against the declared size, so an oversized chunk is never buffered
+            if len(body) + size > MAX_BODY_BYTES:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            body += await reader.readexactly(size)
+            await reader.readline()
+
+    async def _respond(self, method, path, headers, body):
+        handler = self.routes.get(path)
+        try:
+            if handler is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND)
+            return HTTPStatus.OK, await handler(method, headers, body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            print(f"Error handling {path}: {e}", file=sys.stderr)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+    def _encode(self, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n"
+        )
+        return head.encode('latin-1') + body
+
+    async def handle_connection(self, reader, writer):
+        # Pipelined requests are started as soon as they are read, and a
+        # separate writer sends the responses back in request order
+        responses = asyncio.Queue(MAX_PIPELINED)
+
+        async def write_responses():
+            while True:
+                item = await responses.get()
+                if item is None:
+                    return
+                task, keep_alive = item
+                status, payload = await task
+                writer.write(self._encode(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+
+        sender = asyncio.create_task(write_responses())
+        try:
+            while not sender.done():
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    error = asyncio.get_running_loop().create_future()
+                    error.set_result((e.status, {"error": str(e)}))
+                    await responses.put((error, False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body, keep_alive = request
+                await responses.put((asyncio.create_task(self._respond(method, path, headers, body)), keep_alive))
+                if not keep_alive:
+                    break
+            if not sender.done():
+                await responses.put(None)
+            await sender
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def serve(host, port, executor):
+    server = MathHTTPServer(executor)
+    listener = await asyncio.start_server(server.handle_connection, host, port,
+                                          limit=MAX_HEADER_BYTES, backlog=1024)
+    print(f"Serving on http://{host}:{port}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+def main(args=None):
+    import argparse
+    import multiprocessing
+
+    global chatbot
+
+    parser = argparse.ArgumentParser(description="HTTP front end for the Python math solver")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8003)))
+    parser.add_argument('--processes', type=int, default=0,
+                        help="Solve in this many forked processes (default: one background thread)")
+    options = parser.parse_args(args)
+
+    chatbot = ChatBot()
+    if options.processes > 0 and hasattr(os, 'fork'):
+        executor = ProcessPoolExecutor(options.processes, mp_context=multiprocessing.get_context('fork'))
+        # The pool forks on its first task; do that now, or the children inherit
+        # the client socket open at the time and its close never reaches the client
+        executor.submit(os.getpid).result()
+    else:
+        # ChatBot is not thread-safe, so a single thread keeps calls serialized
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        asyncio.run(serve(options.host, options.port, executor))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    main()
@@ -3,73 +3,65 @@ import os
 import random
 from pathlib import Path
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from .tfidf_index import load_index, training_data_checksum
 
 class MathTFModel:
     def __init__(self):
         self.initialized = False
         self.data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+        self.checksum = None
         self.training_data = self._load_training_data()
-        self.vectorizer = TfidfVectorizer(stop_words='english')
-        self.conversation_vectors = None
+        self.index = None
         self.initialize_model()
 
     def _load_training_data(self):
         """Load training data from JSON file"""
         try:
-            with open(os.path.join(self.data_dir, 'training_data.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(os.path.join(self.data_dir, 'training_data.json'), 'rb') as f:
+                raw = f.read()
+            self.checksum = training_data_checksum(raw)
+            return json.loads(raw.decode('utf-8'))
         except Exception as e:
             print(f"Error loading training data: {e}")
             return {}
 
     def initialize_model(self):
-        """Initialize the model with conversation data"""
+        """Initialize the model from the prebuilt TF-IDF index (rebuilt if stale)"""
         try:
-            # Extract all conversation variations
-            conversations = self.training_data.get('conversations', [])
-            texts = []
-            for conv in conversations:
-                texts.extend(conv.get('variations', []))
-
-            if texts:
-                # Create TF-IDF vectors
-                self.conversation_vectors = self.vectorizer.fit_transform(texts)
-                self.conversations_map = {}
-                idx = 0
-                for conv in conversations:
-                    for _ in conv.get('variations', []):
-                        self.conversations_map[idx] = conv
-                        idx += 1
+            if self.checksum and self.training_data.get('conversations'):
+                self.index = load_index(self.training_data, self.checksum)
+                conversations = self.training_data['conversations']
+                self.conversations_map = {row: conversations[conv_idx]
+                                          for row, conv_idx in enumerate(self.index.row_map.tolist())}
                 self.initialized = True
         except Exception as e:
             print(f"Error initializing model: {e}")
 
     def get_response(self, message):
         """Get appropriate response using TF-IDF similarity"""
-        try:
-            if not message or not self.initialized:
-                return self._get_default_response()
+        return self.get_responses([message])[0]
 
-            # Transform input message
-            message_vector = self.vectorizer.transform([message])
-            
-            # Calculate similarity with all conversations
-            similarities = cosine_similarity(message_vector, self.conversation_vectors)[0]
-            
-            # Get best match
-            best_idx = np.argmax(similarities)
-            if similarities[best_idx] > 0.3:  # Similarity threshold
-                matched_conv = self.conversations_map.get(best_idx)
-                if matched_conv and matched_conv.get('responses'):
-                    return random.choice(matched_conv['responses'])
+    def get_responses(self, messages):
+        """Get responses for many messages with one similarity computation"""
+        try:
+            responses = [self._get_default_response() for _ in messages]
+            rows = [i for i, message in enumerate(messages) if message]
+            if not rows or not self.initialized:
+                return responses
 
-            return self._get_default_response()
+            # Calculate similarity of every message with all conversations at once
+            similarities = self.index.similarities([messages[i] for i in rows])
+            best = np.argmax(similarities, axis=1)
+            for i, row_sims, best_idx in zip(rows, similarities, best):
+                if row_sims[best_idx] > 0.3:  # Similarity threshold
+                    matched_conv = self.conversations_map.get(int(best_idx))
+                    if matched_conv and matched_conv.get('responses'):
+                        responses[i] = random.choice(matched_conv['responses'])
+            return responses
 
         except Exception as e:
             print(f"Error getting response: {e}")
-            return self._get_default_response()
+            return [self._get_default_response() for _ in messages]
 
     def _get_default_response(self):
         """Return a default response"""
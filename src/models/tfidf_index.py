@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import numpy as np
+
+# Bump when the on-disk layout changes so old artifacts are rebuilt
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'tfidf_index')
+
+# Same tokenization TfidfVectorizer uses by default (lowercased, 2+ word characters)
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+ARRAYS = ('data', 'indices', 'indptr', 'idf', 'row_map')
+
+def training_data_checksum(raw_bytes):
+    """Checksum of the raw training_data.json contents"""
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+def _index_path(index_dir, checksum):
+    return os.path.join(index_dir, f"v{INDEX_VERSION}-{checksum[:16]}")
+
+def _conversation_texts(training_data):
+    """Flatten conversation variations into rows plus the row -> conversation map"""
+    texts = []
+    row_map = []
+    for conv_idx, conv in enumerate(training_data.get('conversations', [])):
+        for variation in conv.get('variations', []):
+            texts.append(variation)
+            row_map.append(conv_idx)
+    return texts, row_map
+
+def build_index(training_data, checksum, index_dir=DEFAULT_INDEX_DIR):
+    """Fit TF-IDF on the conversation variations and write the artifact; returns its path"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts, row_map = _conversation_texts(training_data)
+    if not texts:
+        raise ValueError("Training data has no conversation variations to index")
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    matrix = vectorizer.fit_transform(texts).tocsr()
+    matrix.sort_indices()
+
+    os.makedirs(index_dir, exist_ok=True)
+    target = _index_path(index_dir, checksum)
+    # Build beside the target and rename into place so readers never see a partial index
+    staging = tempfile.mkdtemp(prefix='.build-', dir=index_dir)
+    try:
+        np.save(os.path.join(staging, 'data.npy'), matrix.data.astype(np.float64))
+        np.save(os.path.join(staging, 'indices.npy'), matrix.indices.astype(np.int32))
+        np.save(os.path.join(staging, 'indptr.npy'), matrix.indptr.astype(np.int64))
+        np.save(os.path.join(staging, 'idf.npy'), vectorizer.idf_.astype(np.float64))
+        np.save(os.path.join(staging, 'row_map.npy'), np.asarray(row_map, dtype=np.int32))
+        with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "checksum": checksum,
+                "shape": list(matrix.shape),
+                "vocabulary": {term: int(col) for term, col in vectorizer.vocabulary_.items()}
+            }, f)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another worker finished the same build first
+            if not os.path.isdir(target):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    _remove_stale(index_dir, target)
+    return target
+
+def _remove_stale(index_dir, keep):
+    for name in os.listdir(index_dir):
+        path = os.path.join(index_dir, name)
+        if path != keep and name.startswith('v') and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+class TfidfIndex:
+    """Memory-mapped TF-IDF matrix over the conversation variations"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"Index version {meta.get('version')} does not match {INDEX_VERSION}")
+        self.checksum = meta['checksum']
+        self.shape = tuple(meta['shape'])
+        self.vocabulary = meta['vocabulary']
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r'))
+        self._row_starts = np.minimum(self.indptr[:-1], max(len(self.data) - 1, 0))
+        self._empty_rows = np.diff(self.indptr) == 0
+
+    def transform(self, texts):
+        """Dense, L2-normalized TF-IDF vectors for the given texts (one row per text)"""
+        vectors = np.zeros((len(texts), self.shape[1]))
+        for row, text in enumerate(texts):
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                col = self.vocabulary.get(token)
+                if col is not None:
+                    vectors[row, col] += 1.0
+        vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def similarities(self, texts):
+        """Cosine similarity of every text against every indexed row, as one sparse product"""
+        vectors = self.transform(texts)
+        if len(self.data) == 0:
+            return np.zeros((len(texts), self.shape[0]))
+        # Rows are already unit length, so the dot product is the cosine similarity
+        products = vectors[:, self.indices] * self.data
+        sims = np.add.reduceat(products, self._row_starts, axis=1)
+        sims[:, self._empty_rows] = 0.0
+        return sims
+
+def load_index(training_data, checksum, index_dir=DEFAULT_INDEX_DIR):
+    """Map the artifact matching `checksum`, rebuilding it first if it is missing or stale"""
+    path = _index_path(index_dir, checksum)
+    if not os.path.isdir(path):
+        path = build_index(training_data, checksum, index_dir)
+    return TfidfIndex(path)
+
+if __name__ == "__main__":
+    data_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(__file__), '..', '..', 'data', 'training_data.json')
+    with open(data_file, 'rb') as f:
+        raw = f.read()
+    path = build_index(json.loads(raw), training_data_checksum(raw))
+    print(f"Wrote TF-IDF index to {os.path.abspath(path)}")
@@ -0,0 +1,13 @@
+from .expression import ExpressionError, compile_expression, evaluate, evaluate_expression, free_variables
+from .linear import NotLinearError, linear_terms, linear_equation
+from .linear_system import solve_linear_system
+from .polynomial import NotPolynomialError, polynomial_equation, solve_polynomial, companion_roots
+from .vectorized import compile_vectorized
+from .canonical import canonical_form, canonical_equation, canonical_expression
+from .precision import FLOAT, parse_precision, evaluate_precise, precise_expression, format_precise
+
+__all__ = ['ExpressionError', 'compile_expression', 'evaluate', 'evaluate_expression', 'free_variables',
+           'NotLinearError', 'linear_terms', 'linear_equation', 'solve_linear_system',
+           'NotPolynomialError', 'polynomial_equation', 'solve_polynomial', 'companion_roots',
+           'compile_vectorized', 'canonical_form', 'canonical_equation', 'canonical_expression',
+           'FLOAT', 'parse_precision', 'evaluate_precise', 'precise_expression', 'format_precise']
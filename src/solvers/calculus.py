@@ -0,0 +1,226 @@
+import re
+
+from src.utils.lazy_import import lazy_module
+from .canonical import canonical_expression
+from .expression import ExpressionError
+
+sympy = lazy_module('sympy')
+
+# Where a calculus request starts inside a message
+_START_RE = re.compile(r'\b(?:(?:first|second|third|\d+(?:st|nd|rd|th))\s+)?derivative\b|\bdifferentiate\b'
+                       r'|\bintegra(?:l|te)\b|∫|\bd/d[a-z]\b|\blim(?:it)?\b')
+
+_ORDERS = {'first': 1, 'second': 2, 'third': 3}
+_DERIVATIVE_RE = re.compile(r'(?:(?P<order>first|second|third|\d+)(?:st|nd|rd|th)?\s+)?derivative\s+of\s+(?P<rest>.+)'
+                            r'|differentiate\s+(?P<rest2>.+)'
+                            r'|d/d(?P<var>[a-z])\s*(?:of\s+)?(?P<rest3>.+)')
+_INTEGRAL_RE = re.compile(r'(?:(?:definite|indefinite)\s+)?(?:integral|integrate|∫)\s*(?:of\s+)?(?P<rest>.+)')
+_LIMIT_RE = re.compile(r'lim(?:it)?\s+(?:of\s+)?(?P<rest>.+)')
+_APPROACHES = r'\s*(?:->|→|approaches|goes\s+to|tends\s+to)\s*'
+# "as x -> 0+" after the function, or "x -> 0 of" before it
+_LIMIT_AFTER_RE = re.compile(rf'(?P<expr>.+?)\s+as\s+(?P<var>[a-z]){_APPROACHES}(?P<point>\S+)(?P<side>.*)$')
+_LIMIT_BEFORE_RE = re.compile(rf'(?:as\s+)?(?P<var>[a-z]){_APPROACHES}(?P<point>\S+?)(?P<sign>[+-]?)\s+(?:of\s+)?(?P<expr>.+)$')
+_BOUNDS_RE = re.compile(r'(?:from|between)\s+(?P<low>\S+)\s+(?:to|and)\s+(?P<high>\S+)')
+_VARIABLE_RE = re.compile(r'\s+(?:with\s+respect\s+to|wrt)\s+(?P<var>[a-z])\b')
+_DIFFERENTIAL_RE = re.compile(r'\s+d(?P<var>[a-z])\b')
+_INFINITY = {'infinity': 'oo', 'inf': 'oo', '∞': 'oo', 'oo': 'oo'}
+
+class CalculusError(ValueError):
+    """Raised when sympy cannot answer a calculus request in closed form"""
+
+def find_calculus(text):
+    """The calculus request inside a message ("what is the derivative of x^2?" -> "derivative of x^2"), or None"""
+    match = _START_RE.search(text)
+    if match is None:
+        return None
+    request = text[match.start():].strip().rstrip('?.!').strip()
+    return request if parse_calculus(request) is not None else None
+
+def _point(text):
+    sign = '-' if text.startswith('-') else ''
+    value = text.lstrip('+-')
+    return sign + _INFINITY[value] if value in _INFINITY else text
+
+def _take(pattern, text):
+    """Remove the first match of pattern from text, returning (text, match or None)"""
+    match = pattern.search(text)
+    if match is None:
+        return text, None
+    return (text[:match.start()] + text[match.end():]).strip(), match
+
+def parse_calculus(text):
+    """A request as a dict with 'operation' ('derivative', 'integral' or 'limit'), 'expression' and
+    'var' (None to pick one), plus 'order', 'bounds' or 'point' and 'direction'; None for other text"""
+    text = ' '.join(text.lower().split())
+    match = _DERIVATIVE_RE.fullmatch(text)
+    if match:
+        rest = match.group('rest') or match.group('rest2') or match.group('rest3')
+        rest, variable = _take(_VARIABLE_RE, rest)
+        order = match.group('order')
+        order = (_ORDERS.get(order) or int(order)) if order else 1
+        var = match.group('var') or (variable and variable.group('var'))
+        return {"operation": "derivative", "expression": rest, "var": var, "order": order}
+
+    match = _INTEGRAL_RE.fullmatch(text)
+    if match:
+        rest, bounds = _take(_BOUNDS_RE, match.group('rest'))
+        rest, variable = _take(_VARIABLE_RE, rest)
+        if variable is None:
+            rest, variable = _take(_DIFFERENTIAL_RE, ' ' + rest)
+        rest = rest.removeprefix('of ').strip()
+        if not rest:
+            return None
+        return {
+            "operation": "integral",
+            "expression": rest,
+            "var": variable and variable.group('var'),
+            "bounds": (_point(bounds.group('low')), _point(bounds.group('high'))) if bounds else None,
+        }
+
+    match = _LIMIT_RE.fullmatch(text)
+    if match:
+        rest = match.group('rest')
+        found = _LIMIT_AFTER_RE.fullmatch(rest)
+        if found:
+            side = found.group('side')
+            direction = '-' if 'left' in side or 'below' in side else '+' if 'right' in side or 'above' in side else ''
+        else:
+            found = _LIMIT_BEFORE_RE.fullmatch(rest)
+            if found is None:
+                return None
+            direction = found.group('sign')
+        point = found.group('point')
+        if not direction and len(point) > 1 and point[-1] in '+-':
+            point, direction = point[:-1], point[-1]
+        return {
+            "operation": "limit",
+            "expression": found.group('expr').strip(),
+            "var": found.group('var'),
+            "point": _point(point),
+            "direction": direction or '+-',
+        }
+    return None
+
+def calculus_key(request):
+    """Key shared by every spelling of the same request ("x^2 + 3x" and "3*x + x**2")"""
+    try:
+        expression = canonical_expression(request["expression"])
+    except ExpressionError:
+        expression = ''.join(request["expression"].split())
+    details = tuple(value for name, value in sorted(request.items()) if name not in ("expression", "operation"))
+    return (request["operation"], expression) + details
+
+# Step output, run on sympy expressions
+
+def _rule(term, var):
+    """Name of the differentiation rule that applies to a term"""
+    if not term.has(var):
+        return "constant rule"
+    if term == var:
+        return "power rule"
+    constant, rest = term.as_independent(var, as_Add=False)
+    if constant != 1:
+        return f"constant multiple rule, {_rule(rest, var)}"
+    if term.is_Mul:
+        factors = [factor for factor in term.args if factor.has(var)]
+        if any(factor.is_Pow and factor.exp.is_negative for factor in factors):
+            return "quotient rule"
+        return "product rule"
+    if term.is_Pow:
+        if term.exp.has(var):
+            return "exponential rule" if term.base == var or not term.base.has(var) else "logarithmic differentiation"
+        return "power rule" if term.base == var else "chain rule with the power rule"
+    if term.args and term.args[0] == var:
+        return f"derivative of {term.func.__name__}"
+    return "chain rule"
+
+def _simplest(expression):
+    simplified = sympy.simplify(expression)
+    return simplified if sympy.count_ops(simplified) < sympy.count_ops(expression) else expression
+
+def solve_derivative(expression, var, order=1):
+    """(answer, steps) of the order-th derivative, term by term"""
+    steps = []
+    current = expression
+    for n in range(1, order + 1):
+        terms = sympy.Add.make_args(current)
+        if order > 1:
+            steps.append(f"Derivative {n} of {current}:")
+        if len(terms) > 1:
+            steps.append("Differentiate each term separately (sum rule)")
+        for term in terms:
+            steps.append(f"d/d{var}[{term}] = {sympy.diff(term, var)} ({_rule(term, var)})")
+        current = _simplest(sympy.diff(current, var))
+    steps.append(f"Result: {current}")
+    return str(current), steps
+
+def _antiderivative(expression, var, steps):
+    terms = sympy.Add.make_args(sympy.expand(expression)) if expression.is_Add else (expression,)
+    if len(terms) > 1:
+        steps.append("Integrate each term separately (sum rule)")
+    parts = []
+    for term in terms:
+        part = sympy.integrate(term, var)
+        if part.has(sympy.Integral):
+            raise CalculusError(f"No closed-form antiderivative of {term}")
+        steps.append(f"∫ {term} d{var} = {part}")
+        parts.append(part)
+    return _simplest(sympy.Add(*parts))
+
+def solve_integral(expression, var, bounds=None):
+    """(answer, steps) of the indefinite integral, or of the definite one over bounds (low, high)"""
+    steps = []
+    antiderivative = _antiderivative(expression, var, steps)
+    if bounds is None:
+        steps.append(f"Result: {antiderivative} + C")
+        return f"{antiderivative} + C", steps
+
+    low, high = bounds
+    value = sympy.integrate(expression, (var, low, high))
+    if value.has(sympy.Integral):
+        raise CalculusError("The integral could not be evaluated over these bounds")
+    value = _simplest(value)
+    if low.is_finite and high.is_finite and value.is_finite:
+        upper, lower = antiderivative.subs(var, high), antiderivative.subs(var, low)
+        steps.append(f"Evaluate between the bounds: F({high}) - F({low}) = {upper} - ({lower})")
+    else:
+        steps.append("Improper integral: take the limit of F at the infinite or undefined bound")
+    answer = _with_approximation(value)
+    steps.append(f"Result: {answer}")
+    return answer, steps
+
+def solve_limit(expression, var, point, direction='+-'):
+    """(answer, steps) of the limit of expression as var approaches point from direction ('+', '-' or '+-')"""
+    steps = []
+    if point.is_finite:
+        direct = expression.subs(var, point)
+        if direct.is_finite:
+            steps.append(f"Direct substitution of {var} = {point} gives {direct}")
+        else:
+            steps.append(f"Substituting {var} = {point} gives an indeterminate or infinite form, so the limit is evaluated")
+    else:
+        steps.append(f"Examine the behaviour as {var} → {_text(point)}")
+    # Only a finite point can be approached from a side
+    arguments = (expression, var, point) + ((direction,) if point.is_finite else ())
+    try:
+        value = sympy.limit(*arguments)
+    except ValueError:
+        raise CalculusError("The left and right limits differ, so the limit does not exist")
+    if value.has(sympy.Limit) or value is sympy.nan or value is sympy.zoo:
+        raise CalculusError("The limit does not exist")
+    answer = _with_approximation(value)
+    steps.append(f"Result: {answer}")
+    return answer, steps
+
+def _text(value):
+    if value is sympy.oo:
+        return '∞'
+    if value is -sympy.oo:
+        return '-∞'
+    return str(value)
+
+def _with_approximation(value):
+    """Exact value, followed by its decimal value when it is not a plain rational"""
+    if value.is_Rational or not value.is_finite or not value.is_number:
+        return _text(value)
+    return f"{value} ≈ {value.evalf(10)}"
@@ -0,0 +1,173 @@
+from fractions import Fraction
+
+from .expression import ExpressionError, compile_expression
+
+# Products and whole powers of sums are expanded only while the result stays this small
+MAX_TERMS = 64
+# Whole powers of numbers are folded while the result fits in this many bits
+MAX_FOLD_BITS = 4096
+
+# A side is held as a polynomial {monomial: coefficient} with int or Fraction coefficients.
+# A monomial is a sorted tuple of (atom, power) and an atom is the canonical text of a part
+# that is neither a sum nor a product: a variable, a decimal, a function call, an unexpanded power.
+
+def _atom(text):
+    return {((text, 1),): 1}
+
+def _constant(value):
+    return {(): value} if value else {}
+
+def _as_constant(poly):
+    """The value of a polynomial without atoms, else None"""
+    if not poly:
+        return 0
+    if len(poly) == 1 and () in poly:
+        return poly[()]
+    return None
+
+def _scale(poly, factor):
+    return {m: c * factor for m, c in poly.items()} if factor else {}
+
+def _add(a, b, sign=1):
+    result = dict(a)
+    for monomial, coefficient in b.items():
+        total = result.get(monomial, 0) + sign * coefficient
+        if total:
+            result[monomial] = total
+        else:
+            result.pop(monomial, None)
+    return result
+
+def _merge(a, b):
+    powers = dict(a)
+    for atom, power in b:
+        powers[atom] = powers.get(atom, 0) + power
+    return tuple(sorted(powers.items()))
+
+def _expand(a, b):
+    """Product of two polynomials, or None when it would have more than MAX_TERMS terms"""
+    if len(a) * len(b) > MAX_TERMS:
+        return None
+    result = {}
+    for m1, c1 in a.items():
+        for m2, c2 in b.items():
+            monomial = _merge(m1, m2)
+            total = result.get(monomial, 0) + c1 * c2
+            if total:
+                result[monomial] = total
+            else:
+                result.pop(monomial, None)
+    return result
+
+def _multiply(a, b):
+    product = _expand(a, b)
+    if product is None:
+        # Commutative, so the two factors are ordered by their text
+        return _atom('*'.join(sorted(f"({render(p)})" for p in (a, b))))
+    return product
+
+def _power(base, exponent):
+    value = _as_constant(exponent)
+    if value is not None and Fraction(value).denominator == 1:
+        n = int(value)
+        number = _as_constant(base)
+        if number is not None:
+            number = Fraction(number)
+            size = max(number.numerator.bit_length(), number.denominator.bit_length())
+            if size * abs(n) <= MAX_FOLD_BITS and (number or n >= 0):
+                return _constant(number ** n)
+        elif 0 <= n <= MAX_TERMS:
+            result = {(): 1}
+            for _ in range(n):
+                result = _expand(result, base)
+                if result is None:
+                    break
+            else:
+                return result
+    return _atom(f"({render(base)})^({render(exponent)})")
+
+def _polynomial(tree):
+    kind = tree[0]
+    if kind == 'num':
+        # Decimals are kept as written so the solver sees the same floats
+        return _constant(tree[1]) if isinstance(tree[1], int) else _atom(f"decimal({tree[1]})")
+    if kind in ('var', 'const'):
+        return _atom(tree[1])
+    if kind == 'neg':
+        return _scale(_polynomial(tree[1]), -1)
+    if kind == 'call':
+        return _atom(f"{tree[1]}({render(_polynomial(tree[2]))})")
+
+    left = _polynomial(tree[1])
+    right = _polynomial(tree[2])
+    if kind == '+':
+        return _add(left, right)
+    if kind == '-':
+        return _add(left, right, -1)
+    if kind == '*':
+        return _multiply(left, right)
+    if kind == '/':
+        divisor = _as_constant(right)
+        if divisor:
+            return _scale(left, Fraction(1) / divisor)
+        # Never cancelled against the numerator, so x/x keeps its hole at 0
+        return _multiply(left, _atom(f"1/({render(right)})"))
+    return _power(left, right)
+
+def _order(term):
+    # Highest total degree first, then by atoms, so the constant comes last
+    monomial = term[0]
+    return (-sum(power for _, power in monomial), monomial)
+
+def _render_term(monomial, coefficient):
+    factors = [atom if power == 1 else f"{atom}^{power}" for atom, power in monomial]
+    magnitude = abs(coefficient)
+    if factors and magnitude == 1:
+        text = '*'.join(factors)
+    else:
+        text = '*'.join([str(magnitude)] + factors)
+    return text, coefficient < 0
+
+def render(poly):
+    """Text of a polynomial with its terms in a fixed order"""
+    if not poly:
+        return '0'
+    text = ''
+    for monomial, coefficient in sorted(poly.items(), key=_order):
+        term, negative = _render_term(monomial, coefficient)
+        if not text:
+            text = '-' + term if negative else term
+        else:
+            text += f" {'-' if negative else '+'} {term}"
+    return text
+
+def canonical_expression(text):
+    """Canonical text of an expression: like terms collected, products sorted, constants folded"""
+    return render(_polynomial(compile_expression(text)))
+
+def canonical_equation(left, right):
+    """Canonical text of left = right, written as a single side equal to 0"""
+    poly = _add(_polynomial(compile_expression(left)), _polynomial(compile_expression(right)), -1)
+    # Negating both sides keeps the solutions, so the first term is made positive
+    if poly and min(poly.items(), key=_order)[1] < 0:
+        poly = _scale(poly, -1)
+    return render(poly) + ' = 0'
+
+def canonical_form(problem):
+    """Canonical text of a problem with one equation or expression per line or comma, in sorted
+    order; None when any part is not an expression the parser understands"""
+    parts = []
+    for part in problem.replace(',', '\n').split('\n'):
+        if not part.strip():
+            continue
+        sides = part.split('=')
+        try:
+            if len(sides) == 1:
+                parts.append(canonical_expression(part))
+            elif len(sides) == 2:
+                parts.append(canonical_equation(*sides))
+            else:
+                return None
+        except ExpressionError:
+            return None
+    return '\n'.join(sorted(parts))
@@ -0,0 +1,253 @@
+import math
+import re
+from fractions import Fraction
+from functools import lru_cache
+
+# Expressions compile to nested tuples:
+#   ('num', value)  ('var', name)  ('const', name)  ('neg', operand)
+#   (op, left, right) for op in + - * / ^     ('call', function, argument)
+
+FUNCTIONS = {
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log10,
+    'ln': math.log,
+    'exp': math.exp,
+    'abs': abs,
+}
+CONSTANTS = {
+    'pi': math.pi,
+}
+
+# Longest names first so "sqrt" is not read as s*q*r*t
+_NAMES = sorted(list(FUNCTIONS) + list(CONSTANTS), key=len, reverse=True)
+
+# Any other non-space character lands in the last group and is rejected
+_TOKEN_RE = re.compile(r"(\d+\.?\d*|\.\d+)|([A-Za-z]+)|(\*\*|[-+*/^()])|(\S)")
+
+# Binding powers: higher binds tighter
+_INFIX = {'+': 10, '-': 10, '*': 20, '/': 20, '^': 40}
+_PREFIX_POWER = 30
+
+# Exponents beyond this are evaluated in floating point to keep big integers bounded
+MAX_EXACT_EXPONENT = 4096
+# Likewise powers whose exact result would need more bits than this (about 20,000 digits)
+MAX_EXACT_BITS = 65536
+
+class ExpressionError(ValueError):
+    """Raised when text is not a valid expression or cannot be evaluated"""
+
+def _split_name(word):
+    """Split a run of letters into known function/constant names and single-letter variables"""
+    if len(word) == 1:
+        return [('var', word)]
+    parts = []
+    i = 0
+    while i < len(word):
+        for name in _NAMES:
+            if word.startswith(name, i):
+                parts.append(('func' if name in FUNCTIONS else 'const', name))
+                i += len(name)
+                break
+        else:
+            parts.append(('var', word[i]))
+            i += 1
+    return parts
+
+_MULTIPLY = ('op', '*')
+
+def tokenize(text):
+    """Turn text into (kind, value) tokens, inserting '*' for implicit multiplication"""
+    tokens = []
+    append = tokens.append
+    # 'num' or 'operand' right after a token that can be followed by an implicit product
+    ends = None
+    for number, word, op, other in _TOKEN_RE.findall(text):
+        if number:
+            # "2 3" is an error, but "x2" and ")2" multiply
+            if ends == 'operand':
+                append(_MULTIPLY)
+            append(('num', int(number) if number.isdigit() else Fraction(number)))
+            ends = 'num'
+        elif word:
+            for kind, name in _split_name(word):
+                if ends:
+                    append(_MULTIPLY)
+                append((kind, name))
+                ends = None if kind == 'func' else 'operand'
+        elif op:
+            if op == '(' and ends:
+                append(_MULTIPLY)
+            append(('op', '^' if op == '**' else op))
+            ends = 'operand' if op == ')' else None
+        else:
+            raise ExpressionError(f"Unexpected character {other!r}")
+    return tokens
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def advance(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect_close(self):
+        if self.advance() != ('op', ')'):
+            raise ExpressionError("Missing closing parenthesis")
+
+    def parse(self, min_power=0):
+        left = self.prefix()
+        while True:
+            kind, value = self.peek()
+            power = _INFIX.get(value) if kind == 'op' else None
+            if power is None or power <= min_power:
+                return left
+            self.advance()
+            # '^' is right-associative, everything else left-associative
+            right = self.parse(power - 1 if value == '^' else power)
+            left = (value, left, right)
+
+    def prefix(self):
+        kind, value = self.advance()
+        if kind == 'num':
+            return ('num', value)
+        if kind in ('var', 'const'):
+            return (kind, value)
+        if kind == 'func':
+            if self.peek() == ('op', '('):
+                self.advance()
+                argument = self.parse()
+                self.expect_close()
+            else:
+                # "sin x" applies to the next operand
+                argument = self.parse(_PREFIX_POWER)
+            return ('call', value, argument)
+        if (kind, value) == ('op', '('):
+            inner = self.parse()
+            self.expect_close()
+            return inner
+        if (kind, value) == ('op', '-'):
+            return ('neg', self.parse(_PREFIX_POWER))
+        if (kind, value) == ('op', '+'):
+            return self.parse(_PREFIX_POWER)
+        if kind is None:
+            raise ExpressionError("Unexpected end of expression")
+        raise ExpressionError(f"Unexpected {value!r}")
+
+@lru_cache(maxsize=1024)
+def compile_expression(text):
+    """Parse text into an expression tree (cached per input string)"""
+    tokens = tokenize(text)
+    if not tokens:
+        raise ExpressionError("Empty expression")
+    parser = _Parser(tokens)
+    tree = parser.parse()
+    if parser.pos != len(tokens):
+        raise ExpressionError(f"Unexpected {parser.peek()[1]!r}")
+    return tree
+
+def _exact(value):
+    return isinstance(value, (int, Fraction))
+
+def exact_power_fits(base, exponent):
+    """Whether exact base ** exponent (a whole number) stays within MAX_EXACT_EXPONENT and MAX_EXACT_BITS"""
+    base = Fraction(base)
+    size = max(base.numerator.bit_length(), base.denominator.bit_length())
+    return abs(exponent) <= MAX_EXACT_EXPONENT and size * abs(exponent) <= MAX_EXACT_BITS
+
+def _power(base, exponent):
+    if _exact(exponent) and Fraction(exponent).denominator == 1:
+        exponent = int(exponent)
+        if _exact(base) and exact_power_fits(base, exponent):
+            if exponent < 0:
+                if base == 0:
+                    raise ExpressionError("Division by zero")
+                return Fraction(base) ** exponent
+            return base ** exponent
+    try:
+        result = float(base) ** float(exponent)
+    except OverflowError:
+        raise ExpressionError("Result is too large")
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero")
+    if isinstance(result, complex):
+        raise ExpressionError("Result is not a real number")
+    return result
+
+def exact_sqrt(value):
+    """Square root of a non-negative rational when it is rational itself: sqrt(9/4) = 3/2, else None"""
+    value = Fraction(value)
+    num, den = math.isqrt(value.numerator), math.isqrt(value.denominator)
+    if num * num == value.numerator and den * den == value.denominator:
+        return Fraction(num, den)
+    return None
+
+def _call(name, argument):
+    if name == 'abs':
+        return abs(argument)
+    if name == 'sqrt' and _exact(argument) and argument >= 0:
+        root = exact_sqrt(argument)
+        if root is not None:
+            return root
+    try:
+        return FUNCTIONS[name](float(argument))
+    except (ValueError, OverflowError):
+        raise ExpressionError(f"{name} is undefined for {argument}")
+
+def evaluate(tree, variables=None):
+    """Evaluate an expression tree; rational input stays exact (int/Fraction)"""
+    kind = tree[0]
+    if kind == 'num':
+        return tree[1]
+    if kind == 'var':
+        if variables is None or tree[1] not in variables:
+            raise ExpressionError(f"Unknown variable {tree[1]!r}")
+        return variables[tree[1]]
+    if kind == 'const':
+        return CONSTANTS[tree[1]]
+    if kind == 'neg':
+        return -evaluate(tree[1], variables)
+    if kind == 'call':
+        return _call(tree[1], evaluate(tree[2], variables))
+
+    left = evaluate(tree[1], variables)
+    right = evaluate(tree[2], variables)
+    if kind == '+':
+        return left + right
+    if kind == '-':
+        return left - right
+    if kind == '*':
+        return left * right
+    if kind == '/':
+        if right == 0:
+            raise ExpressionError("Division by zero")
+        if _exact(left) and _exact(right):
+            return Fraction(left) / right
+        return left / right
+    return _power(left, right)
+
+def evaluate_expression(text, variables=None):
+    """Compile and evaluate text, returning an int when the exact result is whole"""
+    result = evaluate(compile_expression(text), variables)
+    if isinstance(result, Fraction) and result.denominator == 1:
+        return result.numerator
+    return result
+
+def free_variables(tree):
+    """Names of the variables an expression tree refers to"""
+    kind = tree[0]
+    if kind == 'var':
+        return {tree[1]}
+    if kind in ('num', 'const'):
+        return set()
+    if kind in ('neg', 'call'):
+        return free_variables(tree[-1])
+    return free_variables(tree[1]) | free_variables(tree[2])
@@ -0,0 +1,169 @@
+import json
+import re
+from fractions import Fraction
+
+from .expression import ExpressionError, compile_expression, evaluate, free_variables
+
+_NUMBER = r'\d+(?:\.\d+)?|\.\d+'
+# A given value as written, signs and operators included, so "-4" and "10^400" can be refused
+# instead of being read as 4 and 10
+_VALUE = rf'-?(?:{_NUMBER})(?:\s*[*/^]\s*-?(?:{_NUMBER}))*'
+_POWERS = {1: '', 2: '²', 3: '³'}
+
+class GeometryError(ValueError):
+    """Raised when a shape has no formula for a quantity, or a value it needs is missing or unusable"""
+
+def _alternation(words):
+    # Longest first, so "surface area" wins over "area" and "square pyramid" over "square"
+    return '|'.join(r'\s+'.join(map(re.escape, word.split())) for word in sorted(words, key=len, reverse=True))
+
+def _compile(text):
+    """(variables, function of a {variable: value} dict) of a formula written in expression syntax"""
+    tree = compile_expression(text)
+    return frozenset(free_variables(tree)), lambda values: evaluate(tree, values)
+
+class GeometryFormulas:
+    """Formulas of the math notes compiled once, keyed by (shape, quantity).
+
+    A request ("area of a circle with radius 3") is answered by looking its shape and quantity up
+    and evaluating the first formula whose variables were all given, with no symbolic work.
+    """
+
+    def __init__(self, notes):
+        self.parameters = notes["parameters"]
+        self.lists = notes["lists"]
+        self.units = notes["units"]
+        # Unit -> its length in metres; units missing here ("units") cannot be converted
+        self.lengths = {unit: Fraction(metres) for unit, metres in notes["lengths"].items()}
+        self.dimensions = {name: quantity["dimension"] for name, quantity in notes["quantities"].items()}
+        self.quantities = {alias: name for name, quantity in notes["quantities"].items() for alias in quantity["aliases"]}
+        self.shapes = {alias: name for name, shape in notes["shapes"].items() for alias in shape["aliases"]}
+        # (shape, quantity) -> [(variables, function, formula text)], in order of preference
+        self.formulas = {
+            (shape, quantity): [(*_compile(text), text) for text in texts]
+            for shape, entry in notes["shapes"].items() for quantity, texts in entry["formulas"].items()
+        }
+        # Shape -> {variable: the words that name it there}, for messages about missing values
+        self.names = {name: shape["names"] for name, shape in notes["shapes"].items()}
+
+        units = _alternation(self.units)
+        self.unit_pattern = re.compile(rf'\b(?:{units})\b')
+        self.quantity_pattern = re.compile(rf'\b(?:{_alternation(self.quantities)})\b')
+        self.shape_pattern = re.compile(rf'\b(?:{_alternation(self.shapes)})\b')
+        # "radius 3", "a radius of 3 cm", "height = 5", "r = 3"
+        self.value_pattern = re.compile(
+            rf'\b(?:(?P<word>{_alternation(self.parameters)})s?\s*(?:(?:of|is)\s+|[=:]\s*)?'
+            rf'|(?P<letter>[a-z])\s*[=:]\s*)(?P<value>{_VALUE})(?:\s*(?P<unit>{units})\b)?')
+        # "sides 3, 4 and 5", "legs of 3 cm and 4 cm"
+        length = rf'(?:{_VALUE})(?:\s*(?:{units})\b)?'
+        self.length_pattern = re.compile(rf'(?P<value>{_VALUE})(?:\s*(?P<unit>{units})\b)?')
+        self.list_pattern = re.compile(
+            rf'\b(?P<word>{_alternation(self.lists)})\s*(?:(?:of|are)\s+|[=:]\s*)?'
+            rf'(?P<values>{length}(?:\s*(?:,\s*(?:and\s+)?|and\s+){length})*)')
+
+    def parse(self, text):
+        """A request as {"shape", "quantity", "values", "unit"}, or None when text names no shape and quantity.
+
+        Lengths given in different units are converted to the largest of them; GeometryError is
+        raised for a value that is not a positive number or units that cannot be converted.
+        """
+        text = text.lower()
+        quantity = self.quantity_pattern.search(text)
+        shape = quantity and self.shape_pattern.search(text)
+        if not shape:
+            return None
+        values = {}
+        # Variable -> unit its value was given in
+        units = {}
+        for match in self.list_pattern.finditer(text):
+            word = ' '.join(match.group('word').split())
+            for variable, length in zip(self.lists[word], self.length_pattern.finditer(match.group('values'))):
+                values[variable] = _positive(length.group('value'), f"Each of the {word}")
+                if length.group('unit'):
+                    units[variable] = self.units[' '.join(length.group('unit').split())]
+        for match in self.value_pattern.finditer(text):
+            word = match.group('word') and ' '.join(match.group('word').split())
+            variable = self.parameters[word] if word else match.group('letter')
+            if variable in values:
+                continue
+            values[variable] = _positive(match.group('value'), f"The {word}" if word else f"The value of {variable}")
+            if match.group('unit'):
+                units[variable] = self.units[' '.join(match.group('unit').split())]
+        return {
+            "shape": self.shapes[' '.join(shape.group().split())],
+            "quantity": self.quantities[' '.join(quantity.group().split())],
+            "values": values,
+            "unit": self._convert(values, units),
+        }
+
+    def _convert(self, values, units):
+        """Rewrite the values given in mixed units in the largest of them; the unit of the result, or None"""
+        used = set(units.values())
+        if len(used) <= 1:
+            return used.pop() if used else None
+        if not used <= self.lengths.keys():
+            raise GeometryError(f"Cannot combine lengths in {' and '.join(sorted(used))}")
+        target = max(used, key=self.lengths.get)
+        for variable, unit in units.items():
+            values[variable] *= self.lengths[unit] / self.lengths[target]
+        return target
+
+    def find(self, text):
+        """The geometry request inside a message ("what's the area of a circle of radius 3?"), or None"""
+        match = self.quantity_pattern.search(text.lower())
+        if match is None:
+            return None
+        request = text[match.start():].strip().rstrip('?.!').strip()
+        try:
+            return request if self.parse(request) is not None else None
+        except GeometryError:
+            # Still a geometry request; solving it reports what is wrong with it
+            return request
+
+    def solve(self, request):
+        """{"value", "formula", "values" it used, "substituted" formula} of a parsed request"""
+        shape, quantity, values = request["shape"], request["quantity"], request["values"]
+        formulas = self.formulas.get((shape, quantity))
+        if formulas is None:
+            raise GeometryError(f"A {shape} has no {quantity} formula")
+        for variables, function, text in formulas:
+            if variables <= values.keys():
+                try:
+                    value = function(values)
+                except ExpressionError:
+                    raise GeometryError(f"These measurements do not form a {shape}")
+                return {
+                    "value": value,
+                    "formula": text,
+                    "values": {variable: values[variable] for variable in sorted(variables)},
+                    "substituted": re.sub(r'\b[a-z]\b', lambda m: format_number(values[m.group()]), text),
+                }
+        names = self.names[shape]
+        needed = ' or '.join(' and '.join(names.get(v, v) for v in sorted(variables)) for variables, _, _ in formulas)
+        raise GeometryError(f"The {quantity} of a {shape} needs its {needed}")
+
+    def unit(self, request):
+        """Unit of the answer, such as 'cm²' for an area given in cm, or ''"""
+        if request["unit"] is None:
+            return ''
+        return request["unit"] + _POWERS.get(self.dimensions[request["quantity"]], '')
+
+def _positive(text, name):
+    """The value written as text, which must be a plain positive number; `name` starts the error message"""
+    if not re.fullmatch(_NUMBER, text) or Fraction(text) == 0:
+        raise GeometryError(f"{name} must be a positive number, not {' '.join(text.split())}")
+    return Fraction(text)
+
+def format_number(value):
+    """Whole values as integers, others to 10 significant digits"""
+    if isinstance(value, Fraction) and value.denominator == 1:
+        value = value.numerator
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else f"{value:.10g}"
+
+def load_geometry(path):
+    """GeometryFormulas of a math notes file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return GeometryFormulas(json.load(f))
@@ -0,0 +1,207 @@
+import math
+import re
+from fractions import Fraction
+
+from .expression import compile_expression
+from .linear import _divide
+from .polynomial import (NotPolynomialError, _Collector, _trim, _evaluate, _format_float,
+                         quadratic_roots, split_rational_roots, companion_roots, real_roots)
+
+_RELATION_RE = re.compile(r'(<=|>=|<|>)')
+# Signs of left - right that satisfy each relation
+SATISFIED = {'<': (-1,), '<=': (-1, 0), '>': (1,), '>=': (1, 0)}
+# Numeric critical points closer than this (relative) are one double root
+DUPLICATE_TOLERANCE = 1e-7
+
+# An endpoint is (value, text) with value a float used only for ordering, or None for ±∞.
+# An interval is (low, low closed, high, high closed); a single point has low == high, both closed.
+
+class NotInequalityError(ValueError):
+    """Raised when text is not an inequality the polynomial engine can solve"""
+
+def split_inequality(text):
+    """Sides and relations of 'a < b' or of a chain 'a < b <= c'"""
+    parts = _RELATION_RE.split(text)
+    sides, relations = [part.strip() for part in parts[0::2]], parts[1::2]
+    if not relations or len(relations) > 2 or any(not side or '=' in side for side in sides):
+        raise NotInequalityError("Expected one or two of <, >, <=, >= between expressions")
+    return sides, relations
+
+def _quadratic_points(a, b, c):
+    discriminant, texts = quadratic_roots(a, b, c)
+    if discriminant < 0:
+        return []
+    vertex = float(Fraction(-b) / (2 * Fraction(a)))
+    if discriminant == 0:
+        return [(vertex, texts[0])]
+    spread = math.sqrt(discriminant) / abs(2 * a)
+    return [(vertex - spread, texts[0]), (vertex + spread, texts[1])]
+
+def _divide_polynomials(a, b):
+    """Quotient and remainder of a / b, highest degree first, in exact arithmetic"""
+    remainder = [Fraction(c) for c in a]
+    quotient = []
+    while len(remainder) >= len(b):
+        factor = remainder[0] / b[0]
+        quotient.append(factor)
+        remainder = [r - factor * c for r, c in zip(remainder[1:], list(b[1:]) + [0] * len(remainder))]
+    while remainder and remainder[0] == 0:
+        remainder.pop(0)
+    return quotient, remainder
+
+def square_free(coefficients):
+    """The polynomial with every repeated root reduced to a simple one: p / gcd(p, p')"""
+    degree = len(coefficients) - 1
+    a = list(coefficients)
+    b = [c * (degree - i) for i, c in enumerate(coefficients[:-1])]
+    while b:
+        a, b = b, _divide_polynomials(a, b)[1]
+    if len(a) == 1:
+        return list(coefficients)
+    return _divide_polynomials(coefficients, a)[0]
+
+def critical_points(coefficients):
+    """Distinct real roots of a polynomial (highest degree first) as sorted (value, text) pairs,
+    and whether any of them is only known numerically"""
+    if len(coefficients) > 2:
+        # Numeric root finding is only accurate for simple roots
+        coefficients = square_free(coefficients)
+    degree = len(coefficients) - 1
+    if degree < 1:
+        return [], False
+    if degree == 1:
+        root = _divide(-coefficients[1], coefficients[0])
+        return [(float(root), str(root))], False
+    if degree == 2:
+        return _quadratic_points(*coefficients), False
+
+    rational, remaining, numeric = split_rational_roots(coefficients)
+    points = [(float(r), str(r)) for r in rational]
+    approximate = False
+    if len(remaining) == 3:
+        points += _quadratic_points(*remaining)
+    elif len(remaining) == 2:
+        root = _divide(-remaining[1], remaining[0])
+        points.append((float(root), str(root)))
+    elif len(remaining) > 3:
+        if numeric is None:
+            numeric = companion_roots([remaining])[0]
+        previous = None
+        for root in real_roots(numeric):
+            if previous is None or abs(root - previous) > DUPLICATE_TOLERANCE * max(1.0, abs(root)):
+                points.append((root, _format_float(root)))
+                approximate = True
+            previous = root
+    return sorted(points), approximate
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+def sign_chart(coefficients, points):
+    """Sign of the polynomial on each open interval around the critical points, left to right"""
+    values = [value for value, _ in points]
+    if not values:
+        tests = [0]
+    else:
+        tests = [values[0] - 1] + [(a + b) / 2 for a, b in zip(values, values[1:])] + [values[-1] + 1]
+    # Evaluated exactly at a rational test point, so a sign is never lost to rounding
+    return [_sign(_evaluate(coefficients, Fraction(t))) for t in tests]
+
+def _intervals(points, signs, relation):
+    """Union of the intervals and points where the polynomial's sign satisfies relation"""
+    satisfied = SATISFIED[relation]
+    # Intervals and points alternate: I0, P0, I1, P1, ..., In
+    sequence = []
+    for i, sign in enumerate(signs):
+        sequence.append(('interval', i, sign in satisfied))
+        if i < len(points):
+            sequence.append(('point', i, 0 in satisfied))
+
+    pieces = []
+    start = None
+    for kind, i, included in sequence:
+        if included and start is None:
+            start = (points[i - 1] if i else None, False) if kind == 'interval' else (points[i], True)
+        elif not included and start is not None:
+            end = (points[i], False) if kind == 'point' else (points[i - 1], True)
+            pieces.append(start + end)
+            start = None
+    if start is not None:
+        pieces.append(start + (None, False))
+    return pieces
+
+def _later_start(a, b):
+    if a[0] is None or b[0] is None:
+        return b if a[0] is None else a
+    if a[0][0] != b[0][0]:
+        return a if a[0][0] > b[0][0] else b
+    return a[0], a[1] and b[1]
+
+def _earlier_end(a, b):
+    if a[0] is None or b[0] is None:
+        return b if a[0] is None else a
+    if a[0][0] != b[0][0]:
+        return a if a[0][0] < b[0][0] else b
+    return a[0], a[1] and b[1]
+
+def intersect(first, second):
+    """Intersection of two sorted unions of intervals"""
+    result = []
+    for low1, closed1, high1, end1 in first:
+        for low2, closed2, high2, end2 in second:
+            low, low_closed = _later_start((low1, closed1), (low2, closed2))
+            high, high_closed = _earlier_end((high1, end1), (high2, end2))
+            if low is not None and high is not None:
+                if low[0] > high[0] or (low[0] == high[0] and not (low_closed and high_closed)):
+                    continue
+            result.append((low, low_closed, high, high_closed))
+    return sorted(result, key=lambda piece: -math.inf if piece[0] is None else piece[0][0])
+
+def format_intervals(intervals):
+    """Interval notation: '(-∞, -2) ∪ [3, ∞)', '{0}', or '∅' for no solution"""
+    if not intervals:
+        return "∅"
+    parts = []
+    for low, low_closed, high, high_closed in intervals:
+        if low is not None and high is not None and low[1] == high[1]:
+            parts.append(f"{{{low[1]}}}")
+            continue
+        parts.append(f"{'[' if low_closed else '('}{low[1] if low else '-∞'}, "
+                     f"{high[1] if high else '∞'}{']' if high_closed else ')'}")
+    return " ∪ ".join(parts)
+
+def format_chart(points, signs):
+    """'(-∞, -2): +, (-2, 2): -, (2, ∞): +'"""
+    bounds = ['-∞'] + [text for _, text in points] + ['∞']
+    return ", ".join(f"({low}, {high}): {'+' if sign > 0 else '-' if sign < 0 else '0'}"
+                     for low, high, sign in zip(bounds, bounds[1:], signs))
+
+def solve_inequality(text):
+    """Solve a polynomial inequality, or a chain of two, in one variable.
+
+    Returns a dict with 'var', 'intervals' (see format_intervals), 'approximate' and 'parts',
+    one per relation: {'coefficients' of left - right highest first, 'relation', 'points',
+    'signs'}. Raises NotInequalityError or NotPolynomialError when sympy is needed.
+    """
+    sides, relations = split_inequality(text)
+    trees = [compile_expression(side) for side in sides]
+    var = None
+    parts = []
+    intervals = None
+    approximate = False
+    for left, right, relation in zip(trees, trees[1:], relations):
+        collector = _Collector()
+        coefficients = _trim(collector.collect(('-', left, right)))[::-1]
+        if collector.var is not None:
+            if var not in (None, collector.var):
+                raise NotPolynomialError("More than one variable")
+            var = collector.var
+        points, numeric = critical_points(coefficients)
+        signs = sign_chart(coefficients, points)
+        solved = _intervals(points, signs, relation)
+        intervals = solved if intervals is None else intersect(intervals, solved)
+        approximate = approximate or numeric
+        parts.append({"coefficients": coefficients, "relation": relation, "points": points, "signs": signs})
+    if var is None:
+        raise NotPolynomialError("No variable to solve for")
+    return {"var": var, "intervals": intervals, "approximate": approximate, "parts": parts}
@@ -0,0 +1,85 @@
+from fractions import Fraction
+
+from .expression import compile_expression
+
+class NotLinearError(ValueError):
+    """Raised when an expression is not a linear combination of its variables"""
+
+def _divide(a, b):
+    # Fractions are slow to build, so whole quotients stay int
+    if isinstance(a, int) and isinstance(b, int) and a % b == 0:
+        return a // b
+    return Fraction(a, b)
+
+def linear_terms(tree):
+    """Collect an expression tree into ({variable: coefficient}, constant) with exact int/Fraction coefficients"""
+    kind = tree[0]
+    if kind == 'num':
+        # Decimal literals stay with sympy, which keeps them as floats
+        if not isinstance(tree[1], int):
+            raise NotLinearError("Decimal coefficient")
+        return {}, tree[1]
+    if kind == 'var':
+        return {tree[1]: 1}, 0
+    if kind == 'neg':
+        coefficients, constant = linear_terms(tree[1])
+        for var in coefficients:
+            coefficients[var] = -coefficients[var]
+        return coefficients, -constant
+    if kind not in ('+', '-', '*', '/'):
+        raise NotLinearError(f"Unsupported term {kind!r}")
+
+    # Every call returns a fresh dict, so the left one is updated in place
+    left, left_constant = linear_terms(tree[1])
+    right, right_constant = linear_terms(tree[2])
+    if kind == '+':
+        for var, c in right.items():
+            left[var] = left.get(var, 0) + c
+        return left, left_constant + right_constant
+    if kind == '-':
+        for var, c in right.items():
+            left[var] = left.get(var, 0) - c
+        return left, left_constant - right_constant
+    if kind == '*':
+        if left and right:
+            raise NotLinearError("Product of variables")
+        if right:
+            left, left_constant, right_constant = right, right_constant, left_constant
+        for var in left:
+            left[var] *= right_constant
+        return left, left_constant * right_constant
+    if right or right_constant == 0:
+        raise NotLinearError("Division by a variable or zero")
+    for var in left:
+        left[var] = _divide(left[var], right_constant)
+    return left, _divide(left_constant, right_constant)
+
+def linear_equation(left, right):
+    """Terms of `left - right` for the two sides of an equation given as text"""
+    coefficients, constant = linear_terms(('-', compile_expression(left), compile_expression(right)))
+    return {var: c for var, c in coefficients.items() if c != 0}, constant
+
+def format_term(coefficient, var):
+    """sympy's printed form of coefficient*var: 'x', '-x', '2*x', 'x/2', '-3*x/2'"""
+    sign = '-' if coefficient < 0 else ''
+    numerator, denominator = abs(coefficient.numerator), coefficient.denominator
+    text = var if numerator == 1 else f"{numerator}*{var}"
+    if denominator != 1:
+        text = f"{text}/{denominator}"
+    return sign + text
+
+def format_linear(terms, constant):
+    """sympy's printed form of sum(coefficient*var) + constant: '2*x - 4', '4 - 2*x', '-x/2 - y + 1'"""
+    parts = [format_term(c, var) for var, c in sorted(terms.items()) if c != 0]
+    if constant != 0:
+        # A positive constant leads a single negative term: '2 - y', but '-y - z + 2'
+        if len(parts) == 1 and parts[0].startswith('-') and constant > 0:
+            parts.insert(0, str(constant))
+        else:
+            parts.append(str(constant))
+    if not parts:
+        return "0"
+    text = parts[0]
+    for part in parts[1:]:
+        text += f" - {part[1:]}" if part.startswith('-') else f" + {part}"
+    return text
@@ -0,0 +1,147 @@
+import math
+from fractions import Fraction
+
+from src.utils.lazy_import import lazy_module
+
+numpy = lazy_module('numpy')
+
+# Systems with more unknowns than this try NumPy float elimination before exact elimination
+EXACT_LIMIT = 8
+# Denominators considered when snapping float solutions back to fractions
+MAX_DENOMINATOR = 10 ** 9
+
+UNIQUE = "unique"
+NONE = "none"
+INFINITE = "infinite"
+
+def _integer_row(coefficients, constant, variables):
+    """Row [a1 .. an | b] of a1*v1 + .. + an*vn = b scaled to integers"""
+    row = [coefficients.get(var, 0) for var in variables] + [-constant]
+    # ints have denominator 1, so whole rows skip Fraction arithmetic entirely
+    scale = math.lcm(*(value.denominator for value in row))
+    if scale == 1:
+        return [int(value) for value in row]
+    return [int(value * scale) for value in row]
+
+def build_matrix(equations):
+    """Augmented integer matrix and sorted variable names for [({var: coeff}, constant), ...]"""
+    variables = sorted(set().union(*(coefficients for coefficients, _ in equations)))
+    return [_integer_row(c, k, variables) for c, k in equations], variables
+
+def bareiss(matrix, columns, record=None):
+    """Fraction-free row echelon form in place; returns the pivot columns.
+
+    record, when given, is called after each pivot's elimination as record(row, swapped_row, column, divisor).
+    """
+    rows = len(matrix)
+    previous = 1
+    pivots = []
+    r = 0
+    for c in range(columns):
+        if r == rows:
+            break
+        p = next((i for i in range(r, rows) if matrix[i][c]), None)
+        if p is None:
+            continue
+        matrix[r], matrix[p] = matrix[p], matrix[r]
+        pivot_row = matrix[r]
+        pivot = pivot_row[c]
+        pivot_tail = pivot_row[c + 1:]
+        for i in range(r + 1, rows):
+            row = matrix[i]
+            factor = row[c]
+            # Every entry stays an integer minor, so the division is exact
+            if factor:
+                tail = [(pivot * a - factor * b) // previous for a, b in zip(row[c + 1:], pivot_tail)]
+            elif previous == 1:
+                tail = [pivot * a for a in row[c + 1:]]
+            else:
+                tail = [pivot * a // previous for a in row[c + 1:]]
+            row[c:] = [0] + tail
+        if record is not None:
+            record(r, p, c, previous)
+        previous = pivot
+        pivots.append(c)
+        r += 1
+    return pivots
+
+def _solve_exact(matrix, variables):
+    matrix = [list(row) for row in matrix]
+    n = len(variables)
+    pivots = bareiss(matrix, n)
+    # A zero row with a non-zero right-hand side reads 0 = b
+    if any(row[n] for row in matrix[len(pivots):]):
+        return NONE, None
+
+    if len(pivots) == n:
+        return UNIQUE, dict(zip(variables, back_substitute(matrix, n)))
+
+    free = [variables[c] for c in range(n) if c not in pivots]
+    # Each value is ({free variable: coefficient}, constant), solved bottom-up
+    values = {var: ({var: Fraction(1)}, Fraction(0)) for var in free}
+    for r in reversed(range(len(pivots))):
+        row = matrix[r]
+        c = pivots[r]
+        terms, constant = {}, Fraction(row[n])
+        for j in range(c + 1, n):
+            if row[j]:
+                j_terms, j_constant = values[variables[j]]
+                constant -= row[j] * j_constant
+                for var, coefficient in j_terms.items():
+                    terms[var] = terms.get(var, 0) - row[j] * coefficient
+        values[variables[c]] = (
+            {var: Fraction(v, row[c]) for var, v in terms.items() if v},
+            Fraction(constant, row[c])
+        )
+
+    return INFINITE, {variables[c]: values[variables[c]] for c in pivots}
+
+def back_substitute(matrix, n):
+    """Unique solution of a full-rank Bareiss echelon form, in integers until the last step"""
+    # The last pivot is the determinant D, and every D*x is an integer (Cramer's rule)
+    determinant = matrix[n - 1][n - 1]
+    scaled = [0] * n
+    for r in reversed(range(n)):
+        row = matrix[r]
+        total = determinant * row[n] - sum(row[j] * scaled[j] for j in range(r + 1, n))
+        scaled[r] = total // row[r]
+    return [Fraction(value, determinant) for value in scaled]
+
+def _solve_numeric(matrix, variables):
+    """Float solve of a square system, kept only if its snapped fractions satisfy every equation exactly"""
+    n = len(variables)
+    if len(matrix) != n:
+        return None
+    a = numpy.array([[float(v) for v in row[:n]] for row in matrix])
+    b = numpy.array([float(row[n]) for row in matrix])
+    try:
+        x = numpy.linalg.solve(a, b)
+    except numpy.linalg.LinAlgError:
+        return None
+    if not numpy.all(numpy.isfinite(x)):
+        return None
+
+    solution = [Fraction(float(v)).limit_denominator(MAX_DENOMINATOR) for v in x]
+    # Residual check in integers over the common denominator
+    denominator = math.lcm(*(v.denominator for v in solution))
+    numerators = [v.numerator * (denominator // v.denominator) for v in solution]
+    for row in matrix:
+        if sum(a_j * x_j for a_j, x_j in zip(row, numerators)) != row[n] * denominator:
+            return None
+    return UNIQUE, dict(zip(variables, solution))
+
+def solve_linear_system(equations):
+    """Solve [({var: coeff}, constant), ...] meaning sum(coeff*var) + constant = 0 for every row.
+
+    Returns (status, variables, solution):
+      unique   - {var: Fraction}
+      none     - None
+      infinite - {pivot var: ({free var: Fraction}, Fraction)}
+    """
+    matrix, variables = build_matrix(equations)
+    if len(variables) > EXACT_LIMIT:
+        numeric = _solve_numeric(matrix, variables)
+        if numeric is not None:
+            return numeric[0], variables, numeric[1]
+    status, solution = _solve_exact(matrix, variables)
+    return status, variables, solution
@@ -0,0 +1,288 @@
+import math
+import re
+from fractions import Fraction
+
+from src.utils.lazy_import import lazy_module
+from .linear_system import bareiss, back_substitute
+
+numpy = lazy_module('numpy')
+
+# Rows or columns beyond this are refused before any work is done
+MAX_SIZE = 500
+# Matrices up to this size with rational entries are reduced exactly, with steps; larger ones use LAPACK
+EXACT_LIMIT = 8
+# Results with more entries than this are summarized in the answer text; the full matrix is in "matrix"
+MAX_DISPLAY_ENTRIES = 100
+
+OPERATIONS = {
+    'determinant': 'determinant', 'det': 'determinant',
+    'inverse': 'inverse', 'inv': 'inverse', 'invert': 'inverse',
+    'rank': 'rank', 'transpose': 'transpose',
+    'product': 'product', 'multiply': 'product',
+}
+_OPERATION_RE = re.compile(rf"\b(?:{'|'.join(OPERATIONS)})\b")
+# What may stand between the two matrices of a product
+_PRODUCT_SEPARATORS = {'*', '@', '×', '·', 'x', 'and', 'by', 'times'}
+_ROW_RE = re.compile(r'\[([^\[\]]*)\]')
+
+class MatrixError(ValueError):
+    """Raised for malformed matrices, mismatched shapes and singular inverses"""
+
+def _groups(text):
+    """(start, end) of every top-level [...] group in text"""
+    spans = []
+    depth = 0
+    start = None
+    for i, char in enumerate(text):
+        if char == '[':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == ']' and depth:
+            depth -= 1
+            if depth == 0:
+                spans.append((start, i + 1))
+    return spans
+
+def parse_matrix_request(text):
+    """{"operation", "matrices": [text, ...]} of "determinant of [[1, 2], [3, 4]]", "[1 2; 3 4] * [5; 6]"
+    and the like, or None for other text"""
+    text = text.strip()
+    lowered = text.lower()
+    groups = _groups(text)
+    if not groups or groups[-1][1] != len(text) or len(groups) > 2:
+        return None
+    operation = _OPERATION_RE.search(lowered, 0, groups[0][0])
+    prefix = lowered[:groups[0][0]]
+    if any(char.isdigit() for char in prefix):
+        return None
+    operation = operation and OPERATIONS[operation.group()]
+
+    if len(groups) == 2:
+        between = lowered[groups[0][1]:groups[1][0]].strip()
+        if between not in _PRODUCT_SEPARATORS or operation not in (None, 'product'):
+            return None
+        if between in ('and', 'by') and operation is None:
+            return None
+        return {"operation": "product", "matrices": [text[start:end] for start, end in groups]}
+    if operation in (None, 'product'):
+        return None
+    return {"operation": operation, "matrices": [text[groups[0][0]:]]}
+
+def find_matrix(text):
+    """The matrix request inside a message ("what is the determinant of [1 2; 3 4]?"), or None"""
+    groups = _groups(text)
+    if not groups:
+        return None
+    operation = _OPERATION_RE.search(text.lower(), 0, groups[0][0])
+    start = operation.start() if operation else groups[0][0]
+    request = text[start:groups[-1][1]]
+    return request if parse_matrix_request(request) is not None else None
+
+def parse_matrix(text):
+    """Rows of entry strings of "[[1, 2], [3, 4]]", "[1 2; 3 4]" or rows on separate lines"""
+    inner = text.strip()[1:-1]
+    if '[' in inner:
+        lines = _ROW_RE.findall(inner)
+    else:
+        lines = re.split(r'[;\n]', inner)
+    # Entries are separated by commas and/or whitespace; str.split keeps 500×500 input in C
+    rows = [line.replace(',', ' ').split() for line in lines]
+    rows = [row for row in rows if row]
+    if not rows:
+        raise MatrixError("The matrix is empty")
+    columns = len(rows[0])
+    if any(len(row) != columns for row in rows):
+        raise MatrixError("Every row needs the same number of entries")
+    if len(rows) > MAX_SIZE or columns > MAX_SIZE:
+        raise MatrixError(f"Matrices are limited to {MAX_SIZE}×{MAX_SIZE}")
+    return rows
+
+def _fraction(entry):
+    try:
+        return Fraction(entry)
+    except (ValueError, ZeroDivisionError):
+        raise MatrixError(f"{entry!r} is not a number")
+
+def exact_rows(rows):
+    """Entries as Fractions"""
+    return [[_fraction(entry) for entry in row] for row in rows]
+
+def float_array(rows):
+    """Entries as a float64 NumPy array, converted in C unless an entry is written as a fraction"""
+    try:
+        return numpy.array(rows, dtype=float)
+    except ValueError:
+        return numpy.array([[float(_fraction(entry)) for entry in row] for row in rows])
+
+def _integer_rows(rows):
+    """Each row scaled to integers, with the factor it was scaled by"""
+    scaled, scales = [], []
+    for row in rows:
+        scale = math.lcm(*(value.denominator for value in row))
+        scaled.append([int(value * scale) for value in row])
+        scales.append(scale)
+    return scaled, scales
+
+def format_value(value):
+    if isinstance(value, Fraction):
+        return str(value.numerator) if value.denominator == 1 else str(value)
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if value == 0:
+        return "0"
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else f"{value:.10g}"
+
+def format_matrix(rows):
+    return '[' + ', '.join('[' + ', '.join(map(format_value, row)) + ']' for row in rows) + ']'
+
+def _plain(value):
+    """JSON-friendly entry: a number, or "p/q" for a fraction"""
+    if isinstance(value, Fraction):
+        return value.numerator if value.denominator == 1 else str(value)
+    return value
+
+class _Recorder:
+    """Row-reduction steps of bareiss, and the number of row swaps it made"""
+
+    def __init__(self, matrix, steps):
+        self.matrix = matrix
+        self.steps = steps
+        self.swaps = 0
+
+    def __call__(self, row, swapped, column, divisor):
+        if swapped != row:
+            self.swaps += 1
+            self.steps.append(f"Swap R{row + 1} and R{swapped + 1} to bring a non-zero pivot up")
+        pivot = self.matrix[row][column]
+        below = f"R{row + 2}" if row + 2 == len(self.matrix) else f"R{row + 2}..R{len(self.matrix)}"
+        if row + 1 < len(self.matrix):
+            divided = f" / {divisor}" if divisor != 1 else ""
+            self.steps.append(f"Pivot {pivot} in column {column + 1}: Ri = ({pivot}·Ri − ai·R{row + 1}){divided} "
+                              f"for {below} → {format_matrix(self.matrix)}")
+
+def _reduce(rows, columns, steps):
+    """Bareiss on integer rows with its steps; returns (pivots, swaps)"""
+    steps.append("Fraction-free (Bareiss) elimination: each division is exact, so every entry stays an integer")
+    record = _Recorder(rows, steps)
+    pivots = bareiss(rows, columns, record)
+    return pivots, record.swaps
+
+def determinant(rows, steps):
+    """Determinant of a square matrix given as Fraction rows"""
+    n = len(rows)
+    matrix, scales = _integer_rows(rows)
+    if any(scale != 1 for scale in scales):
+        steps.append(f"Scale rows to integers by {', '.join(map(str, scales))}: {format_matrix(matrix)}")
+    pivots, swaps = _reduce(matrix, n, steps)
+    if len(pivots) < n:
+        steps.append(f"Only {len(pivots)} pivots for {n} columns, so the rows are dependent")
+        return Fraction(0)
+    value = Fraction((-1) ** swaps * matrix[n - 1][n - 1], math.prod(scales))
+    sign = f", times (-1)^{swaps} for the row swaps" if swaps else ""
+    scaling = f", divided by the row scales {math.prod(scales)}" if math.prod(scales) != 1 else ""
+    steps.append(f"The last pivot {matrix[n - 1][n - 1]} is the determinant{sign}{scaling}")
+    return value
+
+def inverse(rows, steps):
+    """Inverse of a square matrix given as Fraction rows, by reducing [A | I]"""
+    n = len(rows)
+    matrix, scales = _integer_rows(rows)
+    # Scaling row i of A by s scales row i of the identity alike, so the result is still A⁻¹
+    augmented = [row + [scales[i] if j == i else 0 for j in range(n)] for i, row in enumerate(matrix)]
+    steps.append(f"Augment with the identity: {format_matrix(augmented)}")
+    pivots, _ = _reduce(augmented, n, steps)
+    if len(pivots) < n:
+        raise MatrixError("The matrix is singular (determinant 0), so it has no inverse")
+    columns = [back_substitute([row[:n] + [row[n + k]] for row in augmented], n) for k in range(n)]
+    steps.append("Back-substitute each column of the right half, dividing by the last pivot")
+    return [list(row) for row in zip(*columns)]
+
+def rank(rows, steps):
+    matrix, _ = _integer_rows(rows)
+    pivots, _ = _reduce(matrix, len(matrix[0]), steps)
+    steps.append(f"{len(pivots)} non-zero pivot rows remain")
+    return len(pivots)
+
+def product(left, right, steps):
+    if len(left[0]) != len(right):
+        raise MatrixError(f"A {len(left)}×{len(left[0])} matrix cannot multiply a {len(right)}×{len(right[0])} one")
+    columns = list(zip(*right))
+    steps.append("Entry (i, j) is row i of the first matrix times column j of the second")
+    steps.append(f"(1, 1) = {' + '.join(f'{format_value(a)}·{format_value(b)}' for a, b in zip(left[0], columns[0]))}")
+    return [[sum(a * b for a, b in zip(row, column)) for column in columns] for row in left]
+
+# LAPACK paths for matrices beyond EXACT_LIMIT or with decimal entries that are not worth exact work
+
+def float_determinant(array, steps):
+    steps.append("LU factorization with partial pivoting (LAPACK getrf); the determinant is the signed product of U's diagonal")
+    sign, log = numpy.linalg.slogdet(array)
+    if sign == 0:
+        return 0.0
+    exponent = log / math.log(10)
+    if exponent > 300:
+        # Beyond the float range: written as mantissa × 10^exponent
+        whole = math.floor(exponent)
+        return f"{'-' if sign < 0 else ''}{10 ** (exponent - whole):.10g} × 10^{whole}"
+    return float(sign * math.exp(log))
+
+def float_inverse(array, steps):
+    steps.append("LU factorization with partial pivoting, then solve against the identity (LAPACK gesv)")
+    try:
+        result = numpy.linalg.inv(array)
+    except numpy.linalg.LinAlgError:
+        raise MatrixError("The matrix is singular (determinant 0), so it has no inverse")
+    # 1-norm condition number from the two matrices at hand, without the SVD numpy.linalg.cond runs
+    condition = numpy.linalg.norm(array, 1) * numpy.linalg.norm(result, 1)
+    if condition > 1e12:
+        steps.append(f"Condition number {condition:.3g}: the matrix is nearly singular and the inverse may be inaccurate")
+    return result
+
+def float_rank(array, steps):
+    steps.append("Singular values (LAPACK gesdd); the rank counts those above the rounding tolerance")
+    return int(numpy.linalg.matrix_rank(array))
+
+def float_product(left, right, steps):
+    if left.shape[1] != right.shape[0]:
+        raise MatrixError(f"A {left.shape[0]}×{left.shape[1]} matrix cannot multiply a {right.shape[0]}×{right.shape[1]} one")
+    steps.append("Matrix multiply (BLAS gemm)")
+    return left @ right
+
+def _exact(parsed):
+    return all(len(rows) <= EXACT_LIMIT and len(rows[0]) <= EXACT_LIMIT for rows in parsed)
+
+def solve_matrix(request):
+    """(answer, steps, matrix or None) of a parse_matrix_request request"""
+    operation = request["operation"]
+    parsed = [parse_matrix(text) for text in request["matrices"]]
+    shape = f"{len(parsed[0])}×{len(parsed[0][0])}"
+    if operation in ("determinant", "inverse") and len(parsed[0]) != len(parsed[0][0]):
+        raise MatrixError(f"The {operation} needs a square matrix, not {shape}")
+
+    steps = []
+    exact = _exact(parsed)
+    if exact:
+        matrices = [exact_rows(rows) for rows in parsed]
+        functions = {"determinant": determinant, "inverse": inverse, "rank": rank, "product": product}
+    else:
+        matrices = [float_array(rows) for rows in parsed]
+        functions = {"determinant": float_determinant, "inverse": float_inverse, "rank": float_rank, "product": float_product}
+
+    if operation == "transpose":
+        result = [list(row) for row in zip(*matrices[0])] if exact else matrices[0].T
+        steps.append("Rows become columns")
+    else:
+        result = functions[operation](*matrices, steps)
+
+    if operation in ("determinant", "rank"):
+        answer = result if isinstance(result, str) else format_value(result)
+        return answer, steps, None
+    if not exact:
+        result = result.tolist()
+    entries = len(result) * len(result[0])
+    if entries > MAX_DISPLAY_ENTRIES:
+        answer = f"{len(result)}×{len(result[0])} matrix, first row {format_matrix(result[:1])[1:-1][:200]}..."
+    else:
+        answer = format_matrix(result)
+    return answer, steps, [[_plain(value) for value in row] for row in result]
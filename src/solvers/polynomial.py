@@ -0,0 +1,277 @@
+import math
+from fractions import Fraction
+
+from src.utils.lazy_import import lazy_module
+from .expression import compile_expression, exact_power_fits
+from .linear import format_term, _divide
+
+numpy = lazy_module('numpy')
+
+# Highest degree accepted from user input
+MAX_DEGREE = 64
+# Imaginary parts below this (relative to the root size) count as numeric noise
+IMAGINARY_TOLERANCE = 1e-9
+
+class NotPolynomialError(ValueError):
+    """Raised when an expression is not a polynomial in a single variable"""
+
+def _add(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    return [x + y for x, y in zip(a, b)] + a[len(b):]
+
+def _scale(a, k):
+    return [x * k for x in a]
+
+def _multiply(a, b):
+    if len(a) + len(b) - 2 > MAX_DEGREE:
+        raise NotPolynomialError(f"Degree above {MAX_DEGREE}")
+    product = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                product[i + j] += x * y
+    return product
+
+def _trim(a):
+    while len(a) > 1 and a[-1] == 0:
+        a.pop()
+    return a
+
+class _Collector:
+    """Expands an expression tree into coefficients (lowest degree first) of its one variable"""
+
+    def __init__(self):
+        self.var = None
+
+    def collect(self, tree):
+        kind = tree[0]
+        if kind == 'num':
+            # Decimal literals stay with sympy, which keeps them as floats
+            if not isinstance(tree[1], int):
+                raise NotPolynomialError("Decimal coefficient")
+            return [tree[1]]
+        if kind == 'var':
+            if self.var not in (None, tree[1]):
+                raise NotPolynomialError("More than one variable")
+            self.var = tree[1]
+            return [0, 1]
+        if kind == 'neg':
+            return _scale(self.collect(tree[1]), -1)
+        if kind not in ('+', '-', '*', '/', '^'):
+            raise NotPolynomialError(f"Unsupported term {kind!r}")
+
+        left = _trim(self.collect(tree[1]))
+        right = _trim(self.collect(tree[2]))
+        if kind == '+':
+            return _add(left, right)
+        if kind == '-':
+            return _add(left, _scale(right, -1))
+        if kind == '*':
+            return _multiply(left, right)
+        if len(right) > 1:
+            raise NotPolynomialError("Variable in a divisor or exponent")
+        if kind == '/':
+            if right[0] == 0:
+                raise NotPolynomialError("Division by zero")
+            return [_divide(x, right[0]) for x in left]
+
+        exponent = right[0]
+        if not isinstance(exponent, int) or exponent < 0:
+            raise NotPolynomialError("Exponent is not a whole number")
+        # Coefficients of a power grow about as fast as a power of its largest one
+        if not all(exact_power_fits(c, exponent) for c in left):
+            raise NotPolynomialError("Power too large")
+        if len(left) == 1:
+            return [left[0] ** exponent]
+        if (len(left) - 1) * exponent > MAX_DEGREE:
+            raise NotPolynomialError(f"Degree above {MAX_DEGREE}")
+        result = [1]
+        for _ in range(exponent):
+            result = _multiply(result, left)
+        return result
+
+def polynomial_equation(left, right):
+    """(variable, coefficients highest degree first) of `left - right` for an equation given as text"""
+    collector = _Collector()
+    coefficients = _trim(collector.collect(('-', compile_expression(left), compile_expression(right))))
+    if collector.var is None or len(coefficients) < 2:
+        raise NotPolynomialError("No variable left to solve for")
+    return collector.var, coefficients[::-1]
+
+def format_polynomial(coefficients, var):
+    """Printed form of a polynomial in descending powers: 'x**2 - 4', '-2*x**3 + x/2'"""
+    degree = len(coefficients) - 1
+    parts = []
+    for i, c in enumerate(coefficients):
+        if c == 0:
+            continue
+        power = degree - i
+        if power == 0:
+            parts.append(str(c))
+        else:
+            parts.append(format_term(Fraction(c), var if power == 1 else f"{var}**{power}"))
+    text = parts[0]
+    for part in parts[1:]:
+        text += f" - {part[1:]}" if part.startswith('-') else f" + {part}"
+    return text
+
+def reduce_polynomial(coefficients):
+    """Split off zero roots and scale to primitive integers: (coefficients, multiplicity of the root 0)"""
+    coefficients = list(coefficients)
+    zeros = 0
+    while coefficients[-1] == 0:
+        coefficients.pop()
+        zeros += 1
+    scale = math.lcm(*(Fraction(c).denominator for c in coefficients))
+    integers = [int(c * scale) for c in coefficients]
+    divisor = math.gcd(*integers)
+    if integers[0] < 0:
+        divisor = -divisor
+    return tuple(c // divisor for c in integers), zeros
+
+def companion_roots(polynomials):
+    """Roots of many polynomials, with one stacked companion-matrix eigenvalue solve per degree"""
+    results = [None] * len(polynomials)
+    by_degree = {}
+    for index, coefficients in enumerate(polynomials):
+        by_degree.setdefault(len(coefficients) - 1, []).append(index)
+
+    for degree, indices in by_degree.items():
+        if degree < 1:
+            for index in indices:
+                results[index] = numpy.array([], dtype=complex)
+            continue
+        p = numpy.array([[float(c) for c in polynomials[index]] for index in indices])
+        companion = numpy.zeros((len(indices), degree, degree))
+        companion[:, 0, :] = -p[:, 1:] / p[:, :1]
+        companion[:, numpy.arange(1, degree), numpy.arange(degree - 1)] = 1.0
+        for index, roots in zip(indices, numpy.linalg.eigvals(companion)):
+            results[index] = roots
+    return results
+
+def _evaluate(coefficients, x):
+    value = 0
+    for c in coefficients:
+        value = value * x + c
+    return value
+
+def _deflate(coefficients, root):
+    """Divide by (x - root), which must be an exact root"""
+    quotient = [coefficients[0]]
+    for c in coefficients[1:-1]:
+        quotient.append(c + quotient[-1] * root)
+    return quotient
+
+def _split_square(n):
+    """n = k*k*m with m square-free as far as small factors go: returns (k, m)"""
+    root = math.isqrt(n)
+    if root * root == n:
+        return root, 1
+    k, factor = 1, 2
+    while factor * factor <= n and factor < 10 ** 4:
+        while n % (factor * factor) == 0:
+            n //= factor * factor
+            k *= factor
+        factor += 1
+    root = math.isqrt(n)
+    if root * root == n:
+        return k * root, 1
+    return k, n
+
+def _format_surd(rational, coefficient, radicand, imaginary=False):
+    """rational + coefficient*sqrt(radicand), times I on the second term when imaginary"""
+    unit = f"sqrt({radicand})" if radicand != 1 else ""
+    if imaginary:
+        unit = f"{unit}*I" if unit else "I"
+    term = format_term(Fraction(coefficient), unit)
+    if rational == 0:
+        return term
+    return f"{rational} {'-' if coefficient < 0 else '+'} {term.lstrip('-')}"
+
+def quadratic_roots(a, b, c):
+    """(discriminant, exact root texts) of a*x**2 + b*x + c"""
+    a, b, c = Fraction(a), Fraction(b), Fraction(c)
+    discriminant = b * b - 4 * a * c
+    vertex = -b / (2 * a)
+    if discriminant == 0:
+        return discriminant, [str(vertex)]
+
+    # sqrt(p/q) = sqrt(p*q)/q = k*sqrt(m)/q
+    k, m = _split_square(abs(discriminant.numerator) * discriminant.denominator)
+    spread = Fraction(k, discriminant.denominator) / abs(2 * a)
+    if m == 1 and discriminant > 0:
+        return discriminant, [str(vertex - spread), str(vertex + spread)]
+    imaginary = discriminant < 0
+    return discriminant, [
+        _format_surd(vertex, -spread, m, imaginary),
+        _format_surd(vertex, spread, m, imaginary),
+    ]
+
+def _format_float(value):
+    value = complex(value)
+    real = value.real if abs(value.real) >= 1e-12 else 0.0
+    if abs(value.imag) < 1e-12:
+        return f"{real:.10g}"
+    return f"{real:.10g} {'+' if value.imag >= 0 else '-'} {abs(value.imag):.10g}*I"
+
+def split_rational_roots(coefficients, roots=None):
+    """Divide the rational roots out of a polynomial given highest degree first.
+
+    Returns (sorted distinct rational roots, remaining primitive integer coefficients, numeric
+    roots of the remaining polynomial or None when they were not computed). `roots` may hold
+    precomputed numeric roots of reduce_polynomial(coefficients)[0].
+    """
+    reduced, zeros = reduce_polynomial(coefficients)
+    rational = [Fraction(0)] if zeros else []
+    remaining = list(reduced)
+    if roots is None:
+        roots = companion_roots([reduced])[0]
+    # Numeric roots only suggest candidates; each one is confirmed exactly before it is kept.
+    # By the rational root theorem a root's denominator divides the leading coefficient.
+    for root in roots:
+        candidate = Fraction(float(root.real)).limit_denominator(abs(remaining[0]))
+        while len(remaining) > 1 and _evaluate(remaining, candidate) == 0:
+            remaining = _deflate(remaining, candidate)
+            if candidate not in rational:
+                rational.append(candidate)
+    rational.sort()
+    # Without any rational factor the remaining polynomial is the one already solved
+    return rational, remaining, roots if len(remaining) == len(reduced) else None
+
+def real_roots(numeric):
+    """Sorted real parts of the numeric roots whose imaginary part is only noise"""
+    return sorted(r.real for r in numeric if abs(r.imag) <= IMAGINARY_TOLERANCE * max(1.0, abs(r)))
+
+def solve_polynomial(coefficients, roots=None):
+    """Solve a polynomial given highest degree first.
+
+    Returns a dict with 'roots' as (relation, text) pairs, where relation is '=' for exact
+    roots and '≈' for numeric ones, plus 'discriminant' for quadratics and 'rational' for
+    roots confirmed exactly after numeric root finding. `roots` may hold precomputed
+    numeric roots of reduce_polynomial(coefficients)[0].
+    """
+    degree = len(coefficients) - 1
+    if degree == 1:
+        return {"roots": [("=", str(_divide(-coefficients[1], coefficients[0])))]}
+    if degree == 2:
+        discriminant, texts = quadratic_roots(*coefficients)
+        return {"roots": [("=", text) for text in texts], "discriminant": discriminant}
+
+    rational, remaining, numeric = split_rational_roots(coefficients, roots)
+    result = {"rational": rational}
+    found = [("=", str(r)) for r in rational]
+    if len(remaining) == 3:
+        found += [("=", text) for text in quadratic_roots(*remaining)[1]]
+    elif len(remaining) == 2:
+        found.append(("=", str(_divide(-remaining[1], remaining[0]))))
+    elif len(remaining) > 3:
+        if numeric is None:
+            numeric = numpy.roots([float(c) for c in remaining])
+        real = real_roots(numeric)
+        complex_ = sorted((r for r in numeric if abs(r.imag) > IMAGINARY_TOLERANCE * max(1.0, abs(r))),
+                          key=lambda r: (r.real, r.imag))
+        found += [("≈", _format_float(r)) for r in real + complex_]
+        result["approximate"] = True
+    result["roots"] = found
+    return result
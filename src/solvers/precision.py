@@ -0,0 +1,138 @@
+from decimal import Context, Decimal, localcontext, MAX_EMAX, MIN_EMIN
+from fractions import Fraction
+from functools import lru_cache
+
+from src.utils.lazy_import import lazy_module
+from .expression import ExpressionError, _exact, _power, compile_expression, exact_power_fits, exact_sqrt
+
+mpmath = lazy_module('mpmath')
+
+# Precision tiers: FLOAT evaluates irrational parts in machine floats and is the default. A whole
+# number of digits keeps rationals exact and evaluates the rest with mpmath at that many digits
+FLOAT = 'float'
+MAX_DIGITS = 10000
+# Extra digits carried through intermediate steps so the requested ones come out right
+GUARD_DIGITS = 10
+
+# mpmath names of the parser's FUNCTIONS and CONSTANTS
+_MPMATH_FUNCTIONS = {'sqrt': 'sqrt', 'sin': 'sin', 'cos': 'cos', 'tan': 'tan', 'log': 'log10', 'ln': 'log', 'exp': 'exp'}
+_MPMATH_CONSTANTS = {'pi': 'pi'}
+
+def parse_precision(value):
+    """FLOAT for None or 'float', else a number of digits from 1 to MAX_DIGITS"""
+    if value is None or value == FLOAT:
+        return FLOAT
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= MAX_DIGITS:
+        raise ValueError(f"Precision must be '{FLOAT}' or a number of digits from 1 to {MAX_DIGITS}")
+    return value
+
+@lru_cache(maxsize=32)
+def _context(digits):
+    # A context of its own, so the global mpmath precision is never touched
+    context = mpmath.MPContext()
+    context.dps = digits + GUARD_DIGITS
+    return context
+
+def _to_mpf(context, value):
+    if isinstance(value, Fraction):
+        return context.mpf(value.numerator) / value.denominator
+    return context.mpf(value)
+
+def _real(context, value, message):
+    if not isinstance(value, context.mpf) or not context.isfinite(value):
+        raise ExpressionError(message)
+    return value
+
+def _call(name, argument, digits):
+    if name == 'abs':
+        return abs(argument)
+    if name == 'sqrt' and _exact(argument) and argument >= 0:
+        root = exact_sqrt(argument)
+        if root is not None:
+            return root
+    context = _context(digits)
+    try:
+        result = getattr(context, _MPMATH_FUNCTIONS[name])(_to_mpf(context, argument))
+    except (ValueError, ZeroDivisionError):
+        raise ExpressionError(f"{name} is undefined for {argument}")
+    return _real(context, result, f"{name} is undefined for {argument}")
+
+def _precise_power(base, exponent, digits):
+    if (_exact(base) and _exact(exponent) and Fraction(exponent).denominator == 1
+            and exact_power_fits(base, int(exponent))):
+        return _power(base, exponent)
+    if _exact(base) and base >= 0 and isinstance(exponent, Fraction) and exponent.denominator == 2:
+        # A perfect square to a half power stays exact: 4^1.5 = 8
+        root = exact_sqrt(base)
+        if root is not None and exact_power_fits(root, exponent.numerator):
+            return _power(root, exponent.numerator)
+    context = _context(digits)
+    try:
+        result = _to_mpf(context, base) ** _to_mpf(context, exponent)
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero")
+    return _real(context, result, "Result is not a real number")
+
+def evaluate_precise(tree, digits, variables=None):
+    """Evaluate an expression tree keeping rationals exact (int/Fraction); anything irrational is
+    an mpmath number good to `digits` significant digits"""
+    kind = tree[0]
+    if kind == 'num':
+        return tree[1]
+    if kind == 'var':
+        if variables is None or tree[1] not in variables:
+            raise ExpressionError(f"Unknown variable {tree[1]!r}")
+        return variables[tree[1]]
+    if kind == 'const':
+        return +getattr(_context(digits), _MPMATH_CONSTANTS[tree[1]])
+    if kind == 'neg':
+        return -evaluate_precise(tree[1], digits, variables)
+    if kind == 'call':
+        return _call(tree[1], evaluate_precise(tree[2], digits, variables), digits)
+
+    left = evaluate_precise(tree[1], digits, variables)
+    right = evaluate_precise(tree[2], digits, variables)
+    if kind == '^':
+        return _precise_power(left, right, digits)
+    if not (_exact(left) and _exact(right)):
+        context = _context(digits)
+        left, right = _to_mpf(context, left), _to_mpf(context, right)
+    if kind == '+':
+        return left + right
+    if kind == '-':
+        return left - right
+    if kind == '*':
+        return left * right
+    if right == 0:
+        raise ExpressionError("Division by zero")
+    return Fraction(left) / right if _exact(left) else left / right
+
+def precise_expression(text, digits, variables=None):
+    """Compile and evaluate text at `digits` digits, returning an int when the result is whole"""
+    result = evaluate_precise(compile_expression(text), digits, variables)
+    if isinstance(result, Fraction) and result.denominator == 1:
+        return result.numerator
+    return result
+
+def decimal_text(value, digits):
+    """A rational as a decimal: exact when it terminates within `digits` significant digits,
+    else rounded to that many"""
+    with localcontext(Context(prec=digits, Emax=MAX_EMAX, Emin=MIN_EMIN)):
+        return str(Decimal(value.numerator) / Decimal(value.denominator))
+
+def format_precise(result, digits):
+    """Answer fields of a precise result: whole numbers as int, other rationals as decimal text
+    with their exact fraction, irrational numbers as text with `digits` significant digits"""
+    if isinstance(result, int):
+        return {"decimal": result}
+    if isinstance(result, Fraction):
+        if result.denominator == 1:
+            return {"decimal": result.numerator}
+        return {
+            "decimal": decimal_text(result, digits),
+            "fraction": f"{result.numerator}/{result.denominator}",
+            "display": f"<sup>{result.numerator}</sup>⁄<sub>{result.denominator}</sub>"
+        }
+    return {"decimal": _context(digits).nstr(result, digits)}
@@ -0,0 +1,305 @@
+import math
+import mmap
+import re
+import warnings
+from array import array
+
+from src.utils.lazy_import import lazy_module
+
+numpy = lazy_module('numpy')
+
+# Bytes of a file parsed at a time, so memory stays bounded whatever the file size
+CHUNK_BYTES = 4 * 1024 * 1024
+
+# Every byte that may separate numbers in pasted lists and CSV or text files becomes a space
+_SEPARATORS = b',;:|\t\r\n"\'()[]{}'
+_SEPARATOR_TABLE = bytes.maketrans(_SEPARATORS, b' ' * len(_SEPARATORS))
+_SEPARATOR_BYTES = {bytes([byte]) for byte in _SEPARATORS + b' '}
+_NUMBER_RE = re.compile(rb'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+# Measure asked for -> name used in results; "90th percentile" is read separately
+MEASURES = {
+    'mean': 'mean', 'average': 'mean', 'median': 'median', 'mode': 'mode',
+    'variance': 'variance', 'standard deviation': 'std', 'std': 'std', 'range': 'range',
+    'quartiles': 'quartiles', 'summary': 'summary', 'statistics': 'summary', 'stats': 'summary',
+}
+SUMMARY = ('count', 'mean', 'std', 'min', 'median', 'max')
+# Measures that need the values kept; the rest come from the running moments alone
+ORDER_MEASURES = {'median', 'percentile', 'quartiles', 'mode', 'summary'}
+_MEASURE_RE = re.compile(r'\b(?:(?P<percentile>\d+(?:\.\d+)?)(?:st|nd|rd|th)?\s+percentile'
+                         r'|(?P<kind>sample|population)\s+(?:variance|standard\s+deviation|std)'
+                         r'|standard\s+deviation|' + '|'.join(name for name in MEASURES if ' ' not in name) + r')\b')
+_DATA_START_RE = re.compile(r'[-+.]?\d(?!\d*(?:\.\d+)?(?:st|nd|rd|th)?\s+percentile)')
+# What may follow the measures: numbers, separators and a few connecting words
+_DATA_RE = re.compile(r'(?:\s|[,;:|()\[\]{}]|and|of|the|numbers?|values?|data|set|is|are|for|in'
+                      r'|[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)*')
+
+class StreamingStats:
+    """Count, mean, variance, min and max of a stream of number chunks in one pass.
+
+    Each chunk is reduced with numpy and merged with Welford's update in its parallel form
+    (Chan et al.), so the running moments stay accurate without a second pass. The moments are
+    kept in units of the largest magnitude seen, so values near the float limit are never squared
+    directly. With keep=True the values are also kept, 8 bytes each, in an array('d') for median
+    and percentiles.
+    """
+
+    def __init__(self, keep=True):
+        self.count = 0
+        self.scale = 0.0
+        self.scaled_mean = 0.0
+        self.scaled_m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.values = array('d') if keep else None
+
+    def update(self, chunk):
+        """Add a float64 numpy array of values"""
+        size = len(chunk)
+        if not size:
+            return
+        low, high = float(chunk.min()), float(chunk.max())
+        scale = max(self.scale, abs(low), abs(high))
+        if scale > self.scale:
+            ratio = self.scale / scale
+            self.scaled_mean *= ratio
+            self.scaled_m2 *= ratio * ratio
+            self.scale = scale
+        deviations = chunk / (scale or 1.0)
+        chunk_mean = float(deviations.mean())
+        deviations -= chunk_mean
+        chunk_m2 = float(numpy.dot(deviations, deviations))
+        total = self.count + size
+        delta = chunk_mean - self.scaled_mean
+        self.scaled_mean += delta * size / total
+        self.scaled_m2 += chunk_m2 + delta * delta * self.count * size / total
+        self.count = total
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        if self.values is not None:
+            self.values.frombytes(memoryview(numpy.ascontiguousarray(chunk, dtype=float)).cast('B'))
+
+    @property
+    def mean(self):
+        return self.scaled_mean * self.scale
+
+    @property
+    def m2(self):
+        """Sum of squared deviations; inf when it is past the float range"""
+        return self.scaled_m2 * self.scale * self.scale
+
+    def _scaled_variance(self, sample):
+        if self.count < (2 if sample else 1):
+            return None
+        return self.scaled_m2 / (self.count - 1 if sample else self.count)
+
+    def variance(self, sample=False):
+        variance = self._scaled_variance(sample)
+        return None if variance is None else variance * self.scale * self.scale
+
+    def std(self, sample=False):
+        # Taken before scaling back, so it stays finite when the variance does not
+        variance = self._scaled_variance(sample)
+        return None if variance is None else variance ** 0.5 * self.scale
+
+def parse_numbers(data):
+    """Every number in text or bytes as a float64 numpy array; non-finite values are dropped"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    data = data.translate(_SEPARATOR_TABLE)
+    if not data or data.isspace():
+        return numpy.empty(0)
+    try:
+        # Plain number lists parse in C without a Python object per value
+        with warnings.catch_warnings():
+            # numpy < 2 only warns when it stops at text that is not a number
+            warnings.simplefilter('error', DeprecationWarning)
+            values = numpy.fromstring(data, dtype=float, sep=' ')
+    except (ValueError, DeprecationWarning):
+        # Headers and words: pick the numbers out of the text
+        values = numpy.array(_NUMBER_RE.findall(data), dtype=float)
+    return values[numpy.isfinite(values)]
+
+def _spans(buffer, size):
+    """(start, stop) of pieces of about `size` bytes that never split a number"""
+    start = 0
+    end = len(buffer)
+    while start < end:
+        stop = min(start + size, end)
+        # Extend to the next separator so a number is never cut in two
+        while stop < end and buffer[stop:stop + 1] not in _SEPARATOR_BYTES:
+            stop += 1
+        yield start, stop
+        start = stop
+
+def stream_file(path, keep=True, chunk_size=CHUNK_BYTES):
+    """StreamingStats of every number in a CSV or text file, read through a memory map"""
+    stats = StreamingStats(keep)
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return stats
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # madvise is missing on Windows, where the mapping is left to the OS
+            release = hasattr(mmap, 'MADV_DONTNEED')
+            if release:
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            released = 0
+            for start, stop in _spans(mapped, chunk_size):
+                stats.update(parse_numbers(mapped[start:stop]))
+                # Parsed pages leave the resident set, so a large file costs no more than a chunk
+                done = stop - stop % mmap.PAGESIZE
+                if release and done > released:
+                    mapped.madvise(mmap.MADV_DONTNEED, released, done - released)
+                    released = done
+    return stats
+
+def stream_text(text, keep=True):
+    """StreamingStats of every number in text"""
+    stats = StreamingStats(keep)
+    stats.update(parse_numbers(text))
+    return stats
+
+def percentiles(stats, points):
+    """Percentiles (0-100) of the kept values by selection, interpolating like numpy's 'linear'.
+
+    numpy.partition places the needed order statistics in O(n) instead of sorting, and works in
+    place, so the kept values are reordered.
+    """
+    if not stats.count:
+        return [None for _ in points]
+    values = numpy.frombuffer(stats.values, dtype=float)
+    positions = [point / 100 * (stats.count - 1) for point in points]
+    ranks = sorted({int(position) for position in positions} |
+                   {min(int(position) + 1, stats.count - 1) for position in positions})
+    values.partition(ranks)
+    result = []
+    for position in positions:
+        low = int(position)
+        high = min(low + 1, stats.count - 1)
+        fraction = position - low
+        below, above = float(values[low]), float(values[high])
+        value = below + (above - below) * fraction
+        if not math.isfinite(value):
+            # The gap between neighbours near the float limit overflows; weighting each does not
+            value = below * (1 - fraction) + above * fraction
+        result.append(value)
+    return result
+
+def modes(stats):
+    """Most frequent values and how often they occur; this one needs a sort of the values"""
+    values, counts = numpy.unique(numpy.frombuffer(stats.values, dtype=float), return_counts=True)
+    top = int(counts.max())
+    return [float(value) for value in values[counts == top]], top
+
+def _measure(match):
+    if match.group('percentile'):
+        point = float(match.group('percentile'))
+        if point > 100:
+            raise ValueError(f"Percentiles run from 0 to 100, not {match.group('percentile')}")
+        return ('percentile', point)
+    if match.group('kind'):
+        return ('variance' if 'variance' in match.group() else 'std', match.group('kind') == 'sample')
+    return (MEASURES[' '.join(match.group().split())], False)
+
+def parse_measures(text):
+    """Measures named in text ("median and 90th percentile") as (name, option) pairs, the form describe takes;
+    ValueError for a percentile outside 0-100"""
+    return [_measure(match) for match in _MEASURE_RE.finditer(text.lower())]
+
+def parse_statistics(text):
+    """The measures a request asks for and the text holding its numbers, or None; ValueError for a
+    percentile outside 0-100"""
+    matches = list(_MEASURE_RE.finditer(text.lower(), 0, _measure_end(text)))
+    if not matches:
+        return None
+    data = text[matches[-1].end():]
+    # A single value is data too: "mean of 5" is 5, and its sample variance is undefined
+    if _DATA_RE.fullmatch(data.lower()) is None or _NUMBER_RE.search(data.encode('utf-8')) is None:
+        return None
+    return {"measures": [_measure(match) for match in matches], "data": data}
+
+def _measure_end(text):
+    # Measures are named before the first number that is not a percentile; the rest is data
+    digit = _DATA_START_RE.search(text)
+    return digit.start() if digit else len(text)
+
+def find_statistics(text):
+    """The statistics request inside a message ("what is the mean of 1, 2, 3?" -> "mean of 1, 2, 3"), or None"""
+    match = _MEASURE_RE.search(text.lower(), 0, _measure_end(text))
+    if match is None:
+        return None
+    request = text[match.start():].strip().rstrip('?.!').strip()
+    try:
+        return request if parse_statistics(request) is not None else None
+    except ValueError:
+        # Still a statistics request; solving it reports the bad percentile
+        return request
+
+def needs_values(measures):
+    """Whether the measures need every value kept rather than only the running moments"""
+    return any(name in ORDER_MEASURES for name, _ in measures)
+
+def _number(value):
+    if value is None:
+        return "undefined"
+    if not math.isfinite(value):
+        return "too large to represent"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return f"{value:.10g}"
+
+def describe(stats, measures):
+    """(answer, steps, values) for the measures of parse_statistics over a StreamingStats"""
+    if not stats.count:
+        raise ValueError("No numbers to summarize")
+    if any(name == 'summary' for name, _ in measures):
+        measures = [(name, False) for name in SUMMARY]
+
+    points = {'median': [50], 'quartiles': [25, 50, 75]}
+    wanted = sorted({point for name, option in measures
+                     for point in (points.get(name) or ([option] if name == 'percentile' else []))})
+    selected = dict(zip(wanted, percentiles(stats, wanted))) if wanted else {}
+
+    steps = [f"Read {stats.count} values",
+             f"One pass (Welford): mean = {_number(stats.mean)}, sum of squared deviations = {_number(stats.m2)}"]
+    if wanted:
+        named = ', '.join(f"{_number(point)}th" for point in wanted)
+        steps.append(f"Found the {named} percentile{'s' if len(wanted) > 1 else ''} by selection, without sorting")
+    answers = []
+    values = {}
+    for name, option in measures:
+        if name == 'count':
+            label, value = "Count", stats.count
+        elif name == 'mean':
+            label, value = "Mean", stats.mean
+        elif name == 'median':
+            label, value = "Median", selected[50]
+        elif name == 'variance':
+            label, value = f"{'Sample' if option else 'Population'} variance", stats.variance(option)
+        elif name == 'std':
+            label, value = f"{'Sample' if option else 'Population'} standard deviation", stats.std(option)
+        elif name == 'min':
+            label, value = "Minimum", stats.minimum
+        elif name == 'max':
+            label, value = "Maximum", stats.maximum
+        elif name == 'range':
+            label, value = "Range", stats.maximum - stats.minimum
+        elif name == 'percentile':
+            label, value = f"{_number(option)}th percentile", selected[option]
+        elif name == 'quartiles':
+            for point, label in ((25, "Q1"), (50, "Q2"), (75, "Q3")):
+                values[label] = selected[point]
+                answers.append(f"{label} = {_number(selected[point])}")
+            continue
+        else:
+            found, count = modes(stats)
+            label = "Mode"
+            value = found if count > 1 else None
+            values[label] = value
+            answers.append(f"Mode = {', '.join(map(_number, found))} ({count} times)" if count > 1 else "Mode = none (no value repeats)")
+            continue
+        if label not in values:
+            # A variance or range past the float range has no JSON value
+            values[label] = value if value is None or math.isfinite(value) else None
+            answers.append(f"{label} = {_number(value)}")
+    return ", ".join(answers), steps, values
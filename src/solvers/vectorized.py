@@ -0,0 +1,91 @@
+from functools import lru_cache
+
+from src.utils.lazy_import import lazy_module
+from .expression import ExpressionError, compile_expression, evaluate, free_variables
+
+numpy = lazy_module('numpy')
+
+# Expression functions and operators as NumPy ufuncs (names match expression.FUNCTIONS)
+UFUNCS = {
+    'sqrt': 'sqrt',
+    'sin': 'sin',
+    'cos': 'cos',
+    'tan': 'tan',
+    'log': 'log10',
+    'ln': 'log',
+    'exp': 'exp',
+    'abs': 'absolute',
+}
+OPERATORS = {
+    '+': 'add',
+    '-': 'subtract',
+    '*': 'multiply',
+    '/': 'true_divide',
+    '^': 'power',
+}
+
+# Whole exponents up to this are computed by repeated multiplication, which is far faster than pow
+MAX_MULTIPLY_EXPONENT = 16
+
+def _integer_power(base, exponent):
+    def power(values):
+        x = base(values)
+        result = None
+        n = abs(exponent)
+        # Square-and-multiply
+        while n:
+            if n & 1:
+                result = x if result is None else numpy.multiply(result, x)
+            n >>= 1
+            if n:
+                x = numpy.multiply(x, x)
+        return numpy.reciprocal(result) if exponent < 0 else result
+    return power
+
+def _build(tree, var):
+    """Closure computing tree over an array of values of var"""
+    if var not in free_variables(tree):
+        # Fold constant subtrees once, exactly
+        value = float(evaluate(tree))
+        return lambda values: value
+
+    kind = tree[0]
+    if kind == 'var':
+        if tree[1] != var:
+            raise ExpressionError(f"Unknown variable {tree[1]!r}")
+        return lambda values: values
+    if kind == 'neg':
+        operand = _build(tree[1], var)
+        return lambda values: numpy.negative(operand(values))
+    if kind == 'call':
+        ufunc = getattr(numpy, UFUNCS[tree[1]])
+        argument = _build(tree[2], var)
+        return lambda values: ufunc(argument(values))
+
+    if kind == '^' and var not in free_variables(tree[2]):
+        exponent = evaluate(tree[2])
+        if exponent == int(exponent) and 0 < abs(exponent) <= MAX_MULTIPLY_EXPONENT:
+            return _integer_power(_build(tree[1], var), int(exponent))
+
+    ufunc = getattr(numpy, OPERATORS[kind])
+    left = _build(tree[1], var)
+    right = _build(tree[2], var)
+    return lambda values: ufunc(left(values), right(values))
+
+@lru_cache(maxsize=256)
+def compile_vectorized(text, var='x'):
+    """Compile text once into f(array) -> array of float results, one ufunc call per operation.
+
+    Points where the expression is undefined (division by zero, sqrt of a negative) come
+    out as nan or inf rather than raising.
+    """
+    function = _build(compile_expression(text), var)
+
+    def evaluate_array(values):
+        values = numpy.asarray(values, dtype=float)
+        with numpy.errstate(all='ignore'):
+            result = function(values)
+        # Constant expressions still give one result per point
+        return numpy.broadcast_to(numpy.asarray(result, dtype=float), values.shape).copy()
+
+    return evaluate_array
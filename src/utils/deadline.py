@@ -0,0 +1,70 @@
+import os
+
+# Outcome counters for deadline-bounded calls made by this process
+DEADLINE_STATS = {
+    "calls": 0,
+    "timeouts": 0,
+    "fallbacks": 0,
+}
+
+class DeadlineExceeded(Exception):
+    """Raised when a bounded call is still running at its deadline"""
+
+def _run_child(conn, func, args):
+    try:
+        conn.send((True, func(*args)))
+    except Exception as e:
+        try:
+            conn.send((False, e))
+        except Exception:
+            # Unpicklable exception: send its message instead
+            conn.send((False, RuntimeError(str(e))))
+    finally:
+        conn.close()
+
+def run_with_deadline(func, args=(), timeout=None):
+    """Run func(*args) in a forked child that is killed if it is still busy after `timeout` seconds"""
+    if timeout is None or not hasattr(os, 'fork'):
+        return func(*args)
+
+    # Imported here: multiprocessing costs several milliseconds that unbounded calls never need
+    import multiprocessing
+
+    DEADLINE_STATS["calls"] += 1
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_child, args=(sender, func, args))
+    try:
+        process.start()
+    except AssertionError:
+        # Daemonic processes (e.g. some executor workers) may not fork children
+        receiver.close()
+        sender.close()
+        return func(*args)
+    sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            process.kill()
+            DEADLINE_STATS["timeouts"] += 1
+            raise DeadlineExceeded(f"Still running after {timeout}s")
+        ok, value = receiver.recv()
+    except EOFError:
+        raise RuntimeError("Solver process exited without a result")
+    finally:
+        receiver.close()
+        process.join()
+
+    if not ok:
+        raise value
+    return value
+
+def record_fallback():
+    """Count an answer produced by the numeric fallback after a timeout"""
+    DEADLINE_STATS["fallbacks"] += 1
+
+def deadline_stats():
+    """Snapshot of the counters plus the share of bounded calls that fell back"""
+    stats = dict(DEADLINE_STATS)
+    stats["fallback_rate"] = stats["fallbacks"] / stats["calls"] if stats["calls"] else 0.0
+    return stats
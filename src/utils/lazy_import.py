@@ -0,0 +1,41 @@
+import importlib
+
+class LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+class LazyComponent:
+    """Class attribute that imports and builds a helper the first time an instance uses it"""
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        component_class = getattr(importlib.import_module(self.module), self.class_name)
+        value = component_class()
+        # Cache on the instance so later lookups bypass the descriptor entirely
+        instance.__dict__[self.name] = value
+        return value
+
+def lazy_module(name):
+    """Return a proxy for `name` that defers the import until it is used"""
+    return LazyModule(name)
@@ -0,0 +1,109 @@
+import re
+
+# Standard symbol -> the variants users paste in for it
+MATH_SYMBOLS = {
+    'x': ['x', '𝑥', '𝓍', '𝔵', 'χ'],
+    'y': ['y', '𝑦', '𝓎', '𝔶', 'γ'],
+    'z': ['z', '𝑧', '𝓏', '𝔷', 'ζ'],
+    '+': ['+', '＋', '➕', '∑'],
+    '-': ['-', '−', '－', '➖'],
+    '*': ['*', '×', '⋅', '∗', '⨯'],
+    '/': ['/', '÷', '∕', '⁄'],
+    '=': ['=', '＝', '≡', '≈', '≋'],
+    '^': ['^', '⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹'],
+    '<=': ['≤', '⩽'],
+    '>=': ['≥', '⩾'],
+}
+
+# clean_equation: quotes removed, operators normalized
+EQUATION_CLEANUP = {
+    '"': '',
+    '‛': '',
+    **dict.fromkeys('×⋅∗⨯', '*'),
+    **dict.fromkeys('÷∕⁄', '/'),
+    **dict.fromkeys('−–—', '-'),
+    **dict.fromkeys('＝≡≈≋', '='),
+}
+
+# normalize_characters: special mathematical characters to standard ASCII
+SPECIAL_CHARACTERS = {
+    '−': '-',  # U+2212 minus sign
+    '–': '-',  # en dash
+    '—': '-',  # em dash
+    '⁃': '-',  # hyphen bullet
+    '‐': '-',  # hyphen
+    '⁄': '/',  # fraction slash
+    '∕': '/',  # division slash
+    '÷': '/',  # division sign
+    '×': '*',  # multiplication sign
+    '⋅': '*',  # dot operator
+    '∗': '*',  # asterisk operator
+    '·': '*',  # middle dot
+    '⨯': '*',  # vector multiplication
+    '∙': '*',  # bullet operator
+    '⁺': '+',  # superscript plus
+    '⁻': '-',  # superscript minus
+}
+
+def collapse_whitespace(text):
+    """Every whitespace run as one space, exactly like re.sub(r'\s+', ' ', text)"""
+    words = text.split()
+    if not words:
+        return ' ' if text else ''
+    # split() drops whitespace at the ends too, which the regex keeps as one space
+    lead = ' ' if text[0].isspace() else ''
+    trail = ' ' if text[-1].isspace() else ''
+    return lead + ' '.join(words) + trail
+
+class Substitution:
+    """Replace every variant at once: code points through a translate table, longer variants
+    through one compiled alternation that prefers the longest match"""
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        single = {v: r for v, r in self.mapping.items() if len(v) == 1 and v != r}
+        self.table = str.maketrans(single)
+        self.ascii_table = str.maketrans({v: r for v, r in single.items() if v.isascii()})
+        # str.translate is only fast on ASCII text; elsewhere CPython looks up every character,
+        # which is slower than one str.replace scan per variant. Replacing in sequence gives
+        # the same result as long as no replacement contains a variant.
+        self.replacements = list(single.items())
+        self.sequential = not any(v in r for v in single for r in single.values())
+        self.multi = {v: r for v, r in self.mapping.items() if len(v) > 1 and v != r}
+        self.pattern = None
+        if self.multi:
+            variants = sorted(self.multi, key=len, reverse=True)
+            self.pattern = re.compile('|'.join(re.escape(v) for v in variants))
+
+    def __call__(self, text):
+        if self.pattern is not None:
+            text = self.pattern.sub(lambda match: self.multi[match.group()], text)
+        if text.isascii():
+            return text.translate(self.ascii_table)
+        if self.sequential:
+            for variant, replacement in self.replacements:
+                text = text.replace(variant, replacement)
+            return text
+        return text.translate(self.table)
+
+    def then(self, other):
+        """One substitution equivalent to applying self and then other"""
+        composed = {v: other(r) for v, r in self.mapping.items()}
+        for v, r in other.mapping.items():
+            composed.setdefault(v, r)
+        return Substitution(composed)
+
+# Built once at import
+normalize_symbols = Substitution({v: standard for standard, variants in MATH_SYMBOLS.items() for v in variants})
+_clean = Substitution(EQUATION_CLEANUP)
+normalize_characters = Substitution(SPECIAL_CHARACTERS)
+# Neither table produces or consumes whitespace, so collapsing it can move after both
+_clean_then_characters = _clean.then(normalize_characters)
+
+def clean_equation(eq):
+    """Clean equation string of unwanted characters and normalize format"""
+    return collapse_whitespace(_clean(eq.strip()))
+
+def normalize_equation(eq):
+    """normalize_characters(clean_equation(eq)) in a single translate pass"""
+    return collapse_whitespace(_clean_then_characters(eq.strip()))
@@ -1,12 +1,12 @@
 import sys
 import subprocess
+from importlib.util import find_spec
 
 def check_requirements():
     """Simple check for basic requirements"""
-    try:
-        import sympy
-        import numpy
-        return True
-    except ImportError as e:
-        print(f"Warning: Missing basic requirement - {str(e)}")
-        return False
+    # find_spec locates the packages without paying for importing them
+    for name in ('sympy', 'numpy'):
+        if find_spec(name) is None:
+            print(f"Warning: Missing basic requirement - No module named '{name}'")
+            return False
+    return True
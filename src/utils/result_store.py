@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+from src.utils.lazy_import import lazy_module
+
+sqlite3 = lazy_module('sqlite3')
+
+# Writes between eviction passes
+EVICT_EVERY = 256
+# Hits whose last_used times are held back and then written in one transaction, so reads do not
+# take the WAL write lock one by one
+TOUCH_EVERY = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    problem TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+def problem_key(canonical):
+    """Fixed-length store key for a canonical problem string"""
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+class ResultStore:
+    """Disk-backed solve results shared by every worker process (SQLite in WAL mode)"""
+
+    def __init__(self, path, version, max_entries=100000):
+        self.path = path
+        self.version = str(version)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self._conn = None
+        self._pid = None
+        # key -> last hit time not yet written; eviction order lags by at most TOUCH_EVERY hits
+        self._touched = {}
+        # Connections inherited across fork(); closing them could disturb the parent's locks
+        self._inherited = []
+
+    def _connection(self):
+        # Connections must not cross fork(), so each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            if self._conn is not None:
+                self._inherited.append(self._conn)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _failed(self, action, error):
+        self.errors += 1
+        if self.errors == 1:
+            print(f"Result store {action} failed, continuing without it: {error}", file=sys.stderr)
+
+    def get(self, key):
+        """Return (problem, result) stored for key under the current version, or None"""
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT problem, result FROM results WHERE key = ? AND version = ?",
+                (key, self.version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(key)
+            return row[0], json.loads(row[1])
+        except sqlite3.Error as e:
+            self._failed("read", e)
+            return None
+
+    def _touch(self, key):
+        self._touched[key] = time.time()
+        if self.hits % TOUCH_EVERY == 0:
+            try:
+                self._flush_touched()
+            except sqlite3.Error as e:
+                self._failed("write", e)
+
+    def _flush_touched(self):
+        """Write the held-back last_used times of recent hits in a single transaction"""
+        touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                             [(used, key) for key, used in touched.items()])
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def put(self, key, problem, result):
+        try:
+            now = time.time()
+            self._connection().execute(
+                "INSERT OR REPLACE INTO results (key, version, problem, result, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.version, problem, json.dumps(result, ensure_ascii=False), now, now)
+            )
+            self.writes += 1
+            if self.writes % EVICT_EVERY == 0:
+                self.evict()
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def evict(self):
+        """Drop entries from older solver versions, then the least recently used beyond max_entries"""
+        self._flush_touched()
+        conn = self._connection()
+        conn.execute("DELETE FROM results WHERE version != ?", (self.version,))
+        conn.execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM results ORDER BY last_used ASC "
+            "LIMIT max(0, (SELECT COUNT(*) FROM results) - ?))",
+            (self.max_entries,)
+        )
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            try:
+                self._flush_touched()
+            except sqlite3.Error as e:
+                self._failed("write", e)
+            self._conn.close()
+        self._conn = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,8 +1,10 @@
+import sys
+
 try:
     import wikipedia
     # print("wikipedia module imported successfully")
 except ImportError as e:
-    print(f"ImportError: {e}")
+    print(f"ImportError: {e}", file=sys.stderr)
     wikipedia = None
 
 import re
@@ -0,0 +1,145 @@
+import re
+
+# Words that stand for an operator or relation -> the symbol they are rewritten to
+PHRASES = {
+    'plus': '+',
+    'added to': '+',
+    'minus': '-',
+    'take away': '-',
+    'negative': '-',
+    'times': '*',
+    'multiplied by': '*',
+    'divided by': '/',
+    'over': '/',
+    'to the power of': '^',
+    'raised to the power of': '^',
+    'raised to': '^',
+    'squared': '^2',
+    'cubed': '^3',
+    'square root of': 'sqrt',
+    'the square root of': 'sqrt',
+}
+# Relations; each may also follow "is" ("is greater than")
+RELATIONS = {
+    'equals': '=',
+    'equal to': '=',
+    'greater than or equal to': '>=',
+    'less than or equal to': '<=',
+    'greater than': '>',
+    'less than': '<',
+    'at least': '>=',
+    'at most': '<=',
+}
+# Words that only frame the question and are dropped
+FILLER = ['solve', 'calculate', 'what is', "what's", 'evaluate', 'compute']
+# "sum of A and B" -> "(A + B)": phrase -> (operator, word that separates the operands)
+TEMPLATES = {
+    'sum of': ('+', 'and'),
+    'difference of': ('-', 'and'),
+    'difference between': ('-', 'and'),
+    'product of': ('*', 'and'),
+    'quotient of': ('/', 'and'),
+    'divide': ('/', 'by'),
+    'multiply': ('*', 'by'),
+}
+# Characters that end every open template, like a relation does
+BOUNDARIES = ',;?!=<>\n'
+
+def _trie_pattern(phrases):
+    """Regex of a phrase trie: shared prefixes are matched once and the longest phrase is tried first"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    def build(node):
+        # Any run of whitespace may separate the words of a phrase
+        branches = [(r'\s+' if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items(), key=lambda item: item[0] or '') if char is not None]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if None in node else body
+
+    return build(trie)
+
+class WordTranslator:
+    """Rewrite operator words as symbols in one left-to-right pass: every phrase is compiled into
+    one automaton that prefers the longest match, so "divided by" is never read as "divide" """
+
+    def __init__(self, phrases, relations, filler, templates):
+        relations = {**relations, **{f"is {phrase}": symbol for phrase, symbol in relations.items()}}
+        templates = {**templates, **{f"the {phrase}": template for phrase, template in templates.items()}}
+        # phrase -> (kind, value), with kind one of 'replace', 'relation', 'template', 'separator'
+        self.phrases = {}
+        self.phrases.update({phrase: ('replace', symbol) for phrase, symbol in phrases.items()})
+        self.phrases.update({phrase: ('replace', '') for phrase in filler})
+        self.phrases.update({phrase: ('relation', symbol) for phrase, symbol in relations.items()})
+        self.phrases.update({phrase: ('template', template) for phrase, template in templates.items()})
+        self.phrases.update({separator: ('separator', separator) for _, separator in templates.values()})
+
+        words = rf"\b{_trie_pattern(self.phrases)}\b"
+        # Text without any phrase is returned as is after this one scan
+        self.prefilter = re.compile(words)
+        self.pattern = re.compile(rf"{words}|[{re.escape(BOUNDARIES)}]")
+        # Lowering non-ASCII text can change its length, so it is matched without lowering
+        self.pattern_ignorecase = re.compile(self.pattern.pattern, re.IGNORECASE)
+
+    def __call__(self, text):
+        if text.isascii():
+            lowered = text.lower()
+            if self.prefilter.search(lowered) is None:
+                return text
+            matches = self.pattern.finditer(lowered)
+        else:
+            matches = self.pattern_ignorecase.finditer(text)
+
+        phrases = self.phrases
+        pieces = []
+        append = pieces.append
+        # Open templates, innermost last: [index of their opening piece, operator, separator, seen]
+        stack = []
+        position = 0
+        for match in matches:
+            start, end = match.span()
+            append(text[position:start])
+            position = end
+            found = match.group().lower()
+            kind, value = phrases.get(found) or phrases.get(' '.join(found.split()), ('boundary', None))
+
+            if kind == 'replace':
+                append(value)
+            elif kind == 'relation':
+                self._close(pieces, stack, 0)
+                append(value)
+            elif kind == 'template':
+                stack.append([len(pieces), value[0], value[1], False])
+                append(text[start:end])
+            elif kind == 'separator':
+                # The innermost template still waiting for this word takes it
+                for depth in range(len(stack) - 1, -1, -1):
+                    if not stack[depth][3] and stack[depth][2] == value:
+                        self._close(pieces, stack, depth + 1)
+                        stack[depth][3] = True
+                        append(stack[depth][1])
+                        break
+                else:
+                    append(text[start:end])
+            else:
+                self._close(pieces, stack, 0)
+                append(text[start:end])
+        append(text[position:])
+        self._close(pieces, stack, 0)
+        return ''.join(pieces)
+
+    def _close(self, pieces, stack, depth):
+        """Close the templates open above `depth`; one that never met its separator stays as written"""
+        while len(stack) > depth:
+            index, _, _, seen = stack.pop()
+            if seen:
+                pieces[index] = '('
+                pieces.append(')')
+
+translate_words = WordTranslator(PHRASES, RELATIONS, FILLER, TEMPLATES)
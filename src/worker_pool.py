@@ -0,0 +1,424 @@
+import gc
+import json
+import os
+import random
+import selectors
+import signal
+import socket
+import sys
+
+# Messages used to touch every code path before forking so the workers share
+# the loaded modules and fitted models copy-on-write instead of loading them again
+WARMUP_MESSAGES = ['hi', '2 + 2', '2x + 3 = 7']
+
+class _Worker:
+    def __init__(self, pid, sock):
+        self.pid = pid
+        self.sock = sock
+        self.buffer = b''
+        # Requests the worker has not accepted yet; sent whenever its socket is writable
+        self.output = bytearray()
+        self.in_flight = set()
+        self.dispatched = 0
+        self.retiring = False
+        self.write_closed = False
+
+class _Client:
+    def __init__(self, read_fd, write_fd):
+        self.read_fd = read_fd
+        self.write_fd = write_fd
+        self.buffer = b''
+        # Replies the client has not accepted yet; sent whenever it is writable
+        self.output = bytearray()
+        self.in_flight = 0
+        self.reading = True
+        self.closed = False
+
+class _Broadcast:
+    """A request sent to every worker, answered once all of them have replied"""
+
+    def __init__(self, parts):
+        self.remaining = parts
+        self.results = []
+
+def _send(target, data):
+    """Write what a non-blocking socket or descriptor accepts of data right now; the bytes written"""
+    try:
+        if isinstance(target, socket.socket):
+            return target.send(data)
+        return os.write(target, data)
+    except BlockingIOError:
+        return 0
+
+def merge_stats(results):
+    """Counters of every worker's stats reply added up, with the rates recomputed from the sums"""
+    merged = {}
+    for result in results:
+        for section, counters in result.items():
+            if counters is None:
+                merged.setdefault(section, None)
+                continue
+            total = merged.get(section) or {}
+            for name, value in counters.items():
+                total[name] = total.get(name, 0) + value
+            merged[section] = total
+    for counters in merged.values():
+        if counters and "hit_rate" in counters:
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        if counters and "fallback_rate" in counters:
+            counters["fallback_rate"] = counters["fallbacks"] / counters["calls"] if counters["calls"] else 0.0
+    merged["workers"] = len(results)
+    return merged
+
+class WorkerPool:
+    """Supervisor that forks warmed-up ChatBot workers and dispatches JSON-lines requests"""
+
+    def __init__(self, chatbot, serve, num_workers=None, max_requests=1000):
+        self.chatbot = chatbot
+        self.serve = serve
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_requests = max_requests
+        self.selector = selectors.DefaultSelector()
+        self.workers = []
+        self.clients = []
+        self.pending = {}
+        self.next_id = 0
+        self.listener = None
+        self.stopping = False
+
+    def warm_up(self, messages=WARMUP_MESSAGES):
+        """Run sample messages so lazily built state exists before forking"""
+        for message in messages:
+            try:
+                self.chatbot.get_response(message)
+            except Exception as e:
+                print(f"Warm-up failed for {message!r}: {e}", file=sys.stderr)
+        # Those messages stay on the fast paths, so sympy and its parser are loaded here; otherwise
+        # every worker would import its own copy on its first symbolic problem
+        try:
+            self.chatbot.math_model._parse('2x + 1')
+        except Exception as e:
+            print(f"Warm-up failed for the sympy parser: {e}", file=sys.stderr)
+        # Keep the garbage collector from touching (and so copying) the shared heap
+        gc.freeze()
+
+    def start(self):
+        """Fork the initial set of workers"""
+        for _ in range(self.num_workers):
+            self._spawn()
+
+    def _spawn(self):
+        parent_sock, child_sock = socket.socketpair()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                parent_sock.close()
+                self._close_inherited()
+                random.seed()
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                reader = child_sock.makefile('r', encoding='utf-8')
+                writer = child_sock.makefile('w', encoding='utf-8')
+                self.serve(self.chatbot, reader, writer)
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                os._exit(code)
+
+        child_sock.close()
+        parent_sock.setblocking(False)
+        worker = _Worker(pid, parent_sock)
+        self.workers.append(worker)
+        self.selector.register(parent_sock, selectors.EVENT_READ, ('worker', worker))
+        return worker
+
+    def _close_inherited(self):
+        """Drop the supervisor's descriptors in a freshly forked worker"""
+        self.selector.close()
+        for worker in self.workers:
+            worker.sock.close()
+        for client in self.clients:
+            if isinstance(client.read_fd, socket.socket):
+                client.read_fd.close()
+        if self.listener is not None:
+            self.listener.close()
+
+    def _pick_worker(self):
+        """Return the active worker with the fewest requests in flight"""
+        active = [w for w in self.workers if not w.retiring]
+        if not active:
+            return self._spawn()
+        return min(active, key=lambda w: len(w.in_flight))
+
+    def submit(self, client, line):
+        """Forward one request line (bytes) from a client to the least-loaded worker"""
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except UnicodeDecodeError as e:
+            self._reply(client, {"id": None, "error": f"Request is not valid UTF-8: {str(e)}"})
+            return
+        except json.JSONDecodeError as e:
+            self._reply(client, {"id": None, "error": f"Invalid JSON: {str(e)}"})
+            return
+        if not isinstance(request, dict):
+            self._reply(client, {"id": None, "error": "Request must be an object with a 'message' string"})
+            return
+
+        client.in_flight += 1
+        if request.get("method") == "stats":
+            # Every worker keeps its own counters, so all of them are asked and the answers added up
+            workers = [w for w in self.workers if not w.retiring] or [self._spawn()]
+            broadcast = _Broadcast(len(workers))
+            for worker in workers:
+                self._dispatch(worker, dict(request), (client, request.get("id"), broadcast))
+            return
+
+        worker = self._pick_worker()
+        self._dispatch(worker, request, (client, request.get("id"), None))
+        worker.dispatched += 1
+        if worker.dispatched >= self.max_requests:
+            # Recycle: the worker exits once it has answered what it already has
+            worker.retiring = True
+            self._flush_worker(worker)
+            if not self.stopping:
+                self._spawn()
+
+    def _dispatch(self, worker, request, owner):
+        # Clients pick their own ids, so they are swapped for pool-wide ones in transit
+        internal_id = self.next_id
+        self.next_id += 1
+        self.pending[internal_id] = owner
+        request["id"] = internal_id
+        worker.in_flight.add(internal_id)
+        worker.output += (json.dumps(request, ensure_ascii=False) + '\n').encode('utf-8')
+        self._flush_worker(worker)
+
+    def _flush_worker(self, worker):
+        """Send what the worker accepts of its queued requests, watching for writability while any remain"""
+        try:
+            sent = worker.sock.send(worker.output) if worker.output else 0
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            # The worker is gone; its exit is handled once its socket reads as closed
+            sent = len(worker.output)
+        del worker.output[:sent]
+        if worker.retiring and not worker.output and not worker.write_closed:
+            worker.write_closed = True
+            try:
+                worker.sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if worker.output else 0)
+        self._set_events(worker.sock, events, ('worker', worker))
+
+    def _set_events(self, fileobj, events, data):
+        """Watch fileobj for `events`, or stop watching it when there are none"""
+        try:
+            key = self.selector.get_key(fileobj)
+        except KeyError:
+            if events:
+                self.selector.register(fileobj, events, data)
+            return
+        if not events:
+            self.selector.unregister(fileobj)
+        elif key.events != events:
+            self.selector.modify(fileobj, events, data)
+
+    def _answer(self, internal_id, reply):
+        """Route a worker's reply, or the error standing in for it, back to the client that asked"""
+        client, client_id, broadcast = self.pending.pop(internal_id, (None, None, None))
+        if broadcast is not None:
+            if "result" in reply:
+                broadcast.results.append(reply["result"])
+            broadcast.remaining -= 1
+            if broadcast.remaining:
+                return
+            reply = {"id": None, "result": merge_stats(broadcast.results)}
+        if client is not None:
+            reply["id"] = client_id
+            self._reply(client, reply, answered=True)
+
+    def _reply(self, client, reply, answered=False):
+        if answered:
+            client.in_flight -= 1
+        if client.closed:
+            return
+        client.output += (json.dumps(reply, ensure_ascii=False) + '\n').encode('utf-8')
+        self._flush_client(client)
+
+    def _flush_client(self, client):
+        """Send what the client accepts of its replies; it is dropped once it has everything it is owed"""
+        try:
+            sent = _send(client.write_fd, client.output)
+        except OSError:
+            self._drop_client(client)
+            return
+        del client.output[:sent]
+        if not client.reading and client.in_flight == 0 and not client.output:
+            self._drop_client(client)
+        else:
+            self._watch_client(client)
+
+    def _on_worker_readable(self, worker):
+        try:
+            data = worker.sock.recv(65536)
+        except BlockingIOError:
+            return
+        if not data:
+            self._on_worker_exit(worker)
+            return
+
+        worker.buffer += data
+        *lines, worker.buffer = worker.buffer.split(b'\n')
+        for line in lines:
+            if not line.strip():
+                continue
+            reply = json.loads(line)
+            internal_id = reply.get("id")
+            worker.in_flight.discard(internal_id)
+            self._answer(internal_id, reply)
+
+    def _on_worker_exit(self, worker):
+        self.selector.unregister(worker.sock)
+        worker.sock.close()
+        self.workers.remove(worker)
+        _, status = os.waitpid(worker.pid, 0)
+
+        for internal_id in worker.in_flight:
+            self._answer(internal_id, {"error": "Worker exited before answering"})
+
+        if not worker.retiring:
+            print(f"Worker {worker.pid} exited with status {status}, respawning", file=sys.stderr)
+            if not self.stopping:
+                self._spawn()
+        elif status != 0:
+            print(f"Worker {worker.pid} exited with status {status} while retiring", file=sys.stderr)
+
+    def _add_client(self, read_fd, write_fd):
+        client = _Client(read_fd, write_fd)
+        self.clients.append(client)
+        self._watch_client(client)
+        return client
+
+    def _watch_client(self, client):
+        """Watch a client for requests while it is reading and for writability while replies are queued"""
+        read_events = selectors.EVENT_READ if client.reading else 0
+        write_events = selectors.EVENT_WRITE if client.output else 0
+        if client.read_fd is client.write_fd:
+            self._set_events(client.read_fd, read_events | write_events, ('client', client))
+        else:
+            self._set_events(client.read_fd, read_events, ('client', client))
+            self._set_events(client.write_fd, write_events, ('client', client))
+
+    def _stop_reading(self, client):
+        client.reading = False
+        self._watch_client(client)
+
+    def _drop_client(self, client):
+        if client.closed:
+            return
+        client.closed = True
+        client.reading = False
+        client.output.clear()
+        self._watch_client(client)
+        self.clients.remove(client)
+        if isinstance(client.read_fd, socket.socket):
+            client.read_fd.close()
+
+    def _on_client_readable(self, client):
+        try:
+            if isinstance(client.read_fd, socket.socket):
+                data = client.read_fd.recv(65536)
+            else:
+                data = os.read(client.read_fd, 65536)
+        except OSError:
+            data = b''
+        if not data:
+            # Replies still owed to this client are delivered before it is dropped
+            self._stop_reading(client)
+            if client.in_flight == 0 and not client.output:
+                self._drop_client(client)
+            if self.listener is None:
+                # stdin closed: finish what is in flight, then shut down
+                self.stopping = True
+            return
+
+        client.buffer += data
+        *lines, client.buffer = client.buffer.split(b'\n')
+        for line in lines:
+            if line.strip():
+                self.submit(client, line)
+
+    def _on_connection(self):
+        conn, _ = self.listener.accept()
+        conn.setblocking(False)
+        self._add_client(conn, conn)
+
+    def run(self, socket_path=None):
+        """Serve stdin/stdout, or every client of a Unix socket, until stopped"""
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.listener.bind(socket_path)
+            self.listener.listen()
+            self.selector.register(self.listener, selectors.EVENT_READ, ('listener', None))
+            print(f"Serving on {socket_path} with {self.num_workers} workers", file=sys.stderr)
+        else:
+            # Replies queue up instead of blocking the pool when stdout is slow to drain
+            stdout_fd = sys.__stdout__.fileno()
+            os.set_blocking(stdout_fd, False)
+            self._add_client(sys.stdin.fileno(), stdout_fd)
+
+        # Let SIGTERM unwind through the finally block so workers are stopped too
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        self.start()
+        try:
+            while not (self.stopping and not self.pending and not any(c.output for c in self.clients)):
+                for key, events in self.selector.select():
+                    kind, owner = key.data
+                    if kind == 'worker':
+                        # Earlier events of this round may have reaped the worker
+                        if owner not in self.workers:
+                            continue
+                        if events & selectors.EVENT_WRITE:
+                            self._flush_worker(owner)
+                        if events & selectors.EVENT_READ:
+                            self._on_worker_readable(owner)
+                    elif kind == 'client':
+                        if events & selectors.EVENT_WRITE and not owner.closed:
+                            self._flush_client(owner)
+                        if events & selectors.EVENT_READ and owner.reading:
+                            self._on_client_readable(owner)
+                    else:
+                        self._on_connection()
+        finally:
+            self.shutdown(socket_path)
+            if not socket_path:
+                os.set_blocking(sys.__stdout__.fileno(), True)
+
+    def shutdown(self, socket_path=None):
+        """Stop every worker and release the listening socket"""
+        self.stopping = True
+        for worker in list(self.workers):
+            if worker.write_closed:
+                continue
+            try:
+                worker.sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+        for worker in list(self.workers):
+            try:
+                os.waitpid(worker.pid, 0)
+            except ChildProcessError:
+                pass
+            worker.sock.close()
+        self.workers = []
+        if self.listener is not None:
+            self.listener.close()
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
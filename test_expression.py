@@ -0,0 +1,65 @@
+import time
+from fractions import Fraction
+
+import pytest
+
+from src.solvers.expression import ExpressionError, MAX_EXACT_BITS, compile_expression, evaluate_expression
+from src.solvers.polynomial import NotPolynomialError, polynomial_equation
+
+@pytest.mark.parametrize("text, expected", [
+    ("2 + 3 * 4", 14),
+    ("(2 + 3) * 4", 20),
+    ("10 - 4 - 3", 3),
+    ("12 / 3 / 2", 2),
+    ("2 * 3^2", 18),
+    ("2(3 + 1)", 8),
+])
+def test_precedence_and_associativity(text, expected):
+    assert evaluate_expression(text) == expected
+
+def test_unary_minus_binds_looser_than_power():
+    assert evaluate_expression("-2^2") == -4
+    assert evaluate_expression("(-2)^2") == 4
+    assert evaluate_expression("2^-1") == Fraction(1, 2)
+
+def test_power_is_right_associative():
+    assert compile_expression("2^3^2") == ('^', ('num', 2), ('^', ('num', 3), ('num', 2)))
+    assert evaluate_expression("2^3^2") == 512
+    assert evaluate_expression("2**3**2") == 512
+
+@pytest.mark.parametrize("text", ["0^-1", "1/0", "1/(2-2)"])
+def test_division_by_zero(text):
+    with pytest.raises(ExpressionError, match="Division by zero"):
+        evaluate_expression(text)
+
+@pytest.mark.parametrize("text", ["2 +", "(2 + 3", "2 $ 3"])
+def test_malformed_expressions(text):
+    with pytest.raises(ExpressionError):
+        evaluate_expression(text)
+
+def test_exact_power_up_to_the_bit_bound():
+    # 65535 is 16 bits wide, so its 4096th power just fits in MAX_EXACT_BITS
+    assert MAX_EXACT_BITS == 16 * 4096
+    assert evaluate_expression("65535^4096") == 65535 ** 4096
+    assert evaluate_expression("(1/65535)^4096") == Fraction(1, 65535 ** 4096)
+    with pytest.raises(ExpressionError, match="too large"):
+        evaluate_expression("65537^4096")
+
+def test_power_beyond_the_bit_bound_is_floating_point():
+    # 1048577/1048576 is 21 bits wide: 21 * 4096 bits is past the bound, the value is not
+    result = evaluate_expression("(1048577/1048576)^4096")
+    assert isinstance(result, float)
+    assert result == pytest.approx((1 + 2 ** -20) ** 4096)
+    assert isinstance(evaluate_expression("(1048577/1048576)^3000"), Fraction)
+
+def test_huge_power_fails_fast():
+    start = time.perf_counter()
+    with pytest.raises(ExpressionError, match="too large"):
+        evaluate_expression("(9^4096)^4096")
+    assert time.perf_counter() - start < 1.0
+
+def test_polynomial_power_is_bounded():
+    start = time.perf_counter()
+    with pytest.raises(NotPolynomialError):
+        polynomial_equation("x + (9^4096)^4096", "0")
+    assert time.perf_counter() - start < 1.0
@@ -1,6 +1,44 @@
-try:
-    import sklearn
-    import wikipedia
-    print("Imports successful!")
-except ImportError as e:
-    print(f"Import error: {e}")
+import os
+import subprocess
+import sys
+
+# Dependencies a plain arithmetic request must never pull in
+HEAVY_MODULES = ['sympy', 'sklearn', 'numpy', 'wikipedia']
+IMPORT_BUDGET_SECONDS = float(os.environ.get('IMPORT_BUDGET_SECONDS', '1.0'))
+
+ARITHMETIC_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from src.chat_model import ChatBot
+ChatBot().get_response('2+2')
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+def check_optional_imports():
+    try:
+        import sklearn
+        import wikipedia
+        print("Imports successful!")
+    except ImportError as e:
+        print(f"Import error: {e}")
+
+def test_arithmetic_request_import_budget():
+    """A cold '2+2' request stays clear of heavy imports and within the time budget"""
+    import json
+
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run(
+        [sys.executable, '-c', ARITHMETIC_PROBE],
+        cwd=project_root, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result['modules'] == [], f"Arithmetic request imported {result['modules']}"
+    assert result['elapsed'] < IMPORT_BUDGET_SECONDS, \
+        f"Import and first answer took {result['elapsed']:.3f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+
+if __name__ == "__main__":
+    check_optional_imports()
+    test_arithmetic_request_import_budget()
+    print("Import budget check passed!")